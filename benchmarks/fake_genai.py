@@ -0,0 +1,257 @@
+"""
+Simulated google-genai backend for offline benchmarks.
+
+`FakeGenaiClient` implements the slice of the genai client surface the
+generators use (`models.generate_images`, `models.generate_videos` and
+`operations.get`) without credentials or network access. Video operations
+finish after a latency sampled from a configurable distribution, scaled by
+`time_scale` so a 90 s Veo call can be simulated in a second or two, and
+return MP4s rendered locally with ffmpeg's test sources in the same format
+Veo delivers (H.264, yuv420p, AAC).
+
+Inject it through a client pool:
+
+    client = FakeGenaiClient(SyntheticMedia(work_dir))
+    generator = BackgroundVideoGenerator(..., client_pool=ClientPool(lambda *_: client))
+"""
+import hashlib
+import itertools
+import math
+import pathlib
+import random
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Union
+
+from video_generation_workflows.video.ffmpeg_tools import run_ffmpeg
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Distribution of simulated operation latency, in unscaled seconds.
+
+    Attributes
+    ----------
+    distribution : str
+        "fixed" (always `a`), "uniform" (between `a` and `b`) or
+        "lognormal" (median `a`, shape `b`).
+    a, b : float
+        Distribution parameters.
+    """
+    distribution: str
+    a: float
+    b: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}'; use one of {DISTRIBUTIONS}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Parse "fixed:60", "uniform:60:120" or "lognormal:90:0.35"."""
+        distribution, *params = spec.split(":")
+        values = [float(param) for param in params]
+        if not values:
+            raise ValueError(f"Latency spec '{spec}' has no parameters")
+        return cls(distribution, *values[:2])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            return self.a
+        if self.distribution == "uniform":
+            return rng.uniform(self.a, self.b)
+        return rng.lognormvariate(math.log(self.a), self.b)
+
+    def __str__(self) -> str:
+        return f"{self.distribution}:{self.a:g}" + (f":{self.b:g}" if self.distribution != "fixed" else "")
+
+
+class SyntheticMedia:
+    """
+    Locally rendered stand-ins for generated media.
+
+    Renders `variants` distinct clips (the test pattern in different hues)
+    and one still image, once each; every prompt maps to a variant by hash,
+    so different prompts yield different files while all clips stay
+    stream-copy compatible.
+    """
+
+    def __init__(
+        self,
+        work_dir: Union[str, pathlib.Path],
+        *,
+        width: int = 1280,
+        height: int = 720,
+        fps: int = 24,
+        duration_seconds: float = 8.0,
+        variants: int = 4,
+    ) -> None:
+        self.work_dir = pathlib.Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.duration_seconds = duration_seconds
+        self.variants = variants
+        self._lock = threading.Lock()
+
+    def prepare(self) -> None:
+        """Render every variant up front so rendering is not counted as latency."""
+        self.image()
+        for variant in range(self.variants):
+            self._video(variant)
+
+    def image(self) -> bytes:
+        path = self.work_dir / "image.jpg"
+        with self._lock:
+            if not path.exists():
+                run_ffmpeg(
+                    [
+                        "-f", "lavfi", "-i", f"testsrc2=size={self.width}x{self.height}:rate=1",
+                        "-frames:v", "1", "-q:v", "2", str(path),
+                    ]
+                )
+        return path.read_bytes()
+
+    def video(self, prompt: str) -> pathlib.Path:
+        variant = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % self.variants
+        return self._video(variant)
+
+    def _video(self, variant: int) -> pathlib.Path:
+        path = self.work_dir / f"video_{variant}.mp4"
+        with self._lock:
+            if not path.exists():
+                hue = 360 * variant / self.variants
+                run_ffmpeg(
+                    [
+                        "-f", "lavfi",
+                        "-i", f"testsrc2=size={self.width}x{self.height}:rate={self.fps}:duration={self.duration_seconds}",
+                        "-f", "lavfi",
+                        "-i", f"sine=frequency={220 * (variant + 1)}:duration={self.duration_seconds}",
+                        "-vf", f"hue=h={hue:g}",
+                        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-g", str(self.fps),
+                        "-c:a", "aac", "-shortest", str(path),
+                    ]
+                )
+        return path
+
+
+class _FakeImage:
+    def __init__(self, image_bytes: bytes) -> None:
+        self.image_bytes = image_bytes
+        self.mime_type = "image/jpeg"
+
+    def save(self, location: Union[str, pathlib.Path]) -> None:
+        pathlib.Path(location).write_bytes(self.image_bytes)
+
+
+class _FakeVideo:
+    def __init__(self, source: pathlib.Path) -> None:
+        # Delivered by URI, as with output_gcs_uri, so downloads stream from disk
+        self.source = source
+        self.uri = source.as_uri()
+        self.video_bytes = None
+        self.mime_type = "video/mp4"
+
+    def save(self, location: Union[str, pathlib.Path]) -> None:
+        shutil.copyfile(self.source, location)
+
+
+class _FakeOperation:
+    def __init__(self, name: str, ready_at: float, videos: List[_FakeVideo]) -> None:
+        self.name = name
+        self.ready_at = ready_at
+        self.error = None
+        self.response = None
+        self._videos = videos
+
+    @property
+    def done(self) -> bool:
+        return self.response is not None
+
+
+class _FakeModels:
+    def __init__(self, client: "FakeGenaiClient") -> None:
+        self._client = client
+
+    def generate_images(self, *, model: str, prompt: str, config: Any = None) -> SimpleNamespace:
+        client = self._client
+        client._count("generate_images")
+        time.sleep(client._latency(client.image_latency))
+        count = getattr(config, "number_of_images", None) or 1
+        image = _FakeImage(client.media.image())
+        return SimpleNamespace(generated_images=[SimpleNamespace(image=image) for _ in range(count)])
+
+    def generate_videos(self, *, model: str, prompt: str, image: Any = None, config: Any = None) -> _FakeOperation:
+        client = self._client
+        client._count("generate_videos")
+        count = getattr(config, "number_of_videos", None) or 1
+        videos = [_FakeVideo(client.media.video(f"{prompt}#{n}")) for n in range(count)]
+        ready_at = time.monotonic() + client._latency(client.video_latency)
+        return _FakeOperation(f"operations/fake-{next(client._operation_ids)}", ready_at, videos)
+
+
+class _FakeOperations:
+    def __init__(self, client: "FakeGenaiClient") -> None:
+        self._client = client
+
+    def get(self, operation: _FakeOperation) -> _FakeOperation:
+        self._client._count("operations.get")
+        if not operation.done and time.monotonic() >= operation.ready_at:
+            operation.response = SimpleNamespace(
+                generated_videos=[SimpleNamespace(video=video) for video in operation._videos]
+            )
+        return operation
+
+
+class FakeGenaiClient:
+    """
+    In-process stand-in for `google.genai.Client`.
+
+    Parameters
+    ----------
+    media : SyntheticMedia
+        Source of the returned images and videos.
+    video_latency : LatencyModel, optional
+        Time from `generate_videos` until the operation reports done.
+    image_latency : LatencyModel, optional
+        Duration of the blocking `generate_images` call.
+    time_scale : float, optional
+        Factor applied to every sampled latency.
+    seed : int, optional
+        Seed of the latency sampler.
+    """
+
+    def __init__(
+        self,
+        media: SyntheticMedia,
+        *,
+        video_latency: Optional[LatencyModel] = None,
+        image_latency: Optional[LatencyModel] = None,
+        time_scale: float = 0.02,
+        seed: int = 0,
+    ) -> None:
+        self.media = media
+        self.video_latency = video_latency or LatencyModel("lognormal", 90.0, 0.35)
+        self.image_latency = image_latency or LatencyModel("fixed", 8.0)
+        self.time_scale = time_scale
+        self.models = _FakeModels(self)
+        self.operations = _FakeOperations(self)
+        self.calls: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._operation_ids = itertools.count(1)
+
+    def _latency(self, model: LatencyModel) -> float:
+        with self._lock:
+            return max(0.0, model.sample(self._rng)) * self.time_scale
+
+    def _count(self, call: str) -> None:
+        with self._lock:
+            self.calls[call] = self.calls.get(call, 0) + 1
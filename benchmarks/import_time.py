@@ -0,0 +1,66 @@
+"""
+Startup benchmark: the config-only import path must stay cheap.
+
+Imports `VideoConfiguration` in fresh interpreters, reports the best and
+median wall time over several runs (minus bare interpreter startup) and
+fails when the best run exceeds the budget or when any heavy dependency
+(google-genai, MoviePy, NumPy, Pillow) was loaded along the way.
+
+Usage:
+    python benchmarks/import_time.py [--runs 10] [--budget-ms 150]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+HEAVY_MODULES = ("google.genai", "moviepy", "numpy", "PIL")
+CONFIG_ONLY = (
+    "import sys\n"
+    "from video_generation_workflows import VideoConfiguration, ActionPrompt\n"
+    "VideoConfiguration(video_name='bench', length=4, base_scene_prompt='scene',\n"
+    "                   action_prompts=[ActionPrompt(prompt='action', start_index=1)])\n"
+    f"print(__import__('json').dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+)
+
+
+def _time_interpreter(code: str) -> "tuple[float, str]":
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC_DIR), os.getenv("PYTHONPATH")])))
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, result.stdout
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "150")))
+    args = parser.parse_args()
+
+    baseline = min(_time_interpreter("pass")[0] for _ in range(args.runs))
+    samples, heavy = [], []
+    for _ in range(args.runs):
+        elapsed, stdout = _time_interpreter(CONFIG_ONLY)
+        samples.append(max(0.0, elapsed - baseline) * 1000)
+        heavy = json.loads(stdout.strip().splitlines()[-1])
+
+    best, median = min(samples), statistics.median(samples)
+    print(f"config-only import: best {best:.1f} ms, median {median:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported: {', '.join(heavy)}")
+    if best > args.budget_ms:
+        failures.append(f"best import time {best:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+End-to-end benchmark against a simulated genai backend.
+
+Runs `BackgroundVideoGenerator` on videos of 4, 60 and 450 segments with
+sparse and dense action prompts. The genai client is replaced by
+`fake_genai.FakeGenaiClient` (sampled operation latency, locally rendered
+MP4s), so no credentials, network or quota are needed. Per scenario it
+reports:
+
+- end-to-end wall time,
+- assembly throughput: output frames per second of the concat stage,
+- peak RSS of the benchmark process and of its largest ffmpeg child,
+- peak number of open file descriptors.
+
+Each scenario runs in a fresh interpreter so peaks do not carry over.
+Results are written to benchmarks/results/<timestamp>.json; pass
+`--baseline` with an earlier results file to print the change per metric.
+
+Requires google-genai, MoviePy and ffmpeg like the package itself.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scenario len60-dense ...] [--time-scale 0.02]
+        [--latency lognormal:90:0.35] [--concurrency 4] [--baseline benchmarks/results/old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+ACTIONS = (
+    "A bird lands on the windowsill",
+    "Rain starts to fall outside",
+    "A cat walks across the room",
+    "The lights flicker briefly",
+    "Leaves blow past the window",
+    "A candle is lit on the table",
+    "Steam rises from a cup of tea",
+    "A curtain sways in the breeze",
+)
+
+# metric -> True if higher is better
+METRICS = {
+    "wall_seconds": False,
+    "assembly_fps": True,
+    "peak_rss_mb": False,
+    "peak_child_rss_mb": False,
+    "peak_fds": False,
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A benchmark input.
+
+    Attributes
+    ----------
+    name : str
+        Identifier used on the command line and in results.
+    length : int
+        Number of segments.
+    action_density : float
+        Fraction of segments that start an action.
+    """
+    name: str
+    length: int
+    action_density: float
+
+    def configuration(self, seed: int):
+        from video_generation_workflows import ActionPrompt, VideoConfiguration
+
+        rng = random.Random(seed)
+        count = min(self.length - 1, round(self.length * self.action_density))
+        indices = sorted(rng.sample(range(1, self.length), count)) if count > 0 else []
+        return VideoConfiguration(
+            video_name=self.name,
+            length=self.length,
+            base_scene_prompt="A quiet reading room with tall windows, warm afternoon light",
+            action_prompts=[ActionPrompt(prompt=rng.choice(ACTIONS), start_index=index) for index in indices],
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("len4-sparse", 4, 0.25),
+        Scenario("len60-sparse", 60, 0.05),
+        Scenario("len60-dense", 60, 0.4),
+        Scenario("len450-sparse", 450, 0.02),
+        Scenario("len450-dense", 450, 0.2),
+    )
+}
+
+
+class _FdSampler(threading.Thread):
+    """Samples the number of open file descriptors until stopped."""
+
+    def __init__(self, interval_seconds: float = 0.005) -> None:
+        super().__init__(name="fd-sampler", daemon=True)
+        self.interval_seconds = interval_seconds
+        self.peak = 0
+        self._directory = "/proc/self/fd" if os.path.isdir("/proc/self/fd") else "/dev/fd"
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, len(os.listdir(self._directory)))
+            self._stop_event.wait(self.interval_seconds)
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def _max_rss_mb(who: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(scenario: Scenario, args: argparse.Namespace) -> Dict[str, Any]:
+    """Generate `scenario` against the fake backend and return its metrics."""
+    from fake_genai import FakeGenaiClient, LatencyModel, SyntheticMedia
+
+    from video_generation_workflows.video import BackgroundVideoGenerator, ClientPool, Tracer
+    from video_generation_workflows.video.ffmpeg_tools import parse_rate, probe_video
+
+    width, height = (int(value) for value in args.resolution.split("x"))
+    config = scenario.configuration(args.seed)
+    with tempfile.TemporaryDirectory(prefix="video-benchmark-") as work_dir:
+        media = SyntheticMedia(Path(work_dir) / "media", width=width, height=height, variants=args.variants)
+        media.prepare()
+        client = FakeGenaiClient(
+            media,
+            video_latency=LatencyModel.parse(args.latency),
+            image_latency=LatencyModel.parse(args.image_latency),
+            time_scale=args.time_scale,
+            seed=args.seed,
+        )
+        tracer = Tracer()
+        generator = BackgroundVideoGenerator(
+            project_id="benchmark",
+            location="local",
+            output_dir=Path(work_dir) / "output",
+            max_concurrent_operations=args.concurrency,
+            min_poll_interval_seconds=args.min_poll_interval,
+            max_poll_interval_seconds=args.max_poll_interval,
+            materialize_segments=not args.timeline,
+            client_pool=ClientPool(lambda *_: client),
+            tracer=tracer,
+        )
+
+        fds = _FdSampler()
+        fds.start()
+        started = time.perf_counter()
+        try:
+            output = generator.generate(config)
+        finally:
+            peak_fds = fds.stop()
+        wall_seconds = time.perf_counter() - started
+
+        info = probe_video(output)
+        frames = info.duration * parse_rate(info.frame_rate) if info is not None else 0.0
+        assembly_seconds = sum(record.duration for record in tracer.spans if record.name == "plan.concat")
+
+    return {
+        "scenario": asdict(scenario),
+        "actions": len(config.action_prompts),
+        "calls": dict(client.calls),
+        "wall_seconds": round(wall_seconds, 3),
+        "assembly_seconds": round(assembly_seconds, 3),
+        "output_frames": round(frames),
+        "assembly_fps": round(frames / assembly_seconds, 1) if assembly_seconds else None,
+        "peak_rss_mb": round(_max_rss_mb(resource.RUSAGE_SELF), 1),
+        "peak_child_rss_mb": round(_max_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        "peak_fds": peak_fds,
+    }
+
+
+def _child_command(name: str, result_file: str, args: argparse.Namespace) -> List[str]:
+    command = [sys.executable, __file__, "--run-one", name, "--result-file", result_file]
+    for option in (
+        "time_scale", "latency", "image_latency", "concurrency", "min_poll_interval",
+        "max_poll_interval", "resolution", "variants", "seed",
+    ):
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    if args.timeline:
+        command.append("--timeline")
+    return command
+
+
+def _run_isolated(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC_DIR), os.getenv("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = os.path.join(tmp, "result.json")
+        subprocess.run(_child_command(name, result_file, args), env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(result_file, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARKS_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _print_comparison(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp')}):")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            print(f"  {name}: not in baseline")
+            continue
+        changes = []
+        for metric, higher_is_better in METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            verdict = ""
+            if abs(change) >= 1:
+                verdict = " better" if (change > 0) == higher_is_better else " worse"
+            changes.append(f"{metric} {old:g} -> {new:g} ({change:+.1f}%{verdict})")
+        print(f"  {name}: " + "; ".join(changes))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Defaults to all scenarios")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="Factor applied to simulated latencies")
+    parser.add_argument("--latency", default="lognormal:90:0.35", help="Veo operation latency distribution")
+    parser.add_argument("--image-latency", default="fixed:8", help="Imagen call latency distribution")
+    parser.add_argument("--concurrency", type=int, default=4, help="max_concurrent_operations")
+    parser.add_argument("--min-poll-interval", type=float, default=0.05)
+    parser.add_argument("--max-poll-interval", type=float, default=1.0)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--variants", type=int, default=4, help="Distinct synthetic clips")
+    parser.add_argument("--timeline", action="store_true", help="Assemble from the timeline (materialize_segments=False)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against")
+    parser.add_argument("--output", type=Path, help="Results file; defaults to benchmarks/results/<timestamp>.json")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        result = run_scenario(SCENARIOS[args.run_one], args)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return 0
+
+    timestamp = time.strftime("%Y%m%dT%H%M%S")
+    results: Dict[str, Any] = {
+        "timestamp": timestamp,
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: str(value) for key, value in vars(args).items() if key not in ("run_one", "result_file", "baseline", "output")},
+        "scenarios": {},
+    }
+    for name in args.scenario or list(SCENARIOS):
+        result = _run_isolated(name, args)
+        results["scenarios"][name] = result
+        print(
+            f"{name:<14} wall {result['wall_seconds']:>8.2f} s  "
+            f"assembly {result['assembly_fps'] or 0:>8.1f} frames/s  "
+            f"rss {result['peak_rss_mb']:>7.1f} MB (ffmpeg {result['peak_child_rss_mb']:.1f} MB)  "
+            f"fds {result['peak_fds']:>4}  calls {result['calls']}"
+        )
+
+    output = args.output or RESULTS_DIR / f"{timestamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        _print_comparison(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
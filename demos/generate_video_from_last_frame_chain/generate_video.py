@@ -1,6 +1,5 @@
-# pip install google-genai moviepy pillow
+# pip install google-genai moviepy pillow && pip install -e .
 import argparse
-import time
 import pathlib
 from typing import List
 
@@ -10,6 +9,8 @@ from google.genai import types, errors
 from PIL import Image
 from moviepy import VideoFileClip, ImageClip, concatenate_videoclips
 
+from video_generation_workflows import get_client, wait_for_operation
+
 # -- Configuration --
 PROJECT_ID = "personal-358900"
 LOCATION = "us-central1"
@@ -20,11 +21,8 @@ DURATION_SECONDS = 8
 RESOLUTION = "1080p"
 
 def wait_for_op(client: genai.Client, op):
-    while not op.done:
-        print("Waiting for generation...")
-        time.sleep(10)
-        op = client.operations.get(op)
-    return op
+    print("Waiting for generation...")
+    return wait_for_operation(client, op)
 
 def extract_last_frame_as_types_image(video_path: pathlib.Path, out_jpg_path: pathlib.Path) -> types.Image:
     # Grab the last frame just before the end
@@ -64,12 +62,7 @@ def main():
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    client = genai.Client(
-        vertexai=True,
-        project=PROJECT_ID,
-        location=LOCATION,
-        http_options=types.HttpOptions(api_version="v1"),
-    )
+    client = get_client(PROJECT_ID, LOCATION)
 
     # 1) Generate initial image
     print("Generating start image with Imagen…")
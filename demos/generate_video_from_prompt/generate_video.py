@@ -1,10 +1,10 @@
-# pip install google-genai
+# pip install google-genai && pip install -e .
 import argparse
-import time
 import pathlib
-from google import genai
 from google.genai import types
 
+from video_generation_workflows import get_client, wait_for_operation
+
 # ---- STATIC CONFIG ----
 PROJECT_ID = "personal-358900"
 LOCATION = "us-central1"
@@ -21,12 +21,7 @@ def main():
     parser.add_argument("--count", type=int, default=1, help="Number of videos to generate")
     args = parser.parse_args()
 
-    client = genai.Client(
-        vertexai=True,
-        project=PROJECT_ID,
-        location=LOCATION,
-        http_options=types.HttpOptions(api_version="v1"),  # GA endpoint
-    )
+    client = get_client(PROJECT_ID, LOCATION)
 
     config = types.GenerateVideosConfig(
         number_of_videos=args.count,
@@ -42,10 +37,8 @@ def main():
     )
 
     print(f"Started operation: {op.name}")
-    while not op.done:
-        print("Waiting for video generation...")
-        time.sleep(10)
-        op = client.operations.get(op)
+    print("Waiting for video generation...")
+    op = wait_for_operation(client, op)
 
     if STORAGE_URI:
         for idx, v in enumerate(op.response.generated_videos, start=1):
@@ -1,10 +1,10 @@
-# pip install google-genai
+# pip install google-genai && pip install -e .
 import argparse
-import time
 import pathlib
-from google import genai
 from google.genai import types
 
+from video_generation_workflows import get_client, wait_for_operation
+
 # -- Configuration --
 PROJECT_ID = "personal-358900"
 LOCATION = "us-central1"
@@ -16,11 +16,8 @@ DURATION_SECONDS = 8
 ASPECT_RATIO = "16:9"  # v2 uses aspect_ratio, not resolution
 
 def wait_for_op(client, op):
-    while not op.done:
-        print("Waiting for generation...")
-        time.sleep(10)
-        op = client.operations.get(op)
-    return op
+    print("Waiting for generation...")
+    return wait_for_operation(client, op)
 
 def main():
     parser = argparse.ArgumentParser(description="Imagen → Veo v2 with first & last frame")
@@ -31,12 +28,7 @@ def main():
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    client = genai.Client(
-        vertexai=True,
-        project=PROJECT_ID,
-        location=LOCATION,
-        http_options=types.HttpOptions(api_version="v1"),
-    )
+    client = get_client(PROJECT_ID, LOCATION)
 
     # 1) Generate base image
     print("Generating image with Imagen…")
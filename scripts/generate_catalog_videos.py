@@ -0,0 +1,55 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+from video_generation_workflows import (
+    BackgroundVideoGenerator,
+    BatchScheduler,
+    GenerationCache,
+)
+
+import generate_background_video
+import generate_coffee_shop_video
+import generate_italian_piazza_video
+import generate_rainy_valley_video
+
+
+# Allow configuration via environment variables; fall back to sensible defaults
+PROJECT_ID = os.getenv("PROJECT_ID", "personal-358900")
+LOCATION = os.getenv("LOCATION", "us-central1")
+# Operations in flight across the whole catalog; size it to the project's Veo quota
+MAX_CONCURRENT_OPERATIONS = int(os.getenv("MAX_CONCURRENT_OPERATIONS", "8"))
+MAX_OPERATIONS_PER_MINUTE = float(os.getenv("MAX_OPERATIONS_PER_MINUTE", "0")) or None
+RUN_STAMP = datetime.now().strftime("%Y-%m-%d-%H-%M")
+
+# (script module, priority); higher priority gets operation slots first
+CATALOG = [
+    (generate_coffee_shop_video, 1),
+    (generate_italian_piazza_video, 0),
+    (generate_rainy_valley_video, 0),
+    (generate_background_video, 0),
+]
+
+
+if __name__ == "__main__":
+    # Shared across scripts and runs; set GENERATION_CACHE_DIR to relocate it
+    cache = GenerationCache()
+    scheduler = BatchScheduler(
+        max_concurrent_operations=MAX_CONCURRENT_OPERATIONS,
+        max_operations_per_minute=MAX_OPERATIONS_PER_MINUTE,
+    )
+    for module, priority in CATALOG:
+        generator = BackgroundVideoGenerator(
+            project_id=PROJECT_ID,
+            location=LOCATION,
+            output_dir=Path("scripts/videos") / module.config.video_name / RUN_STAMP,
+            cache=cache,
+        )
+        scheduler.submit(generator, module.config, priority=priority)
+
+    jobs = scheduler.run()
+    for job in jobs:
+        print(f"{job.name}: {job.result or f'failed: {job.error}'}")
+    failed = [job for job in jobs if job.error is not None]
+    if failed:
+        raise SystemExit(f"{len(failed)} video(s) failed: {', '.join(job.name for job in failed)}")
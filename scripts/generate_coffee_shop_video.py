@@ -6,12 +6,19 @@ from video_generation_workflows import (
     VideoConfiguration,
     ActionPrompt,
     BackgroundVideoGenerator,
+    GenerationCache,
+    PROXY,
 )
 
 
 # Allow configuration via environment variables; fall back to sensible defaults
 PROJECT_ID = os.getenv("PROJECT_ID", "personal-358900")
 LOCATION = os.getenv("LOCATION", "us-central1")
+# Set RESUME=1 together with the OUTPUT_DIR of an interrupted run to continue it
+RESUME = os.getenv("RESUME", "0") == "1"
+# Set DRAFT=1 for a quick low-resolution preview; render the master later with
+# scripts/render_master.py from the same OUTPUT_DIR
+DRAFT = os.getenv("DRAFT", "0") == "1"
 VIDEO_NAME = "coffee_shop_video"
 OUTPUT_DIR = os.getenv(
     "OUTPUT_DIR",
@@ -65,10 +72,14 @@ config = VideoConfiguration(
     ],
 )
 
-generator = BackgroundVideoGenerator(
-    project_id=PROJECT_ID,
-    location=LOCATION,
-    output_dir=OUTPUT_DIR,
-)
-output_path = generator.generate(config)
-print(f"Generated video: {output_path}")
+if __name__ == "__main__":
+    generator = BackgroundVideoGenerator(
+        project_id=PROJECT_ID,
+        location=LOCATION,
+        output_dir=OUTPUT_DIR,
+        # Shared across scripts and runs; set GENERATION_CACHE_DIR to relocate it
+        cache=GenerationCache(),
+        render_profile=PROXY if DRAFT else None,
+    )
+    output_path = generator.generate(config, resume=RESUME)
+    print(f"Generated video: {output_path}")
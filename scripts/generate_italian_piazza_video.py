@@ -6,12 +6,21 @@ from video_generation_workflows import (
     VideoConfiguration,
     ActionPrompt,
     BackgroundVideoGenerator,
+    GenerationCache,
+    PROXY,
 )
 
 
 # Allow configuration via environment variables; fall back to sensible defaults
 PROJECT_ID = os.getenv("PROJECT_ID", "personal-358900")
 LOCATION = os.getenv("LOCATION", "us-central1")
+# Set RESUME=1 together with the OUTPUT_DIR of an interrupted run to continue it
+RESUME = os.getenv("RESUME", "0") == "1"
+# Set DRAFT=1 for a quick low-resolution preview; render the master later with
+# scripts/render_master.py from the same OUTPUT_DIR
+DRAFT = os.getenv("DRAFT", "0") == "1"
+# All segments depend only on the base image, so they can be generated concurrently
+MAX_CONCURRENT_OPERATIONS = int(os.getenv("MAX_CONCURRENT_OPERATIONS", "6"))
 VIDEO_NAME = "italian_piazza_video"
 OUTPUT_DIR = os.getenv(
     "OUTPUT_DIR",
@@ -79,10 +88,15 @@ config = VideoConfiguration(
     ],
 )
 
-generator = BackgroundVideoGenerator(
-    project_id=PROJECT_ID,
-    location=LOCATION,
-    output_dir=OUTPUT_DIR,
-)
-output_path = generator.generate(config)
-print(f"Generated video: {output_path}")
+if __name__ == "__main__":
+    generator = BackgroundVideoGenerator(
+        project_id=PROJECT_ID,
+        location=LOCATION,
+        output_dir=OUTPUT_DIR,
+        # Shared across scripts and runs; set GENERATION_CACHE_DIR to relocate it
+        cache=GenerationCache(),
+        max_concurrent_operations=MAX_CONCURRENT_OPERATIONS,
+        render_profile=PROXY if DRAFT else None,
+    )
+    output_path = generator.generate(config, resume=RESUME)
+    print(f"Generated video: {output_path}")
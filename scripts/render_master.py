@@ -0,0 +1,24 @@
+import os
+import sys
+
+from video_generation_workflows import LADDER, PROXY, VideoSegmentManager
+
+
+# OUTPUT_DIR of a finished (e.g. DRAFT=1) run; its segments are reused as they are
+OUTPUT_DIR = os.getenv("OUTPUT_DIR") or (sys.argv[1] if len(sys.argv) > 1 else None)
+# Set DRAFT=1 to re-render the preview instead of the master
+DRAFT = os.getenv("DRAFT", "0") == "1"
+# Set RENDITIONS=1 to write the 1080p/720p/480p ladder from a single decode
+RENDITIONS = os.getenv("RENDITIONS", "0") == "1"
+
+
+if __name__ == "__main__":
+    if OUTPUT_DIR is None:
+        raise SystemExit("Usage: OUTPUT_DIR=<run directory> python scripts/render_master.py")
+    manager = VideoSegmentManager.from_manifest(OUTPUT_DIR)
+    if RENDITIONS:
+        for output_path in manager.save(LADDER):
+            print(f"Rendered video: {output_path}")
+    else:
+        output_path = manager.save(PROXY if DRAFT else None)
+        print(f"Rendered video: {output_path}")
@@ -1,15 +1,63 @@
-from .video import (
-    VideoConfiguration,
-    ActionPrompt,
-    VideoGenerator,
-    BackgroundVideoGenerator,
-)
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
+
+# Resolved lazily from `.video`; see `video/__init__.py`
 __all__ = [
     "VideoConfiguration",
     "ActionPrompt",
     "VideoGenerator",
     "BackgroundVideoGenerator",
+    "ChainedVideoGenerator",
+    "OperationPoller",
+    "wait_for_operation",
+    "GenerationCache",
+    "CacheStats",
+    "BatchJob",
+    "BatchScheduler",
+    "RateLimiter",
+    "ClientPool",
+    "get_client",
+    "Tracer",
+    "VideoSegmentManager",
+    "RenderProfile",
+    "PROXY",
+    "LADDER",
 ]
 
 
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".video", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .video import (
+        VideoConfiguration,
+        ActionPrompt,
+        VideoGenerator,
+        BackgroundVideoGenerator,
+        ChainedVideoGenerator,
+        OperationPoller,
+        wait_for_operation,
+        GenerationCache,
+        CacheStats,
+        BatchJob,
+        BatchScheduler,
+        RateLimiter,
+        ClientPool,
+        get_client,
+        Tracer,
+        VideoSegmentManager,
+        RenderProfile,
+        PROXY,
+        LADDER,
+    )
@@ -1,14 +1,95 @@
-from .video_configuration import VideoConfiguration, ActionPrompt
-from .video_generator import VideoGenerator
-from .background_video_generator import BackgroundVideoGenerator
-from .video_segment_manager import VideoSegmentManager
+from __future__ import annotations
 
-__all__ = [
-    "VideoConfiguration",
-    "ActionPrompt",
-    "VideoGenerator",
-    "BackgroundVideoGenerator",
-    "VideoSegmentManager",
-]
+import importlib
+from typing import TYPE_CHECKING
 
+# Public name -> defining submodule. Submodules, and with them google-genai,
+# MoviePy and NumPy, are only imported when one of their names is first used,
+# so working with a `VideoConfiguration` does not pay for the generators.
+_EXPORTS = {
+    "VideoConfiguration": "video_configuration",
+    "ActionPrompt": "video_configuration",
+    "VideoGenerator": "video_generator",
+    "BackgroundVideoGenerator": "background_video_generator",
+    "ChainedVideoGenerator": "chained_video_generator",
+    "VideoSegmentManager": "video_segment_manager",
+    "OperationPoller": "operation_poller",
+    "wait_for_operation": "operation_poller",
+    "GenerationCache": "generation_cache",
+    "CacheStats": "generation_cache",
+    "SegmentManifest": "segment_manifest",
+    "SegmentRecord": "segment_manifest",
+    "TimelineEntry": "timeline",
+    "TimelineRenderer": "timeline",
+    "compile_timeline": "timeline",
+    "ParallelEncoder": "parallel_encoder",
+    "SeamBlender": "seam_blender",
+    "LoopScore": "loop_scorer",
+    "LoopScorer": "loop_scorer",
+    "ImageQuality": "image_scorer",
+    "ImageScorer": "image_scorer",
+    "ProcessedSegment": "segment_pipeline",
+    "SegmentPipeline": "segment_pipeline",
+    "BatchJob": "batch_scheduler",
+    "BatchScheduler": "batch_scheduler",
+    "FairShareLimiter": "batch_scheduler",
+    "GenerationPlan": "generation_plan",
+    "PlanExecutor": "generation_plan",
+    "PlanNode": "generation_plan",
+    "Tracer": "tracing",
+    "SpanRecord": "tracing",
+    "span": "tracing",
+    "RateLimiter": "rate_limiter",
+    "RateLimitedClient": "rate_limiter",
+    "TokenBucket": "rate_limiter",
+    "CircuitBreaker": "rate_limiter",
+    "ClientPool": "client_pool",
+    "default_client_pool": "client_pool",
+    "get_client": "client_pool",
+    "VideoDownloader": "video_download",
+    "LocalObjectStore": "video_download",
+    "GcsObjectStore": "video_download",
+    "RenderProfile": "render_profile",
+    "PROXY": "render_profile",
+    "LADDER": "render_profile",
+    "render_profiles": "render_profile",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .video_configuration import VideoConfiguration, ActionPrompt
+    from .video_generator import VideoGenerator
+    from .background_video_generator import BackgroundVideoGenerator
+    from .chained_video_generator import ChainedVideoGenerator
+    from .video_segment_manager import VideoSegmentManager
+    from .operation_poller import OperationPoller, wait_for_operation
+    from .generation_cache import GenerationCache, CacheStats
+    from .segment_manifest import SegmentManifest, SegmentRecord
+    from .parallel_encoder import ParallelEncoder
+    from .seam_blender import SeamBlender
+    from .loop_scorer import LoopScore, LoopScorer
+    from .image_scorer import ImageQuality, ImageScorer
+    from .segment_pipeline import ProcessedSegment, SegmentPipeline
+    from .client_pool import ClientPool, default_client_pool, get_client
+    from .rate_limiter import CircuitBreaker, RateLimitedClient, RateLimiter, TokenBucket
+    from .batch_scheduler import BatchJob, BatchScheduler, FairShareLimiter
+    from .generation_plan import GenerationPlan, PlanExecutor, PlanNode
+    from .tracing import SpanRecord, Tracer, span
+    from .timeline import TimelineEntry, TimelineRenderer, compile_timeline
+    from .video_download import GcsObjectStore, LocalObjectStore, VideoDownloader
+    from .render_profile import LADDER, PROXY, RenderProfile, render_profiles
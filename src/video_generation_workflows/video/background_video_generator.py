@@ -1,16 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import logging
+import os
 import pathlib
-import time
-from typing import Final, Union
-
-from google import genai
-from google.genai import types
+import shutil
+from typing import TYPE_CHECKING, Any, AsyncContextManager, Callable, Dict, Final, List, Mapping, Optional, Tuple, Union
 
+from .client_pool import ClientPool, default_client_pool
+from .generation_cache import GenerationCache
+from .generation_plan import CONCAT, IMAGE, VIDEO, GenerationPlan, PlanExecutor, PlanNode
+from .image_scorer import ImageScorer
+from .loop_scorer import LoopScorer
+from .operation_poller import OperationPoller
+from .rate_limiter import RateLimiter
+from .render_profile import RenderProfile
+from .segment_manifest import prompt_hash
+from .segment_pipeline import ProcessedSegment, SegmentPipeline
+from .timeline import BASE_SOURCE, TimelineRenderer, compile_timeline
+from .tracing import Tracer, span
 from .video_configuration import VideoConfiguration
+from .video_download import VideoDownloader
 from .video_generator import VideoGenerator
 from .video_segment_manager import VideoSegmentManager
-from moviepy import VideoFileClip
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+logger = logging.getLogger(__name__)
 
 
 class BackgroundVideoGenerator(VideoGenerator):
@@ -19,18 +40,48 @@ class BackgroundVideoGenerator(VideoGenerator):
     appends them to a `VideoSegmentManager`.
 
     Flow:
-    - Generate a base image from the base scene prompt (Imagen)
-    - For each segment index in the configured length:
-      - Build a prompt that keeps the base loop and optionally applies any
-        action(s) whose `start_index` matches the segment index
-      - Generate a video constrained to a seamless, static loop (Veo)
-      - Append the resulting segment to the manager
+    - Generate a base image from the base scene prompt (Imagen); with
+      `image_candidates > 1`, keep the best-scoring candidate (`ImageScorer`)
+    - Build one prompt per unique segment: a shared base loop for segments
+      without actions, plus one prompt per segment whose index matches an
+      action's `start_index`
+    - Submit the segment operations (Veo), keeping up to
+      `max_concurrent_operations` in flight, and poll them together from one
+      asyncio loop through an `OperationPoller`
+    - Optionally score each segment's loop seam and regenerate it while the
+      score stays below `loop_score_threshold`
+    - With `candidates > 1`, request several videos per operation and keep
+      the best one according to `candidate_scorer`
+    - Download (streamed through a temp file by a `VideoDownloader`),
+      checksum, probe and score finished segments on worker threads
+      (`SegmentPipeline`) while later operations are still pending
+    - Append the resulting segments to the manager in index order
+    - When a `GenerationCache` is configured, identical Imagen/Veo requests
+      are served from disk instead of the API
     - Concatenate and save the final video, return the written path
+
+    With `materialize_segments=False`, per-position segment files are skipped
+    and the final video is stream-copied from the unique segments following
+    the compiled timeline (base loop ×k, action, base loop ×m, ...).
+
+    With `resume=True`, segments journaled by a previous run in the same
+    `output_dir` are validated and reused, and only the missing ones are
+    generated.
+
+    All segment operations depend only on the base image, so with a
+    concurrency limit above 1 the wall time tracks the slowest segment rather
+    than the sum of all of them. The default of 1 keeps the serial behavior.
+
+    The steps are compiled into a `GenerationPlan` (see `compile_plan`) and
+    run by a `PlanExecutor`, which starts every operation as soon as its
+    inputs exist. `plan` reports the unique calls and critical path of a
+    configuration without spending any quota.
     """
 
     IMAGEN_MODEL: Final[str] = "imagen-3.0-generate-002"
     VEO_MODEL: Final[str] = "veo-3.0-generate-preview"
     ASPECT_RATIO: Final[str] = "16:9"
+    BASE_SEGMENT_KEY: Final[str] = BASE_SOURCE
 
     # Strong, reusable constraints to create static, loopable clips without an explicit end frame
     STATIC_LOOP_PREAMBLE: Final[str] = (
@@ -51,127 +102,536 @@ class BackgroundVideoGenerator(VideoGenerator):
         project_id: str,
         location: str,
         output_dir: Union[str, pathlib.Path],
+        *,
+        max_concurrent_operations: int = 1,
+        min_poll_interval_seconds: float = 1.0,
+        max_poll_interval_seconds: float = 30.0,
+        cache: Optional[GenerationCache] = None,
+        materialize_segments: bool = True,
+        loop_score_threshold: Optional[float] = None,
+        max_regenerations: int = 2,
+        loop_scorer: Optional[LoopScorer] = None,
+        pipeline_workers: int = 4,
+        segment_transcoder: Optional[Callable[[pathlib.Path], None]] = None,
+        candidates: int = 1,
+        candidate_scorer: Optional[Callable[[pathlib.Path], float]] = None,
+        image_candidates: int = 1,
+        image_scorer: Optional[ImageScorer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        client_pool: Optional[ClientPool] = None,
+        tracer: Optional[Tracer] = None,
+        output_gcs_uri: Optional[str] = None,
+        downloader: Optional[VideoDownloader] = None,
+        render_profile: Optional[RenderProfile] = None,
     ) -> None:
+        """
+        Create a background video generator.
+
+        Parameters
+        ----------
+        project_id : str
+            Google Cloud project used for Vertex AI calls.
+        location : str
+            Vertex AI region, e.g. "us-central1".
+        output_dir : Path-like
+            Directory where the base image, segments and final video are written.
+        max_concurrent_operations : int, optional
+            Maximum number of Veo operations in flight at once. Defaults to 1
+            (strictly serial generation).
+        min_poll_interval_seconds : float, optional
+            Shortest delay between polls of an in-flight operation.
+        max_poll_interval_seconds : float, optional
+            Longest delay between polls of an in-flight operation.
+        cache : GenerationCache, optional
+            Cache consulted before every Imagen/Veo request. Identical requests
+            (same model, prompt, reference image and config) are served from it
+            instead of calling the API.
+        materialize_segments : bool, optional
+            Store every segment position through a `VideoSegmentManager`
+            (journaled, resumable). When False, only the unique segments are
+            written and the final video is rendered from the run-length
+            timeline with `TimelineRenderer`, which keeps hour-long loops cheap.
+        loop_score_threshold : float, optional
+            When set, every generated segment is scored with `loop_scorer` and
+            regenerated while its score is below this threshold (0..1).
+        max_regenerations : int, optional
+            Maximum number of regenerations per segment when gating on loop score.
+        loop_scorer : LoopScorer, optional
+            Scorer used by the loop gate. Defaults to `LoopScorer()`.
+        pipeline_workers : int, optional
+            Threads that save, checksum, probe and score finished segments while
+            other operations are still in flight.
+        segment_transcoder : Callable[[Path], None], optional
+            In-place transform applied to each unique segment on the pipeline
+            threads before it is checksummed.
+        candidates : int, optional
+            Number of videos requested per Veo operation (1-4). With more than
+            one, all candidates are scored concurrently and the best is kept.
+        candidate_scorer : Callable[[Path], float], optional
+            Ranks candidates (higher is better). Defaults to the loop score.
+        image_candidates : int, optional
+            Number of base images requested from Imagen (1-4). With more than
+            one, the sharpest, best-exposed and least noisy one is kept.
+        image_scorer : ImageScorer, optional
+            Ranks base image candidates. Defaults to `ImageScorer()`.
+        rate_limiter : RateLimiter, optional
+            Quota, retry and circuit-breaker layer for all Imagen/Veo calls.
+            Share one instance between generators that use the same project.
+        client_pool : ClientPool, optional
+            Source of the shared genai client. Defaults to the process-wide pool.
+        tracer : Tracer, optional
+            Records timing spans for every stage of a run. The Chrome trace is
+            written to `output_dir/trace.json` and a summary table is logged
+            at the end of each run.
+        output_gcs_uri : str, optional
+            Cloud Storage prefix Veo writes videos to (e.g. "gs://bucket/veo/").
+            Videos are then streamed to disk instead of returned inline.
+        downloader : VideoDownloader, optional
+            Writes generated videos to disk. Defaults to
+            `VideoDownloader(pipeline_workers)`.
+        render_profile : RenderProfile, optional
+            Write the final video as this rendition instead of the master,
+            e.g. `PROXY` for a quick review render. The master can be written
+            later from the same segments with
+            `VideoSegmentManager.from_manifest(output_dir).save()` (this needs
+            the journaled segments of the default `materialize_segments=True`).
+        """
+        if not 1 <= candidates <= 4:
+            raise ValueError("candidates must be between 1 and 4")
+        if not 1 <= image_candidates <= 4:
+            raise ValueError("image_candidates must be between 1 and 4")
+        if max_concurrent_operations < 1:
+            raise ValueError("max_concurrent_operations must be at least 1")
         self.project_id = project_id
         self.location = location
         self.output_dir = pathlib.Path(output_dir)
+        self.max_concurrent_operations = max_concurrent_operations
+        self.min_poll_interval_seconds = min_poll_interval_seconds
+        self.max_poll_interval_seconds = max_poll_interval_seconds
+        self.cache = cache
+        self.materialize_segments = materialize_segments
+        self.loop_score_threshold = loop_score_threshold
+        self.max_regenerations = max_regenerations
+        self.loop_scorer = loop_scorer or LoopScorer()
+        self.pipeline_workers = pipeline_workers
+        self.segment_transcoder = segment_transcoder
+        self.candidates = candidates
+        self.candidate_scorer = candidate_scorer
+        self.image_candidates = image_candidates
+        self.image_scorer = image_scorer or ImageScorer()
+        self.rate_limiter = rate_limiter
+        self.client_pool = client_pool if client_pool is not None else default_client_pool()
+        self.tracer = tracer
+        self.output_gcs_uri = output_gcs_uri
+        self.downloader = downloader or VideoDownloader(pipeline_workers)
+        self.render_profile = render_profile
+
+    def _build_segment_prompt(
+        self, config: VideoConfiguration, segment_index: int, actions: List[str]
+    ) -> str:
+        """Build a segment prompt: preamble -> scene -> animation guidance -> segment index -> actions."""
+        animate_instructions = (config.animate_scene_prompt or "").strip()
+        actions_text = "".join(
+            [
+                f"\n- Apply this subtle, localized action without moving the camera or background: {action_text}."
+                for action_text in actions
+            ]
+        )
+        return (
+            f"{self.STATIC_LOOP_PREAMBLE}\n\n"
+            f"Scene description: {config.base_scene_prompt.strip()}\n"
+            f"Animation guidance: {animate_instructions}\n"
+            f"Segment {segment_index + 1} of {config.length}."
+            f"{actions_text}"
+        )
+
+    def _image_config(self) -> types.GenerateImagesConfig:
+        from google.genai import types
+
+        return types.GenerateImagesConfig(number_of_images=self.image_candidates, output_mime_type="image/jpeg")
+
+    def _select_base_image(self, images: List[types.Image]) -> types.Image:
+        """Return the highest-quality Imagen candidate."""
+        if len(images) == 1:
+            return images[0]
+        qualities = self.image_scorer.rank([image.image_bytes for image in images])
+        best = max(range(len(images)), key=lambda i: qualities[i].score)
+        print(
+            f"Base image: kept candidate {best + 1} of {len(images)} "
+            f"(scores: {', '.join(f'{q.score:.3f}' for q in qualities)})"
+        )
+        return images[best]
 
-    def _wait_for_operation(self, client: genai.Client, operation):
-        while not operation.done:
-            print("Waiting for generation...")
-            time.sleep(10)
-            operation = client.operations.get(operation)
-        return operation
+    def _video_config(self, output_gcs_uri: Optional[str] = None) -> types.GenerateVideosConfig:
+        from google.genai import types
+
+        # The output location is left out of cache keys: it does not change the content
+        return types.GenerateVideosConfig(
+            number_of_videos=self.candidates,
+            # Respect API limit; not user-configurable here
+            duration_seconds=8,  # VEO model supports this duration
+            aspect_ratio=self.ASPECT_RATIO,
+            output_gcs_uri=output_gcs_uri,
+            # last_frame=base_image,
+        )
+
+    def _submit_segment(self, client: genai.Client, prompt: str, base_image: types.Image):
+        return client.models.generate_videos(
+            model=self.VEO_MODEL,
+            prompt=prompt,
+            image=base_image,
+            config=self._video_config(self.output_gcs_uri),
+        )
+
+    @staticmethod
+    def _generated_videos(operation) -> list:
+        response = getattr(operation, "response", None) or getattr(operation, "result", None)
+        return list(getattr(response, "generated_videos", None) or [])
+
+    def generate(self, config: VideoConfiguration, *, resume: bool = False) -> str:
+        """Synchronous entry point; runs `agenerate` in a fresh event loop."""
+        return self.client_pool.run(self.agenerate(config, resume=resume))
+
+    async def agenerate(
+        self,
+        config: VideoConfiguration,
+        *,
+        resume: bool = False,
+        operation_slots: Optional[AsyncContextManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        """
+        Generate the background video described by `config`.
+
+        Parameters
+        ----------
+        config : VideoConfiguration
+            The video generation configuration.
+        resume : bool, optional
+            Continue a previous run in `output_dir`: reuse its base image,
+            restore the segments journaled in its manifest that still match
+            their checksum and prompt, and only generate the missing ones.
+        operation_slots : AsyncContextManager, optional
+            Limit entered around every Imagen/Veo operation. Pass one shared
+            by several generators (see `BatchScheduler`) to give them a common
+            budget; defaults to a semaphore of `max_concurrent_operations`.
+        rate_limiter : RateLimiter, optional
+            Overrides the generator's `rate_limiter` for this run.
+
+        Returns
+        -------
+        str
+            Path to the final video.
+        """
+        if self.tracer is None:
+            return await self._agenerate(config, resume, operation_slots, rate_limiter)
+        try:
+            with self.tracer.activate(), span("generate", video=config.video_name):
+                return await self._agenerate(config, resume, operation_slots, rate_limiter)
+        finally:
+            trace_path = self.tracer.save(self.output_dir / "trace.json")
+            logger.info(f"Timing summary for '{config.video_name}':\n{self.tracer.summary()}")
+            logger.info(f"Wrote timing trace to '{trace_path}'")
+
+    async def _agenerate(
+        self,
+        config: VideoConfiguration,
+        resume: bool,
+        operation_slots: Optional[AsyncContextManager],
+        rate_limiter: Optional[RateLimiter],
+    ) -> str:
+        from google.genai import types
 
-    def generate(self, config: VideoConfiguration) -> str:
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        client = genai.Client(
-            vertexai=True,
-            project=self.project_id,
-            location=self.location,
-            http_options=types.HttpOptions(api_version="v1"),
+        client = self.client_pool.get(self.project_id, self.location)
+        limiter = rate_limiter or self.rate_limiter
+        if limiter is not None:
+            client = limiter.wrap(client)
+
+        slots = operation_slots or asyncio.Semaphore(self.max_concurrent_operations)
+
+        # The plan is the single source of prompts: one video node per unique
+        # timeline source, shared by every segment index that plays it
+        plan = self.compile_plan(config)
+        output_node = plan.nodes[plan.output]
+        video_nodes = {node.key: node for node in plan.nodes.values() if node.kind == VIDEO}
+        segment_keys: List[Union[str, int]] = [plan.nodes[dep].key for dep in output_node.deps]
+        segment_hashes = [prompt_hash(video_nodes[key].prompt) for key in segment_keys]
+
+        manager = VideoSegmentManager(video_name=config.video_name, output_dir=self.output_dir)
+
+        # Each unique segment is written once to its source file
+        results: Dict[Union[str, int], ProcessedSegment] = {}
+        next_index = manager.restore(segment_hashes) if resume else 0
+
+        if next_index:
+            print(f"Resuming after {next_index} restored segment(s) of {config.length}")
+            # Any restored base segment can stand in for the shared base loop
+            base_node = video_nodes.get(self.BASE_SEGMENT_KEY)
+            base_hash = prompt_hash(base_node.prompt) if base_node is not None else None
+            for record in manager.segment_records:
+                if record.prompt_hash == base_hash:
+                    results[self.BASE_SEGMENT_KEY] = ProcessedSegment(
+                        key=self.BASE_SEGMENT_KEY,
+                        path=self.output_dir / record.filename,
+                        sha256=record.sha256,
+                    )
+                    break
+        pending_keys = set(segment_keys[next_index:]) - set(results)
+
+        completed = {node.id: results.get(key) for key, node in video_nodes.items() if key not in pending_keys}
+        if not pending_keys:
+            # Every segment is restored; the base image is not needed
+            completed.update({node.id: None for node in plan.nodes.values() if node.kind == IMAGE})
+
+        pipeline = SegmentPipeline(
+            self.pipeline_workers,
+            scorer=self.loop_scorer if self.loop_score_threshold is not None else None,
+            transcode=self.segment_transcoder,
         )
+        ingestion: List[asyncio.Future] = []
+
+        def flush_ready_segments() -> None:
+            # Hand finished segments to the manager strictly in index order, on the
+            # pipeline's ordered stage so the event loop keeps polling meanwhile
+            nonlocal next_index
+            while self.materialize_segments and next_index < config.length:
+                processed = results.get(segment_keys[next_index])
+                if processed is None:
+                    return
+                # Stored once and shared by the manager for every reuse
+                ingestion.append(
+                    pipeline.ingest(
+                        functools.partial(
+                            manager.add_segment,
+                            processed.path,
+                            prompt_hash=segment_hashes[next_index],
+                            sha256=processed.sha256,
+                            duration=processed.duration,
+                        )
+                    )
+                )
+                next_index += 1
 
-        # 1) Generate base image from the base scene prompt
-        image_response = client.models.generate_images(
-            model=self.IMAGEN_MODEL,
-            prompt=config.base_scene_prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1, output_mime_type="image/jpeg"
-            ),
+        poller = OperationPoller(
+            client,
+            min_interval_seconds=self.min_poll_interval_seconds,
+            max_interval_seconds=self.max_poll_interval_seconds,
+            model=self.VEO_MODEL,
         )
-        if not image_response.generated_images:
-            raise RuntimeError("Imagen returned no images.")
 
-        base_image = image_response.generated_images[0].image
-        image_path = self.output_dir / "image_1.jpg"
-        base_image.save(image_path)
+        # 1) Generate base image from the base scene prompt (or reuse a cached one)
+        async def generate_image(node: PlanNode, inputs: List[Any]) -> types.Image:
+            image_path = self.output_dir / "image_1.jpg"
+            reuse_image = resume and image_path.exists()
+            image_cache_key = None
+            cached_image_path = None
+            if self.cache is not None and not reuse_image:
+                image_cache_key = GenerationCache.key(self.IMAGEN_MODEL, node.prompt, config=self._image_config())
+                cached_image_path = self.cache.get(image_cache_key)
 
-        # 2) Generate N segments, allowing actions to add unique features per segment
-        manager = VideoSegmentManager(video_name=config.video_name, output_dir=self.output_dir)
+            if reuse_image:
+                # Restored segments were generated from this image; keep using it
+                return types.Image(image_bytes=image_path.read_bytes(), mime_type="image/jpeg")
+            if cached_image_path is not None:
+                shutil.copyfile(cached_image_path, image_path)
+                return types.Image(image_bytes=image_path.read_bytes(), mime_type="image/jpeg")
 
-        # Pre-index actions by their start index for quick lookup
-        index_to_actions = {}
-        for ap in config.action_prompts:
-            index_to_actions.setdefault(ap.start_index, []).append(ap.prompt)
+            async with contextlib.AsyncExitStack() as stack:
+                with span("imagen.queue"):
+                    await stack.enter_async_context(slots)
+                with span("imagen.generate"):
+                    image_response = await asyncio.to_thread(
+                        client.models.generate_images,
+                        model=self.IMAGEN_MODEL,
+                        prompt=node.prompt,
+                        config=self._image_config(),
+                    )
+            if not image_response.generated_images:
+                raise RuntimeError("Imagen returned no images.")
 
-        # If any segments have no actions, pre-generate a single base segment to reuse
-        animate_instructions_global = (config.animate_scene_prompt or "").strip()
-        base_segment_path = self.output_dir / "segment_base.mp4"
-        if any(i not in index_to_actions for i in range(config.length)):
-            base_segment_prompt = (
-                f"{self.STATIC_LOOP_PREAMBLE}\n\n"
-                f"Scene description: {config.base_scene_prompt.strip()}\n"
-                f"Animation guidance: {animate_instructions_global}\n"
-                f"Segment 1 of {config.length}."
-            )
+            with span("imagen.select", candidates=len(image_response.generated_images)):
+                base_image = await asyncio.to_thread(
+                    self._select_base_image, [generated.image for generated in image_response.generated_images]
+                )
+            base_image.save(image_path)
+            if image_cache_key is not None:
+                self.cache.put(image_cache_key, base_image.save)
+            return base_image
 
-            base_operation = client.models.generate_videos(
-                model=self.VEO_MODEL,
-                prompt=base_segment_prompt,
-                image=base_image,
-                config=types.GenerateVideosConfig(
-                    number_of_videos=1,
-                    duration_seconds=8,
-                    aspect_ratio=self.ASPECT_RATIO,
-                ),
-            )
-            base_operation = self._wait_for_operation(client, base_operation)
-            base_videos = getattr(base_operation, "response", getattr(base_operation, "result")).generated_videos
-            if not base_videos:
-                raise RuntimeError("Veo returned no videos for base segment.")
-            base_videos[0].video.save(base_segment_path)
-
-        for segment_index in range(config.length):
-            # Build the per-segment prompt: preamble -> scene -> animation guidance -> segment index -> actions
-            animate_instructions = (config.animate_scene_prompt or "").strip()
-
-            actions_for_segment = index_to_actions.get(segment_index, [])
-
-            # Reuse the pre-generated base segment if there are no actions for this segment
-            if not actions_for_segment and base_segment_path.exists():
-                manager.add_segment(VideoFileClip(str(base_segment_path)))
-                continue
-            actions_text = "".join(
-                [
-                    f"\n- Apply this subtle, localized action without moving the camera or background: {action_text}."
-                    for action_text in actions_for_segment
-                ]
-            )
+        # 2) Generate each unique segment as soon as the base image is ready, polling
+        #    all in-flight operations together
+        async def generate_segment(node: PlanNode, inputs: List[Any]) -> ProcessedSegment:
+            (base_image,) = inputs
+            key, prompt = node.key, node.prompt
+            source_path = self._source_path(key)
+            cache_key = None
+            cached_path = None
+            if self.cache is not None:
+                cache_key = GenerationCache.key(
+                    self.VEO_MODEL, prompt, base_image.image_bytes, self._video_config()
+                )
+                cached_path = self.cache.get(cache_key)
 
-            segment_prompt = (
-                f"{self.STATIC_LOOP_PREAMBLE}\n\n"
-                f"Scene description: {config.base_scene_prompt.strip()}\n"
-                f"Animation guidance: {animate_instructions}\n"
-                f"Segment {segment_index + 1} of {config.length}."
-                f"{actions_text}"
-            )
+            for attempt in range(self.max_regenerations + 1):
+                if attempt == 0 and cached_path is not None:
+                    processed = await pipeline.process(
+                        key, functools.partial(shutil.copyfile, cached_path), source_path
+                    )
+                else:
+                    async with contextlib.AsyncExitStack() as stack:
+                        with span("veo.queue", segment=key):
+                            await stack.enter_async_context(slots)
+                        with span("veo.submit", segment=key, attempt=attempt):
+                            operation = await asyncio.to_thread(self._submit_segment, client, prompt, base_image)
+                        with span("veo.operation", segment=key, operation=getattr(operation, "name", None)):
+                            operation = await poller.wait(operation)
+
+                    videos = self._generated_videos(operation)
+                    if not videos:
+                        if key == self.BASE_SEGMENT_KEY:
+                            raise RuntimeError("Veo returned no videos for base segment.")
+                        raise RuntimeError(f"Veo returned no videos for segment {key + 1}.")
+                    processed = await self._select_candidate(pipeline, key, videos, source_path)
 
-            operation = client.models.generate_videos(
-                model=self.VEO_MODEL,
-                prompt=segment_prompt,
-                image=base_image,
-                config=types.GenerateVideosConfig(
-                    number_of_videos=1,
-                    # Respect API limit; not user-configurable here
-                    duration_seconds=8,  # VEO model supports this duration
-                    aspect_ratio=self.ASPECT_RATIO,
-                    # last_frame=base_image,
-                ),
+                if self.loop_score_threshold is None:
+                    break
+                loop_score = processed.loop_score
+                if loop_score.score >= self.loop_score_threshold:
+                    break
+                if attempt < self.max_regenerations:
+                    print(
+                        f"Segment {key} loop score {loop_score.score:.3f} is below "
+                        f"{self.loop_score_threshold:.3f}, regenerating"
+                    )
+                else:
+                    print(f"Segment {key} loop score {loop_score.score:.3f} is below threshold, keeping last attempt")
+
+            if cache_key is not None and not (attempt == 0 and cached_path is not None):
+                with span("cache.put", segment=key):
+                    await asyncio.to_thread(
+                        self.cache.put, cache_key, functools.partial(shutil.copyfile, source_path)
+                    )
+            results[key] = processed
+            flush_ready_segments()
+            return processed
+
+        # 3) Save the combined segments once every segment is in
+        async def assemble(node: PlanNode, inputs: List[Any]) -> str:
+            with span("manager.ingest"):
+                await asyncio.gather(*ingestion)
+            if self.cache is not None:
+                stats = self.cache.stats
+                print(
+                    f"Generation cache: {stats.hits} hit(s), {stats.misses} miss(es), "
+                    f"{stats.evictions} eviction(s)"
+                )
+            if not self.materialize_segments:
+                suffix = f"_{self.render_profile.name}" if self.render_profile is not None else ""
+                output_path = self.output_dir / f"{config.video_name}{suffix}.mp4"
+                sources = {key: processed.path for key, processed in results.items()}
+                return await asyncio.to_thread(
+                    TimelineRenderer().render, compile_timeline(config), sources, output_path, self.render_profile
+                )
+            return await asyncio.to_thread(manager.save, self.render_profile)
+
+        executor = PlanExecutor({IMAGE: generate_image, VIDEO: generate_segment, CONCAT: assemble})
+        flush_ready_segments()
+        try:
+            outputs = await executor.run(plan, completed)
+        finally:
+            await poller.aclose()
+            pipeline.close()
+        return outputs[plan.output]
+
+    def _candidate_score(self, processed: ProcessedSegment) -> float:
+        if self.candidate_scorer is not None:
+            return self.candidate_scorer(processed.path)
+        if processed.loop_score is not None:
+            return processed.loop_score.score
+        return self.loop_scorer.score(processed.path).score
+
+    async def _select_candidate(
+        self,
+        pipeline: SegmentPipeline,
+        key: Union[str, int],
+        videos: list,
+        source_path: pathlib.Path,
+    ) -> ProcessedSegment:
+        """Post-process and score all candidates concurrently and keep the best one at `source_path`."""
+        if len(videos) == 1:
+            return await pipeline.process(key, functools.partial(self.downloader.download, videos[0].video), source_path)
+
+        candidate_paths = [
+            source_path.with_name(f"{source_path.stem}_candidate_{i}{source_path.suffix}")
+            for i in range(1, len(videos) + 1)
+        ]
+        candidates = await asyncio.gather(
+            *(
+                pipeline.process(key, functools.partial(self.downloader.download, v.video), path)
+                for v, path in zip(videos, candidate_paths)
             )
+        )
+        scores = await asyncio.gather(*(asyncio.to_thread(self._candidate_score, c) for c in candidates))
+        best = max(range(len(candidates)), key=scores.__getitem__)
+        print(
+            f"Segment {key}: kept candidate {best + 1} of {len(candidates)} "
+            f"(scores: {', '.join(f'{score:.3f}' for score in scores)})"
+        )
+
+        for i, candidate in enumerate(candidates):
+            if i != best:
+                candidate.path.unlink(missing_ok=True)
+        source_path.unlink(missing_ok=True)
+        os.replace(candidates[best].path, source_path)
+        return dataclasses.replace(candidates[best], path=source_path)
+
+    def _segment_prompts(self, config: VideoConfiguration) -> Tuple[List[Union[str, int]], Dict[Union[str, int], str]]:
+        """Return the timeline source of every segment index and one prompt per unique source."""
+        # Pre-index actions by their start index for quick lookup
+        index_to_actions: Dict[int, List[str]] = {}
+        for ap in config.action_prompts:
+            index_to_actions.setdefault(ap.start_index, []).append(ap.prompt)
 
-            operation = self._wait_for_operation(client, operation)
+        # If any segments have no actions, a single base segment is generated
+        # and reused for all of them
+        segment_prompts: Dict[Union[str, int], str] = {}
+        for entry in compile_timeline(config):
+            if entry.source == self.BASE_SEGMENT_KEY:
+                segment_prompts[entry.source] = self._build_segment_prompt(config, 0, [])
+            else:
+                segment_prompts[entry.source] = self._build_segment_prompt(
+                    config, entry.source, index_to_actions[entry.source]
+                )
+        segment_keys: List[Union[str, int]] = [
+            i if i in index_to_actions else self.BASE_SEGMENT_KEY for i in range(config.length)
+        ]
+        return segment_keys, segment_prompts
 
-            videos = getattr(operation, "response", getattr(operation, "result")).generated_videos
-            if not videos:
-                raise RuntimeError("Veo returned no videos.")
+    def compile_plan(self, config: VideoConfiguration) -> GenerationPlan:
+        """
+        Compile `config` into a DAG: base image -> one video per segment -> concat.
 
-            # Append this segment to the manager
-            manager.add_segment(videos[0].video)
+        Segments that share a prompt (every segment without actions plays the
+        base loop) collapse into a single video node.
+        """
+        segment_keys, segment_prompts = self._segment_prompts(config)
+        plan = GenerationPlan(config.video_name)
+        image = plan.add(IMAGE, prompt=config.base_scene_prompt)
+        segments = [plan.add(VIDEO, deps=(image,), prompt=segment_prompts[key], key=key) for key in segment_keys]
+        plan.add(CONCAT, deps=segments)
+        return plan
 
-        # 3) Save the combined segments and return final path
-        final_path = manager.save()
-        return final_path
+    def plan(self, config: VideoConfiguration, estimates: Optional[Mapping[str, float]] = None) -> GenerationPlan:
+        """Dry run: print the unique calls and critical path of `config` without calling any API."""
+        plan = self.compile_plan(config)
+        print(plan.summary(estimates))
+        return plan
 
+    def _source_path(self, key: Union[str, int]) -> pathlib.Path:
+        """File holding the unique segment generated for a timeline source."""
+        if key == self.BASE_SEGMENT_KEY:
+            return self.output_dir / "segment_base.mp4"
+        return self.output_dir / f"segment_action_{key + 1:02d}.mp4"
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from .rate_limiter import RateLimiter
+from .video_configuration import VideoConfiguration
+from .video_generator import VideoGenerator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class BatchJob:
+    """
+    One video in a batch.
+
+    Attributes
+    ----------
+    generator : VideoGenerator
+        Generator that renders the video.
+    config : VideoConfiguration
+        Configuration passed to the generator.
+    priority : int
+        Higher-priority jobs are granted operation slots first.
+    weight : float
+        Share of the slots a job receives relative to other jobs of the same
+        priority while they compete.
+    options : dict
+        Extra keyword arguments for `generator.agenerate`, e.g. `resume=True`.
+    result : str, optional
+        Path to the rendered video once the job succeeded.
+    error : BaseException, optional
+        The exception the job failed with.
+    """
+    generator: VideoGenerator
+    config: VideoConfiguration
+    priority: int = 0
+    weight: float = 1.0
+    options: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[str] = None
+    error: Optional[BaseException] = None
+    in_flight: int = field(default=0, init=False)
+    granted: int = field(default=0, init=False)
+    _waiters: Deque[asyncio.Future] = field(default_factory=collections.deque, init=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.config.video_name
+
+
+class _JobSlots:
+    """Async context manager that holds one of the limiter's slots on behalf of a job."""
+
+    def __init__(self, limiter: FairShareLimiter, job: BatchJob) -> None:
+        self._limiter = limiter
+        self._job = job
+
+    async def __aenter__(self) -> None:
+        await self._limiter.acquire(self._job)
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._limiter.release(self._job)
+
+
+class FairShareLimiter:
+    """
+    A concurrency limit shared by several jobs, granted by priority and fair share.
+
+    Whenever a slot is free, the highest-priority job with a waiting
+    operation gets it; among jobs of equal priority the one with the fewest
+    in-flight operations per unit of weight wins, then the one that has been
+    granted the fewest slots overall. A large job therefore cannot starve a
+    small one, and every job keeps making progress. Request rates are
+    limited separately, by `RateLimiter`.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._jobs: List[BatchJob] = []
+        self._in_use = 0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def slots_for(self, job: BatchJob) -> _JobSlots:
+        """Return an async context manager that acquires a slot for `job`."""
+        if job not in self._jobs:
+            self._jobs.append(job)
+        return _JobSlots(self, job)
+
+    async def acquire(self, job: BatchJob) -> None:
+        future = asyncio.get_running_loop().create_future()
+        job._waiters.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation; hand the slot back
+                self.release(job)
+            elif future in job._waiters:
+                job._waiters.remove(future)
+            raise
+
+    def release(self, job: BatchJob) -> None:
+        self._in_use -= 1
+        job.in_flight -= 1
+        self._dispatch()
+
+    def _pick(self) -> Optional[BatchJob]:
+        waiting = [job for job in self._jobs if job._waiters]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda job: (-job.priority, job.in_flight / job.weight, job.granted / job.weight))
+
+    def _dispatch(self) -> None:
+        while self._in_use < self.capacity:
+            job = self._pick()
+            if job is None:
+                return
+            future = job._waiters.popleft()
+            if future.cancelled():
+                continue
+            self._in_use += 1
+            job.in_flight += 1
+            job.granted += 1
+            future.set_result(None)
+
+
+class BatchScheduler:
+    """
+    Renders many videos concurrently under one shared operation budget.
+
+    Jobs run side by side in one event loop. Every Imagen/Veo operation a
+    job's generator submits first acquires a slot from a shared
+    `FairShareLimiter`, so operations from all videos are interleaved up to
+    `max_concurrent_operations` in flight, by priority and fair share,
+    instead of each video using its own budget or running one after another.
+    All jobs also share one `RateLimiter`, so submissions stay under the
+    per-minute quota and quota errors are retried rather than failing a job.
+
+    Example
+    -------
+    >>> scheduler = BatchScheduler(max_concurrent_operations=8)
+    >>> scheduler.submit(coffee_generator, coffee_config, priority=1)
+    >>> scheduler.submit(piazza_generator, piazza_config)
+    >>> jobs = scheduler.run()
+    """
+
+    def __init__(
+        self,
+        max_concurrent_operations: int = 4,
+        *,
+        max_operations_per_minute: Optional[float] = None,
+        max_concurrent_jobs: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """
+        Create a scheduler.
+
+        Parameters
+        ----------
+        max_concurrent_operations : int, optional
+            Operations in flight at once across all jobs.
+        max_operations_per_minute : float, optional
+            Upper bound on operation submissions per minute and model across
+            all jobs. Ignored when `rate_limiter` is given.
+        max_concurrent_jobs : int, optional
+            Jobs running at once; the rest start, by priority, as others
+            finish. Unlimited by default.
+        rate_limiter : RateLimiter, optional
+            Limiter shared by all jobs. Defaults to one with a token bucket of
+            `max_operations_per_minute` per model.
+        """
+        self.max_concurrent_operations = max_concurrent_operations
+        self.max_operations_per_minute = max_operations_per_minute
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.rate_limiter = rate_limiter or RateLimiter(max_operations_per_minute)
+        self.jobs: List[BatchJob] = []
+
+    def submit(
+        self,
+        generator: VideoGenerator,
+        config: VideoConfiguration,
+        *,
+        priority: int = 0,
+        weight: float = 1.0,
+        **options: Any,
+    ) -> BatchJob:
+        """Queue a video; extra keyword arguments are passed to `generator.agenerate`."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        job = BatchJob(generator, config, priority=priority, weight=weight, options=options)
+        self.jobs.append(job)
+        return job
+
+    def run(self) -> List[BatchJob]:
+        """Synchronous entry point; runs `arun` in a fresh event loop."""
+        return asyncio.run(self.arun())
+
+    async def arun(self) -> List[BatchJob]:
+        """
+        Render all queued jobs and return them with `result` or `error` set.
+
+        A failing job does not stop the others.
+        """
+        limiter = FairShareLimiter(self.max_concurrent_operations)
+        job_slots = asyncio.Semaphore(self.max_concurrent_jobs or len(self.jobs) or 1)
+        order = itertools.count()
+
+        async def run_job(job: BatchJob) -> None:
+            async with job_slots:
+                started = time.perf_counter()
+                logger.info(f"Starting batch job '{job.name}' (priority {job.priority})")
+                try:
+                    job.result = await job.generator.agenerate(
+                        job.config,
+                        operation_slots=limiter.slots_for(job),
+                        rate_limiter=self.rate_limiter,
+                        **job.options,
+                    )
+                except Exception as e:
+                    job.error = e
+                    logger.error(f"[{next(order) + 1}/{len(self.jobs)}] Batch job '{job.name}' failed: {e}")
+                else:
+                    logger.info(
+                        f"[{next(order) + 1}/{len(self.jobs)}] Finished batch job '{job.name}' "
+                        f"in {time.perf_counter() - started:.1f}s ({job.granted} operation(s)): {job.result}"
+                    )
+
+        # Start higher-priority jobs first when max_concurrent_jobs holds some back
+        ordered = sorted(self.jobs, key=lambda job: -job.priority)
+        try:
+            await asyncio.gather(*(run_job(job) for job in ordered))
+        finally:
+            # Async sessions the jobs opened on this loop must not outlive it
+            pools = {id(pool): pool for pool in (getattr(job.generator, "client_pool", None) for job in self.jobs)}
+            for pool in pools.values():
+                if pool is not None:
+                    await pool.aclose_loop()
+        return self.jobs
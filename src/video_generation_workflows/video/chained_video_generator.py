@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import pathlib
+import shutil
+from typing import TYPE_CHECKING, AsyncContextManager, Dict, Final, List, Mapping, Optional, Union
+
+from .ffmpeg_tools import extract_last_frame
+from .client_pool import ClientPool, default_client_pool
+from .generation_cache import GenerationCache
+from .generation_plan import CONCAT, FRAME, IMAGE, VIDEO, GenerationPlan
+from .operation_poller import OperationPoller
+from .rate_limiter import RateLimiter
+from .render_profile import RenderProfile
+from .segment_manifest import prompt_hash
+from .video_configuration import VideoConfiguration
+from .video_download import VideoDownloader
+from .video_generator import VideoGenerator
+from .video_segment_manager import VideoSegmentManager
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+
+class ChainedVideoGenerator(VideoGenerator):
+    """
+    Video generator that chains segments through their last frames.
+
+    Flow:
+    - Generate a start image from the base scene prompt (Imagen)
+    - For each segment index in the configured length:
+      - Build a prompt from the animation guidance plus any action(s) whose
+        `start_index` matches the segment index
+      - Generate a video that starts from the current start image (Veo)
+      - Append the segment to a `VideoSegmentManager`
+      - Extract the segment's last frame in memory and use it as the next
+        start image
+    - Concatenate and save the final video, return the written path
+
+    Every hop depends on the previous one, so segments are generated serially;
+    `plan` shows the resulting critical path before any quota is spent.
+    Last-frame extraction seeks to the tail of the segment and decodes only
+    the frames after the last keyframe, handing the frame to the next request
+    as in-memory JPEG bytes, which keeps per-hop overhead well under a second.
+    """
+
+    IMAGEN_MODEL: Final[str] = "imagen-3.0-generate-002"
+    VEO_MODEL: Final[str] = "veo-3.0-generate-preview"
+    DURATION_SECONDS: Final[int] = 8
+    RESOLUTION: Final[str] = "1080p"
+
+    def __init__(
+        self,
+        project_id: str,
+        location: str,
+        output_dir: Union[str, pathlib.Path],
+        *,
+        min_poll_interval_seconds: float = 1.0,
+        max_poll_interval_seconds: float = 30.0,
+        cache: Optional[GenerationCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        client_pool: Optional[ClientPool] = None,
+        output_gcs_uri: Optional[str] = None,
+        downloader: Optional[VideoDownloader] = None,
+        render_profile: Optional[RenderProfile] = None,
+    ) -> None:
+        """
+        Create a chained video generator.
+
+        Parameters
+        ----------
+        project_id : str
+            Google Cloud project used for Vertex AI calls.
+        location : str
+            Vertex AI region, e.g. "us-central1".
+        output_dir : Path-like
+            Directory where the start image, segments and final video are written.
+        min_poll_interval_seconds : float, optional
+            Shortest delay between polls of an in-flight operation.
+        max_poll_interval_seconds : float, optional
+            Longest delay between polls of an in-flight operation.
+        cache : GenerationCache, optional
+            Cache consulted before every Imagen/Veo request.
+        rate_limiter : RateLimiter, optional
+            Quota, retry and circuit-breaker layer for all Imagen/Veo calls.
+        client_pool : ClientPool, optional
+            Source of the shared genai client. Defaults to the process-wide pool.
+        output_gcs_uri : str, optional
+            Cloud Storage prefix Veo writes videos to; they are then streamed
+            to disk instead of returned inline.
+        downloader : VideoDownloader, optional
+            Writes generated videos to disk. Defaults to `VideoDownloader()`.
+        render_profile : RenderProfile, optional
+            Write the final video as this rendition (e.g. `PROXY`) instead of
+            the master; see `BackgroundVideoGenerator`.
+        """
+        self.project_id = project_id
+        self.location = location
+        self.output_dir = pathlib.Path(output_dir)
+        self.min_poll_interval_seconds = min_poll_interval_seconds
+        self.max_poll_interval_seconds = max_poll_interval_seconds
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.client_pool = client_pool if client_pool is not None else default_client_pool()
+        self.output_gcs_uri = output_gcs_uri
+        self.downloader = downloader or VideoDownloader()
+        self.render_profile = render_profile
+
+    def _build_segment_prompt(self, config: VideoConfiguration, actions: List[str]) -> str:
+        """Build a hop prompt: animation guidance followed by the segment's actions."""
+        animate_instructions = (config.animate_scene_prompt or "").strip()
+        actions_text = "".join(f"\n- {action_text}" for action_text in actions)
+        return f"{animate_instructions}{actions_text}"
+
+    def _image_config(self) -> types.GenerateImagesConfig:
+        from google.genai import types
+
+        return types.GenerateImagesConfig(number_of_images=1, output_mime_type="image/jpeg")
+
+    def _video_config(self, output_gcs_uri: Optional[str] = None) -> types.GenerateVideosConfig:
+        from google.genai import types
+
+        return types.GenerateVideosConfig(
+            number_of_videos=1,
+            duration_seconds=self.DURATION_SECONDS,
+            resolution=self.RESOLUTION,
+            output_gcs_uri=output_gcs_uri,
+        )
+
+    def compile_plan(self, config: VideoConfiguration) -> GenerationPlan:
+        """Compile `config` into a DAG: image -> video -> last frame -> video -> ... -> concat."""
+        index_to_actions: Dict[int, List[str]] = {}
+        for ap in config.action_prompts:
+            index_to_actions.setdefault(ap.start_index, []).append(ap.prompt)
+
+        plan = GenerationPlan(config.video_name)
+        start = plan.add(IMAGE, prompt=config.base_scene_prompt)
+        segments = []
+        for segment_index in range(config.length):
+            prompt = self._build_segment_prompt(config, index_to_actions.get(segment_index, []))
+            segments.append(plan.add(VIDEO, deps=(start,), prompt=prompt, key=segment_index))
+            if segment_index < config.length - 1:
+                start = plan.add(FRAME, deps=(segments[-1],), key=segment_index)
+        plan.add(CONCAT, deps=segments)
+        return plan
+
+    def plan(self, config: VideoConfiguration, estimates: Optional[Mapping[str, float]] = None) -> GenerationPlan:
+        """Dry run: print the unique calls and critical path of `config` without calling any API."""
+        plan = self.compile_plan(config)
+        print(plan.summary(estimates))
+        return plan
+
+    @staticmethod
+    def _generated_videos(operation) -> list:
+        response = getattr(operation, "response", None) or getattr(operation, "result", None)
+        return list(getattr(response, "generated_videos", None) or [])
+
+    def generate(self, config: VideoConfiguration) -> str:
+        """Synchronous entry point; runs `agenerate` in a fresh event loop."""
+        return self.client_pool.run(self.agenerate(config))
+
+    async def agenerate(
+        self,
+        config: VideoConfiguration,
+        *,
+        operation_slots: Optional[AsyncContextManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        """
+        Generate the chained video described by `config`.
+
+        `operation_slots` bounds each Imagen/Veo operation and `rate_limiter`
+        overrides the generator's rate limiter for this run.
+        """
+        from google.genai import types
+
+        slots = operation_slots or contextlib.nullcontext()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        client = self.client_pool.get(self.project_id, self.location)
+        limiter = rate_limiter or self.rate_limiter
+        if limiter is not None:
+            client = limiter.wrap(client)
+
+        # 1) Generate the start image
+        image_path = self.output_dir / "start_image.jpg"
+        image_cache_key = None
+        cached_image_path = None
+        if self.cache is not None:
+            image_cache_key = GenerationCache.key(
+                self.IMAGEN_MODEL, config.base_scene_prompt, config=self._image_config()
+            )
+            cached_image_path = self.cache.get(image_cache_key)
+
+        if cached_image_path is not None:
+            start_image = types.Image(image_bytes=cached_image_path.read_bytes(), mime_type="image/jpeg")
+            start_image.save(image_path)
+        else:
+            async with slots:
+                image_response = await asyncio.to_thread(
+                    client.models.generate_images,
+                    model=self.IMAGEN_MODEL,
+                    prompt=config.base_scene_prompt,
+                    config=self._image_config(),
+                )
+            if not image_response.generated_images:
+                raise RuntimeError("Imagen did not return an image.")
+            start_image = image_response.generated_images[0].image
+            start_image.save(image_path)
+            if image_cache_key is not None:
+                await asyncio.to_thread(self.cache.put, image_cache_key, start_image.save)
+
+        index_to_actions: Dict[int, List[str]] = {}
+        for ap in config.action_prompts:
+            index_to_actions.setdefault(ap.start_index, []).append(ap.prompt)
+
+        # 2) Generate each hop from the previous hop's last frame
+        manager = VideoSegmentManager(video_name=config.video_name, output_dir=self.output_dir)
+        poller = OperationPoller(
+            client,
+            min_interval_seconds=self.min_poll_interval_seconds,
+            max_interval_seconds=self.max_poll_interval_seconds,
+            model=self.VEO_MODEL,
+        )
+        try:
+            for segment_index in range(config.length):
+                prompt = self._build_segment_prompt(config, index_to_actions.get(segment_index, []))
+                print(f"Generating segment {segment_index + 1} of {config.length}")
+
+                cache_key = None
+                cached_path = None
+                if self.cache is not None:
+                    cache_key = GenerationCache.key(
+                        self.VEO_MODEL, prompt, start_image.image_bytes, self._video_config()
+                    )
+                    cached_path = self.cache.get(cache_key)
+
+                if cached_path is not None:
+                    await asyncio.to_thread(manager.add_segment, cached_path, prompt_hash=prompt_hash(prompt))
+                else:
+                    async with slots:
+                        operation = await asyncio.to_thread(
+                            client.models.generate_videos,
+                            model=self.VEO_MODEL,
+                            prompt=prompt,
+                            image=start_image,
+                            config=self._video_config(self.output_gcs_uri),
+                        )
+                        operation = await poller.wait(operation)
+                    videos = self._generated_videos(operation)
+                    if not videos:
+                        raise RuntimeError(f"Veo returned no videos for segment {segment_index + 1}.")
+                    download_path = self.output_dir / f".download_{segment_index:02d}.mp4"
+                    await asyncio.to_thread(self.downloader.download, videos[0].video, download_path)
+                    await asyncio.to_thread(manager.add_segment, download_path, prompt_hash=prompt_hash(prompt))
+                    download_path.unlink(missing_ok=True)
+
+                segment_path = manager.segment_paths[-1]
+                if cache_key is not None and cached_path is None:
+                    await asyncio.to_thread(self.cache.put, cache_key, lambda path: shutil.copyfile(segment_path, path))
+
+                if segment_index < config.length - 1:
+                    frame_bytes = await asyncio.to_thread(extract_last_frame, segment_path)
+                    start_image = types.Image(image_bytes=frame_bytes, mime_type="image/jpeg")
+        finally:
+            await poller.aclose()
+
+        # 3) Save the combined segments and return final path
+        return await asyncio.to_thread(manager.save, self.render_profile)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (project, location, api_version)
+ClientKey = Tuple[str, str, str]
+ClientFactory = Callable[[str, str, str], Any]
+# Builds the async surface (`client.aio`) of a shared client for the running loop
+AsyncClientFactory = Callable[[Any], Any]
+# (async surface, shared client it was built for)
+_LoopClient = Tuple[Any, Any]
+
+
+def vertex_client(project: str, location: str, api_version: str) -> genai.Client:
+    """Default factory: a Vertex AI genai client."""
+    from google import genai
+    from google.genai import types
+
+    return genai.Client(
+        vertexai=True,
+        project=project,
+        location=location,
+        http_options=types.HttpOptions(api_version=api_version),
+    )
+
+
+def vertex_async_client(client: genai.Client) -> genai.client.AsyncClient:
+    """Default async factory: `client.aio` with an HTTP session of its own.
+
+    Credentials, project and HTTP options stay those of `client`; only the
+    async HTTP session is new, so it can be opened on the running loop and
+    closed with it. Clients that are not genai clients (e.g. offline fakes)
+    serve their own `aio`.
+    """
+    shared = getattr(client, "_api_client", None)
+    if shared is None:
+        return client.aio
+    from google.genai._api_client import AsyncHttpxClient
+    from google.genai.client import AsyncClient
+
+    api_client = copy.copy(shared)
+    # Closing the copy must leave the shared synchronous session open
+    api_client._http_options = shared._http_options.model_copy(
+        update={"httpx_client": shared._httpx_client, "httpx_async_client": None}
+    )
+    api_client._async_httpx_client = AsyncHttpxClient(**shared._async_httpx_client_args)
+    api_client._aiohttp_sessions = {}
+    return AsyncClient(api_client)
+
+
+class _PooledClient:
+    """
+    A pooled client whose async surface belongs to the calling event loop.
+
+    Everything but `aio` is the shared client. The async HTTP session behind
+    `client.aio` is bound to the loop that first used it, and every
+    `generate()` runs its own `asyncio.run` loop, so `aio` is served from an
+    async surface the pool opened for the running loop instead.
+    """
+
+    def __init__(self, pool: ClientPool, key: ClientKey, client: Any) -> None:
+        self._pool = pool
+        self._key = key
+        self.client = client
+
+    @property
+    def aio(self) -> Any:
+        if not hasattr(self.client, "aio"):
+            raise AttributeError("aio")
+        return self._pool._loop_client(self._key, self.client)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class ClientPool:
+    """
+    Thread-safe cache of genai clients keyed by (project, location, api_version).
+
+    Building a client resolves credentials and opens a fresh HTTP connection
+    pool, so creating one per generation pays that setup again for every
+    video. Clients from a pool are shared by every generator and thread that
+    asks for the same key and keep their connections warm between calls.
+    Their async surface (`client.aio`) is the exception: an async session
+    cannot outlive the loop it was opened on, so each event loop gets its own,
+    built on the shared client's credentials. Code that runs a loop closes
+    those sessions with `aclose_loop` (or runs through `ClientPool.run`).
+
+    The factory is swappable, e.g. to hand out a fake client in offline runs:
+
+    >>> pool = ClientPool(lambda project, location, api_version: FakeClient())
+    """
+
+    def __init__(
+        self, factory: Optional[ClientFactory] = None, async_factory: Optional[AsyncClientFactory] = None
+    ) -> None:
+        """
+        Create a pool.
+
+        Parameters
+        ----------
+        factory : Callable[[str, str, str], client], optional
+            Builds a client for (project, location, api_version). Defaults to
+            `vertex_client`.
+        async_factory : Callable[[client], async client], optional
+            Builds the async surface of a shared client for the running event
+            loop. Defaults to `vertex_async_client`.
+        """
+        self._factory: ClientFactory = factory or vertex_client
+        self._async_factory: AsyncClientFactory = async_factory or vertex_async_client
+        self._clients: Dict[ClientKey, _PooledClient] = {}
+        # Async surfaces opened per loop; dropped with the loop if it is never closed
+        self._loop_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, _LoopClient]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, project: str, location: str, api_version: str = "v1") -> Any:
+        """Return the shared client for the key, creating it on first use."""
+        key = (project, location, api_version)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                logger.info(f"Creating genai client for project '{project}' in {location} ({api_version})")
+                client = _PooledClient(self, key, self._factory(project, location, api_version))
+                self._clients[key] = client
+            return client
+
+    def _loop_client(self, key: ClientKey, shared: Any) -> Any:
+        """Return the async surface serving `key` on the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return shared.aio
+        with self._lock:
+            clients = self._loop_clients.setdefault(loop, {})
+            if key not in clients:
+                clients[key] = (self._async_factory(shared), shared)
+            return clients[key][0]
+
+    async def aclose_loop(self) -> None:
+        """Close the async sessions opened on the running event loop."""
+        with self._lock:
+            clients = self._loop_clients.pop(asyncio.get_running_loop(), {})
+        for aio, shared in clients.values():
+            # A client serving its own `aio` keeps it open across loops
+            aclose = getattr(aio, "aclose", None)
+            if callable(aclose) and aio is not getattr(shared, "aio", None):
+                await aclose()
+
+    def run(self, main: Awaitable[T]) -> T:
+        """Run `main` with `asyncio.run`, closing the pool's sessions on that loop before it exits."""
+
+        async def _main() -> T:
+            try:
+                return await main
+            finally:
+                await self.aclose_loop()
+
+        return asyncio.run(_main())
+
+    def set_factory(
+        self, factory: Optional[ClientFactory], async_factory: Optional[AsyncClientFactory] = None
+    ) -> None:
+        """Swap the factories (None restores the defaults) and drop the clients built so far."""
+        with self._lock:
+            self._factory = factory or vertex_client
+            self._async_factory = async_factory or vertex_async_client
+            self._close_clients()
+
+    def close(self) -> None:
+        """Close and forget every pooled client."""
+        with self._lock:
+            self._close_clients()
+
+    def _close_clients(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._loop_clients = weakref.WeakKeyDictionary()
+        for client in clients.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                close()
+
+
+_default_pool = ClientPool()
+
+
+def default_client_pool() -> ClientPool:
+    """Return the process-wide pool used by generators that are not given one."""
+    return _default_pool
+
+
+def get_client(project: str, location: str, api_version: str = "v1") -> Any:
+    """Return the shared client for (project, location, api_version) from the default pool."""
+    return _default_pool.get(project, location, api_version)
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_ffprobe_missing_warned = False
+
+
+def ffmpeg_binary() -> str:
+    """Return the ffmpeg executable MoviePy is configured to use."""
+    from moviepy.config import FFMPEG_BINARY
+
+    return FFMPEG_BINARY
+
+
+def ffprobe_binary() -> Optional[str]:
+    """Return an ffprobe executable, or None if none is available.
+
+    Looks next to the configured ffmpeg first, then on `PATH`. The ffmpeg
+    bundled with MoviePy (imageio-ffmpeg) ships without ffprobe, so a system
+    FFmpeg install is needed for the fast paths; a warning is logged once
+    when it is missing.
+    """
+    global _ffprobe_missing_warned
+    sibling = pathlib.Path(ffmpeg_binary()).with_name(
+        "ffprobe.exe" if os.name == "nt" else "ffprobe"
+    )
+    if sibling.is_file():
+        return str(sibling)
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None and not _ffprobe_missing_warned:
+        _ffprobe_missing_warned = True
+        logger.warning(
+            "ffprobe was not found next to ffmpeg or on PATH. Segments will always be re-encoded instead of "
+            "stream-copied, seam blending is unavailable and frames are sampled through MoviePy. "
+            "Install FFmpeg (including ffprobe) and put it on PATH; see the README."
+        )
+    return ffprobe
+
+
+def run_ffmpeg(args: Sequence[str]) -> None:
+    """Run ffmpeg with `args`, raising RuntimeError with its stderr on failure."""
+    command = [ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y", *args]
+    logger.debug(f"Running: {' '.join(command)}")
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed with exit code {result.returncode}: {stderr[-2000:]}")
+
+
+@dataclass(frozen=True)
+class VideoStreamInfo:
+    """
+    Properties of the first video stream of a media file.
+
+    Attributes
+    ----------
+    codec : str
+        Codec name, e.g. "h264".
+    profile : str
+        Codec profile, e.g. "High".
+    width : int
+        Frame width in pixels.
+    height : int
+        Frame height in pixels.
+    pix_fmt : str
+        Pixel format, e.g. "yuv420p".
+    frame_rate : str
+        Rational frame rate as reported by ffprobe, e.g. "24/1".
+    time_base : str
+        Stream timebase, e.g. "1/12288".
+    duration : float
+        Duration of the video stream in seconds. Audio can run past the
+        video, so this may be shorter than the container duration.
+    """
+    codec: str
+    profile: str
+    width: int
+    height: int
+    pix_fmt: str
+    frame_rate: str
+    time_base: str
+    duration: float
+
+    @property
+    def concat_signature(self) -> Tuple[str, str, int, int, str, str, str]:
+        """Properties that must match for segments to be joined without re-encoding."""
+        return (self.codec, self.profile, self.width, self.height, self.pix_fmt, self.frame_rate, self.time_base)
+
+
+def probe_video(path: Union[str, pathlib.Path]) -> Optional[VideoStreamInfo]:
+    """Probe the first video stream of `path`.
+
+    Returns None when ffprobe is unavailable or the file has no video stream.
+    """
+    ffprobe = ffprobe_binary()
+    if ffprobe is None:
+        return None
+    result = subprocess.run(
+        [
+            ffprobe, "-v", "error", "-select_streams", "v:0",
+            "-show_entries",
+            "stream=codec_name,profile,width,height,pix_fmt,r_frame_rate,time_base,duration,nb_frames"
+            ":format=duration",
+            "-of", "json", str(path),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        logger.warning(f"ffprobe failed for '{path}': {result.stderr.decode('utf-8', errors='replace').strip()}")
+        return None
+    data = json.loads(result.stdout or b"{}")
+    streams = data.get("streams") or []
+    if not streams:
+        return None
+    stream = streams[0]
+    return VideoStreamInfo(
+        codec=stream.get("codec_name", ""),
+        profile=stream.get("profile", ""),
+        width=int(stream.get("width", 0)),
+        height=int(stream.get("height", 0)),
+        pix_fmt=stream.get("pix_fmt", ""),
+        frame_rate=stream.get("r_frame_rate", ""),
+        time_base=stream.get("time_base", ""),
+        duration=_stream_duration(stream, (data.get("format") or {}).get("duration")),
+    )
+
+
+def _stream_duration(stream: dict, container_duration: Optional[str]) -> float:
+    # Prefer the video stream's own length; the container's includes trailing audio
+    duration = stream.get("duration")
+    if duration not in (None, "", "N/A"):
+        return float(duration)
+    frames = stream.get("nb_frames")
+    numerator, _, denominator = stream.get("r_frame_rate", "").partition("/")
+    if frames not in (None, "", "N/A") and numerator.isdigit() and int(numerator) > 0:
+        return int(frames) * int(denominator or 1) / int(numerator)
+    return float(container_duration or 0.0)
+
+
+def keyframe_times(path: Union[str, pathlib.Path]) -> Optional[List[float]]:
+    """Return the presentation times of the video keyframes in `path`, from 0.
+
+    Reads packet flags only, so nothing is decoded. Returns None when ffprobe
+    is unavailable, and `[0.0]` when no packet is flagged as a keyframe.
+    """
+    ffprobe = ffprobe_binary()
+    if ffprobe is None:
+        return None
+    result = subprocess.run(
+        [
+            ffprobe, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", str(path),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        logger.warning(f"ffprobe failed for '{path}': {result.stderr.decode('utf-8', errors='replace').strip()}")
+        return None
+    times = []
+    for line in result.stdout.decode("utf-8").splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            times.append(float(pts_time))
+    if not times:
+        # No flagged keyframe packets (e.g. an empty stream); the stream start is the only safe cut
+        return [0.0]
+    times.sort()
+    # Relative to the start of the stream, which opens with a keyframe
+    return [t - times[0] for t in times]
+
+
+def extract_last_frame(path: Union[str, pathlib.Path], tail_seconds: float = 0.5, quality: int = 2) -> bytes:
+    """Return the last frame of a video as in-memory JPEG bytes.
+
+    Seeks relative to the end of the file, so ffmpeg starts decoding at the
+    last keyframe before the tail instead of decoding the whole clip; the
+    short tail is reversed so the final frame is emitted first. Nothing is
+    written to disk.
+
+    Parameters
+    ----------
+    path : Path-like
+        Video file.
+    tail_seconds : float, optional
+        Length of the tail to decode.
+    quality : int, optional
+        MJPEG quality scale (2 is near-lossless, 31 is worst).
+    """
+    result = subprocess.run(
+        [
+            ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+            "-sseof", f"-{tail_seconds:.3f}", "-i", str(path),
+            "-map", "0:v:0", "-an", "-vf", "reverse", "-frames:v", "1",
+            "-c:v", "mjpeg", "-q:v", str(quality), "-f", "image2pipe", "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0 or not result.stdout:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Failed to extract the last frame of '{path}': {stderr[-2000:]}")
+    return result.stdout
+
+
+def parse_rate(value: str) -> float:
+    """Convert an ffprobe rational such as "24000/1001" to a float."""
+    numerator, _, denominator = value.partition("/")
+    return float(numerator) / float(denominator or 1)
+
+
+def video_geometry(path: Union[str, pathlib.Path]) -> Tuple[int, int, float]:
+    """Return (width, height, fps) of a video, via ffprobe or MoviePy as a fallback."""
+    info = probe_video(path)
+    if info is not None:
+        return info.width, info.height, parse_rate(info.frame_rate)
+
+    from moviepy import VideoFileClip
+
+    with VideoFileClip(str(path), audio=False) as clip:
+        return int(clip.size[0]), int(clip.size[1]), float(clip.fps)
+
+
+def can_stream_copy(paths: Sequence[Union[str, pathlib.Path]]) -> bool:
+    """Return True if all `paths` share codec, resolution, frame rate and timebase."""
+    signatures = set()
+    for path in dict.fromkeys(str(p) for p in paths):
+        info = probe_video(path)
+        if info is None:
+            return False
+        signatures.add(info.concat_signature)
+        if len(signatures) > 1:
+            logger.info(f"Segment '{path}' differs from the others: {info}")
+            return False
+    return bool(signatures)
+
+
+def _concat_list_line(path: Union[str, pathlib.Path]) -> str:
+    escaped = str(pathlib.Path(path).resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+def write_concat_list(paths: Sequence[Union[str, pathlib.Path]], list_path: Union[str, pathlib.Path]) -> None:
+    """Write an ffmpeg concat demuxer list referencing `paths` in order."""
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in paths:
+            f.write(_concat_list_line(path))
+
+
+@traced("ffmpeg.concat")
+def concat_stream_copy(
+    paths: Sequence[Union[str, pathlib.Path]],
+    output_path: Union[str, pathlib.Path],
+    extra_args: Optional[List[str]] = None,
+) -> None:
+    """Join `paths` into `output_path` with the concat demuxer, without re-encoding.
+
+    Only the first video stream is kept, matching the MoviePy path which
+    writes with `audio=False`.
+    """
+    with tempfile.TemporaryDirectory(prefix="concat_") as tmp_dir:
+        list_path = pathlib.Path(tmp_dir) / "segments.txt"
+        write_concat_list(paths, list_path)
+        run_ffmpeg(
+            [
+                "-f", "concat", "-safe", "0", "-i", str(list_path),
+                "-map", "0:v:0", "-c", "copy", "-an",
+                "-movflags", "+faststart",
+                *(extra_args or []),
+                str(output_path),
+            ]
+        )
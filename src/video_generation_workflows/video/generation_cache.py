@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a `GenerationCache` instance."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _config_fingerprint(config: Any) -> Any:
+    """Return a JSON-serializable, order-independent view of a request config."""
+    if config is None:
+        return None
+    if hasattr(config, "model_dump"):
+        # google.genai types are pydantic models
+        return config.model_dump(mode="json", exclude_none=True)
+    if isinstance(config, dict):
+        return config
+    return repr(config)
+
+
+class GenerationCache:
+    """
+    Persistent, content-addressed cache for Imagen and Veo results.
+
+    Entries are keyed by a SHA-256 hash of the model name, the fully assembled
+    prompt, the reference image bytes and the request config (see `key`), and
+    stored as one file per entry under `cache_dir`. Recency is tracked through
+    file modification times, so the cache can be shared by several scripts and
+    processes: a hit refreshes the entry, and once the total size exceeds
+    `max_size_bytes` the least recently used entries are evicted.
+
+    Writes go through a temporary file and an atomic rename, so a crash never
+    leaves a partial entry behind.
+    """
+
+    DEFAULT_MAX_SIZE_BYTES = 20 * 1024 ** 3
+
+    def __init__(
+        self,
+        cache_dir: Union[str, pathlib.Path, None] = None,
+        *,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        """
+        Create a cache.
+
+        Parameters
+        ----------
+        cache_dir : Path-like, optional
+            Directory holding the cache entries. Defaults to `$GENERATION_CACHE_DIR`,
+            or `~/.cache/video_generation_workflows` when unset.
+        max_size_bytes : int, optional
+            Size quota for all entries; least recently used entries are evicted
+            beyond it. Defaults to 20 GiB.
+        """
+        if cache_dir is None:
+            cache_dir = os.getenv(
+                "GENERATION_CACHE_DIR",
+                str(pathlib.Path.home() / ".cache" / "video_generation_workflows"),
+            )
+        self.cache_dir: pathlib.Path = pathlib.Path(cache_dir)
+        self.max_size_bytes: int = max_size_bytes
+        self.stats: CacheStats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        model: str,
+        prompt: str,
+        image_bytes: Optional[bytes] = None,
+        config: Any = None,
+    ) -> str:
+        """Compute the cache key for one generation request.
+
+        Parameters
+        ----------
+        model : str
+            Model name, e.g. `BackgroundVideoGenerator.VEO_MODEL`.
+        prompt : str
+            Fully assembled prompt sent to the model.
+        image_bytes : bytes, optional
+            Reference image bytes, if the request is conditioned on an image.
+        config : GenerateVideosConfig | GenerateImagesConfig, optional
+            Request config; its serialized fields are part of the key.
+        """
+        digest = hashlib.sha256()
+        header = json.dumps(
+            {"model": model, "prompt": prompt, "config": _config_fingerprint(config)},
+            sort_keys=True,
+            default=repr,
+        )
+        digest.update(header.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(image_bytes or b"").digest())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[pathlib.Path]:
+        """Return the path of a cached entry, or None on a miss.
+
+        A hit marks the entry as most recently used.
+        """
+        path = self._entry_path(key)
+        with self._lock:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self.stats.misses += 1
+                logger.info(f"Generation cache miss for {key[:12]}")
+                return None
+            self.stats.hits += 1
+        logger.info(f"Generation cache hit for {key[:12]}: '{path}'")
+        return path
+
+    def put(self, key: str, write: Callable[[pathlib.Path], None]) -> pathlib.Path:
+        """Store an entry produced by `write`, then enforce the size quota.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from `key`.
+        write : Callable[[Path], None]
+            Writes the entry content to the given (temporary) path, e.g.
+            `generated_video.video.save`.
+
+        Returns
+        -------
+        Path
+            Path of the stored entry.
+        """
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        with self._lock:
+            self.stats.stores += 1
+            self._evict()
+        logger.info(f"Stored generation cache entry {key[:12]}")
+        return path
+
+    def size_bytes(self) -> int:
+        """Total size of all entries currently in the cache."""
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob("??/*") if p.is_file() and not p.name.startswith(".")]
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total <= self.max_size_bytes:
+            return
+
+        entries.sort(key=lambda e: e[0])
+        for _, size, p in entries:
+            if total <= self.max_size_bytes:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.stats.evictions += 1
+            self.stats.evicted_bytes += size
+            logger.info(f"Evicted generation cache entry '{p.name[:12]}' ({size} bytes)")
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+IMAGE: str = "image"  # Imagen call
+VIDEO: str = "video"  # Veo call
+FRAME: str = "frame"  # local last-frame extraction
+CONCAT: str = "concat"  # local assembly of the final video
+
+REMOTE_KINDS = frozenset({IMAGE, VIDEO})
+
+# Rough wall-time estimates in seconds, used for critical-path reporting
+DEFAULT_ESTIMATES: Dict[str, float] = {IMAGE: 10.0, VIDEO: 90.0, FRAME: 0.5, CONCAT: 10.0}
+
+
+@dataclass(frozen=True)
+class PlanNode:
+    """
+    One operation in a `GenerationPlan`.
+
+    Attributes
+    ----------
+    id : str
+        Content-derived identifier; identical operations share it.
+    kind : str
+        One of `IMAGE`, `VIDEO`, `FRAME` or `CONCAT`.
+    deps : Tuple[str, ...]
+        Ids of the nodes whose results this node consumes, in order. May
+        repeat, e.g. a concat that plays the same segment several times.
+    prompt : str, optional
+        Prompt of a remote call.
+    key : Hashable, optional
+        Caller-defined identity, such as a timeline source.
+    """
+    id: str
+    kind: str
+    deps: Tuple[str, ...] = ()
+    prompt: Optional[str] = None
+    key: Hashable = None
+
+    @property
+    def remote(self) -> bool:
+        return self.kind in REMOTE_KINDS
+
+
+class GenerationPlan:
+    """
+    A video generation compiled into a DAG of operations.
+
+    Nodes are added in dependency order. Adding a node identical to an
+    existing one (same kind, prompt and inputs) returns the existing node's
+    id, so repeated segments collapse into one call before any quota is
+    spent. `summary` reports the unique calls and the critical path, i.e.
+    the chain of dependent operations that bounds wall time no matter how
+    much runs in parallel.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.nodes: Dict[str, PlanNode] = {}
+        self.output: Optional[str] = None
+        self.requested = 0
+
+    def add(
+        self,
+        kind: str,
+        *,
+        deps: Sequence[str] = (),
+        prompt: Optional[str] = None,
+        key: Hashable = None,
+    ) -> str:
+        """Add an operation, or find the identical one already planned, and return its id."""
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Unknown dependencies: {', '.join(missing)}")
+        self.requested += 1
+        digest = hashlib.sha256(json.dumps([kind, prompt, list(deps)]).encode("utf-8")).hexdigest()[:16]
+        node_id = f"{kind}:{digest}"
+        if node_id not in self.nodes:
+            self.nodes[node_id] = PlanNode(node_id, kind, tuple(deps), prompt, key)
+        if kind == CONCAT:
+            self.output = node_id
+        return node_id
+
+    def unique_calls(self) -> Dict[str, int]:
+        """Number of distinct remote calls per kind."""
+        counts: Dict[str, int] = {}
+        for node in self.nodes.values():
+            if node.remote:
+                counts[node.kind] = counts.get(node.kind, 0) + 1
+        return counts
+
+    def critical_path(self, estimates: Optional[Mapping[str, float]] = None) -> Tuple[List[PlanNode], float]:
+        """Return the longest dependency chain by estimated duration, and that duration."""
+        estimates = {**DEFAULT_ESTIMATES, **(estimates or {})}
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for node in self.nodes.values():  # insertion order is topological
+            before = max(set(node.deps), key=lambda dep: finish[dep], default=None)
+            via[node.id] = before
+            finish[node.id] = (finish[before] if before else 0.0) + estimates.get(node.kind, 0.0)
+        if not finish:
+            return [], 0.0
+        node_id: Optional[str] = max(finish, key=finish.__getitem__)
+        total = finish[node_id]
+        path = []
+        while node_id is not None:
+            path.append(self.nodes[node_id])
+            node_id = via[node_id]
+        return path[::-1], total
+
+    def summary(self, estimates: Optional[Mapping[str, float]] = None) -> str:
+        """Human-readable dry-run report."""
+        calls = self.unique_calls()
+        path, seconds = self.critical_path(estimates)
+        remote_on_path = sum(node.remote for node in path)
+        lines = [
+            f"Plan for '{self.name}': {len(self.nodes)} unique operation(s) "
+            f"({self.requested - len(self.nodes)} deduplicated)",
+            "Remote calls: " + (", ".join(f"{count} {kind}" for kind, count in sorted(calls.items())) or "none"),
+            f"Critical path: {len(path)} operation(s), {remote_on_path} remote, ~{seconds:.0f}s "
+            f"({' -> '.join(node.kind for node in path)})",
+        ]
+        return "\n".join(lines)
+
+
+NodeHandler = Callable[[PlanNode, List[Any]], Awaitable[Any]]
+
+
+class PlanExecutor:
+    """
+    Runs a `GenerationPlan` with maximal parallelism.
+
+    Every node becomes a task that starts as soon as all of its
+    dependencies have finished; nothing else orders them. Handlers are
+    looked up by node kind and receive the node plus its dependencies'
+    results in `deps` order. Limits such as concurrent operations or quota
+    are the handlers' business (e.g. `operation_slots`), so the executor
+    never holds back work that is ready. The first failure cancels all
+    remaining nodes and is raised.
+    """
+
+    def __init__(self, handlers: Mapping[str, NodeHandler]) -> None:
+        self.handlers = dict(handlers)
+
+    async def run(self, plan: GenerationPlan, completed: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute `plan` and return the result of every node by id.
+
+        Parameters
+        ----------
+        plan : GenerationPlan
+            The plan to run.
+        completed : Mapping[str, Any], optional
+            Results of nodes that are already done (e.g. restored on resume);
+            they are not run again.
+        """
+        completed = completed or {}
+        missing = {node.kind for node in plan.nodes.values() if node.id not in completed} - set(self.handlers)
+        if missing:
+            raise ValueError(f"No handler for node kind(s): {', '.join(sorted(missing))}")
+
+        loop = asyncio.get_running_loop()
+        futures: Dict[str, asyncio.Future] = {}
+
+        async def run_node(node: PlanNode) -> Any:
+            inputs = [await futures[dep] for dep in node.deps]
+            with span(f"plan.{node.kind}", node=node.id, key=node.key):
+                return await self.handlers[node.kind](node, inputs)
+
+        for node in plan.nodes.values():
+            if node.id in completed:
+                futures[node.id] = loop.create_future()
+                futures[node.id].set_result(completed[node.id])
+            else:
+                futures[node.id] = asyncio.ensure_future(run_node(node))
+
+        try:
+            await asyncio.gather(*futures.values())
+        finally:
+            for future in futures.values():
+                future.cancel()
+        return {node_id: future.result() for node_id, future in futures.items()}
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between polls before any operation of a model has completed
+COLD_START_MAX_INTERVAL_SECONDS = 10.0
+
+
+@dataclass
+class _PendingOperation:
+    operation: Any
+    future: asyncio.Future
+    submitted_at: float
+    next_poll_at: float
+    callback: Optional[Callable[[Any], None]] = None
+    polls: int = 0
+    overdue_polls: int = 0
+
+
+@dataclass
+class _CompletionEstimate:
+    """Exponentially weighted estimate of operation duration and its spread."""
+
+    smoothing: float
+    mean: Optional[float] = None
+    deviation: float = 0.0
+    samples: int = field(default=0)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def observe(self, duration: float) -> None:
+        with self._lock:
+            self.samples += 1
+            if self.mean is None:
+                self.mean = duration
+                self.deviation = duration * 0.25
+                return
+            error = duration - self.mean
+            self.mean += self.smoothing * error
+            self.deviation += self.smoothing * (abs(error) - self.deviation)
+
+    def snapshot(self) -> Tuple[Optional[float], float]:
+        """Return a consistent (mean, deviation) pair."""
+        with self._lock:
+            return self.mean, self.deviation
+
+
+# Completion estimates shared by every poller of the same model in this process
+_shared_estimates: Dict[str, _CompletionEstimate] = {}
+_shared_estimates_lock = threading.Lock()
+
+
+def _shared_estimate(model: str, smoothing: float) -> _CompletionEstimate:
+    with _shared_estimates_lock:
+        estimate = _shared_estimates.get(model)
+        if estimate is None:
+            estimate = _shared_estimates[model] = _CompletionEstimate(smoothing=smoothing)
+        return estimate
+
+
+class OperationPoller:
+    """
+    Polls many long-running GenAI operations (Veo, Imagen) from one asyncio loop.
+
+    Operations are registered with `track` (or awaited directly with `wait`);
+    a single background task refreshes every pending operation when it is due
+    and resolves the matching future once the operation reports `done`.
+
+    Poll scheduling adapts to observed completion times:
+
+    - Before any operation has finished, polls back off geometrically from
+      `min_interval_seconds` up to `COLD_START_MAX_INTERVAL_SECONDS` (or
+      `max_interval_seconds`, if lower).
+    - Once completion times are known, an operation sleeps until shortly before
+      its expected completion, is polled every `min_interval_seconds` while it
+      is inside the expected completion window, and then backs off again if it
+      runs long.
+
+    With the default 1 s minimum interval, an operation that finishes inside its
+    expected window is picked up within about a second.
+
+    Pollers created with a `model` share one completion estimate per model
+    across the process, so a new poller (every `generate` call creates one)
+    starts from what earlier runs observed instead of from a cold start.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        min_interval_seconds: float = 1.0,
+        max_interval_seconds: float = 30.0,
+        backoff_factor: float = 1.5,
+        smoothing: float = 0.3,
+        model: Optional[str] = None,
+    ) -> None:
+        """
+        Create a poller.
+
+        Parameters
+        ----------
+        client : google.genai.Client
+            Client used to refresh operations. Its async surface (`client.aio`)
+            is used when available; otherwise `client.operations.get` runs in a
+            worker thread.
+        min_interval_seconds : float, optional
+            Shortest delay between two polls of the same operation.
+        max_interval_seconds : float, optional
+            Longest delay between two polls of the same operation.
+        backoff_factor : float, optional
+            Growth factor for the delay while completion time is unknown or overdue.
+        smoothing : float, optional
+            Weight of the newest observation in the completion time estimate.
+            A shared estimate keeps the smoothing of the poller that created it.
+        model : str, optional
+            Model the tracked operations belong to, e.g. "veo-3.0-generate-preview".
+            Pollers with the same model share their completion estimate; without
+            one the estimate is private to this poller.
+        """
+        if min_interval_seconds <= 0 or max_interval_seconds < min_interval_seconds:
+            raise ValueError("Poll intervals must satisfy 0 < min_interval_seconds <= max_interval_seconds")
+        self.client = client
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.backoff_factor = backoff_factor
+        self.model = model
+        self._estimate = (
+            _shared_estimate(model, smoothing) if model is not None else _CompletionEstimate(smoothing=smoothing)
+        )
+        self._pending: Dict[int, _PendingOperation] = {}
+        self._next_id: int = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        """Number of operations that have not completed yet."""
+        return len(self._pending)
+
+    @property
+    def expected_duration(self) -> Optional[float]:
+        """Current estimate of an operation's duration in seconds, if any have completed."""
+        return self._estimate.mean
+
+    def track(self, operation: Any, callback: Optional[Callable[[Any], None]] = None) -> asyncio.Future:
+        """Register an operation and return a future resolving to the completed operation.
+
+        Must be called from within a running event loop.
+
+        Parameters
+        ----------
+        operation : google.genai.types.GenerateVideosOperation | Any
+            Operation returned by a `generate_*` call.
+        callback : Callable[[operation], None], optional
+            Invoked with the completed operation before the future resolves.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        now = time.monotonic()
+        pending = _PendingOperation(
+            operation=operation,
+            future=future,
+            submitted_at=now,
+            next_poll_at=now if getattr(operation, "done", False) else now + self._next_delay(0.0, 0, 0),
+            callback=callback,
+        )
+        self._pending[self._next_id] = pending
+        self._next_id += 1
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return future
+
+    async def wait(self, operation: Any) -> Any:
+        """Wait until `operation` is done and return the completed operation.
+
+        If the caller is cancelled, the operation is no longer polled.
+        """
+        future = self.track(operation)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._discard(future)
+            raise
+
+    def _discard(self, future: asyncio.Future) -> None:
+        for key, pending in list(self._pending.items()):
+            if pending.future is future:
+                del self._pending[key]
+
+    async def aclose(self) -> None:
+        """Stop polling and cancel the futures of any operations still pending."""
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.cancel()
+        self._pending.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _next_delay(self, elapsed: float, polls: int, overdue_polls: int) -> float:
+        expected, deviation = self._estimate.snapshot()
+        if expected is None:
+            delay = self.min_interval_seconds * (self.backoff_factor ** polls)
+            ceiling = max(self.min_interval_seconds, min(self.max_interval_seconds, COLD_START_MAX_INTERVAL_SECONDS))
+            return min(ceiling, max(self.min_interval_seconds, delay))
+        window_start = expected - 2 * deviation
+        window_end = expected + 2 * deviation
+        if elapsed < window_start:
+            delay = window_start - elapsed
+        elif elapsed <= window_end:
+            delay = self.min_interval_seconds
+        else:
+            delay = self.min_interval_seconds * (self.backoff_factor ** (overdue_polls + 1))
+        return min(self.max_interval_seconds, max(self.min_interval_seconds, delay))
+
+    async def _refresh(self, operation: Any) -> Any:
+        aio = getattr(self.client, "aio", None)
+        if aio is not None and hasattr(aio, "operations"):
+            return await aio.operations.get(operation)
+        return await asyncio.to_thread(self.client.operations.get, operation)
+
+    async def _poll(self, key: int, pending: _PendingOperation) -> None:
+        try:
+            if not getattr(pending.operation, "done", False):
+                pending.operation = await self._refresh(pending.operation)
+                pending.polls += 1
+        except Exception as e:
+            self._pending.pop(key, None)
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        elapsed = now - pending.submitted_at
+        operation = pending.operation
+        if not getattr(operation, "done", False):
+            expected, deviation = self._estimate.snapshot()
+            if expected is not None and elapsed > expected + 2 * deviation:
+                pending.overdue_polls += 1
+            pending.next_poll_at = now + self._next_delay(elapsed, pending.polls, pending.overdue_polls)
+            return
+
+        self._pending.pop(key, None)
+        if pending.polls:
+            # Operations that were already done on submission say nothing about latency
+            self._estimate.observe(elapsed)
+        logger.info(
+            f"Operation {getattr(operation, 'name', key)} completed after {elapsed:.1f}s ({pending.polls} poll(s))"
+        )
+
+        error = getattr(operation, "error", None)
+        if error:
+            if not pending.future.done():
+                pending.future.set_exception(
+                    RuntimeError(f"Operation {getattr(operation, 'name', key)} failed: {error}")
+                )
+            return
+        if pending.callback is not None:
+            try:
+                pending.callback(operation)
+            except Exception as e:
+                logger.warning(f"Completion callback for operation {getattr(operation, 'name', key)} failed: {e}")
+        if not pending.future.done():
+            pending.future.set_result(operation)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while self._pending:
+            now = time.monotonic()
+            due = [(key, p) for key, p in self._pending.items() if p.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(key, p) for key, p in due))
+                continue
+
+            next_poll_at = min(p.next_poll_at for p in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_poll_at - now))
+            except asyncio.TimeoutError:
+                pass
+
+
+def wait_for_operation(client: Any, operation: Any, **poller_options: Any) -> Any:
+    """Block until `operation` is done, polling it with an `OperationPoller`.
+
+    Convenience wrapper for synchronous scripts; async code should share one
+    `OperationPoller` and await `OperationPoller.wait` instead.
+    """
+
+    async def _wait() -> Any:
+        poller = OperationPoller(client, **poller_options)
+        try:
+            return await poller.wait(operation)
+        finally:
+            await poller.aclose()
+
+    return asyncio.run(_wait())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pathlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+from .ffmpeg_tools import concat_stream_copy, video_geometry
+from .tracing import traced
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+
+def canvas_for(paths: Sequence[PathLike]) -> Tuple[int, int, float]:
+    """Return the (width, height, fps) canvas that fits every segment in `paths`."""
+    width, height, fps = 0, 0, 0.0
+    for path in dict.fromkeys(str(p) for p in paths):
+        clip_width, clip_height, clip_fps = video_geometry(path)
+        width, height, fps = max(width, clip_width), max(height, clip_height), max(fps, clip_fps)
+    return width, height, fps
+
+
+def _fit_to_canvas(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    frame_height, frame_width = frame.shape[:2]
+    if (frame_width, frame_height) == (width, height):
+        return frame
+    import numpy as np
+
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+    top, left = (height - frame_height) // 2, (width - frame_width) // 2
+    canvas[top:top + frame_height, left:left + frame_width] = frame[..., :3]
+    return canvas
+
+
+def encode_segments(
+    paths: Sequence[PathLike],
+    dest_path: PathLike,
+    canvas: Tuple[int, int, float],
+    threads: Optional[int] = None,
+) -> str:
+    """Decode `paths` one at a time and encode them into a single H.264 file.
+
+    Segments smaller than the canvas are centered on black, as MoviePy's
+    "compose" concatenation does. Only one reader is open at any time, so
+    memory use does not depend on the number of segments.
+
+    Parameters
+    ----------
+    paths : Sequence[Path-like]
+        Segment files, in playback order.
+    dest_path : Path-like
+        Output file.
+    canvas : Tuple[int, int, float]
+        Output (width, height, fps), e.g. from `canvas_for`.
+    threads : int, optional
+        Encoder thread count; ffmpeg's default when None.
+    """
+    from moviepy import VideoFileClip
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+    width, height, fps = canvas
+    with FFMPEG_VideoWriter(str(dest_path), (width, height), fps, codec="libx264", threads=threads) as writer:
+        for path in paths:
+            with VideoFileClip(str(path), audio=False) as clip:
+                for frame in clip.iter_frames(fps=fps, dtype="uint8"):
+                    writer.write_frame(_fit_to_canvas(frame, width, height))
+    return str(dest_path)
+
+
+class ParallelEncoder:
+    """
+    Re-encodes a list of segments in fixed-size chunks, optionally on a process pool.
+
+    The segment list is split into contiguous chunks of `segments_per_chunk`
+    segments. Each chunk is encoded with `encode_segments` using the same
+    canvas and encoder settings, and the chunks are then joined with the
+    concat demuxer without re-encoding. Chunk boundaries and encoder settings
+    do not depend on `workers`: one worker encodes the same chunks in
+    sequence, more workers encode them concurrently, and the output frames
+    are identical either way.
+    """
+
+    def __init__(self, workers: Optional[int] = None, *, segments_per_chunk: int = 4) -> None:
+        """
+        Create an encoder.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes. Defaults to the number of CPU cores.
+        segments_per_chunk : int, optional
+            Segments encoded together as one chunk. Each chunk starts its own
+            GOP and rate control, so this, not `workers`, decides the output.
+        """
+        if segments_per_chunk < 1:
+            raise ValueError("segments_per_chunk must be at least 1")
+        self.workers: int = max(1, workers or os.cpu_count() or 1)
+        self.segments_per_chunk: int = segments_per_chunk
+
+    def _chunks(self, paths: Sequence[PathLike]) -> List[List[PathLike]]:
+        size = self.segments_per_chunk
+        return [list(paths[start:start + size]) for start in range(0, len(paths), size)]
+
+    @traced("encode")
+    def encode(self, paths: Sequence[PathLike], dest_path: PathLike) -> str:
+        """Encode `paths` into `dest_path` and return the written path."""
+        if not paths:
+            raise ValueError("No segments to encode.")
+        canvas = canvas_for(paths)
+        chunks = self._chunks(paths)
+        if len(chunks) == 1:
+            return encode_segments(paths, dest_path, canvas)
+
+        workers = min(self.workers, len(chunks))
+        logger.info(f"Encoding {len(paths)} segment(s) in {len(chunks)} chunk(s) on {workers} worker(s)")
+        with tempfile.TemporaryDirectory(prefix="encode_", dir=pathlib.Path(dest_path).parent) as tmp_dir:
+            chunk_paths = [pathlib.Path(tmp_dir) / f"chunk_{i:03d}.mp4" for i in range(len(chunks))]
+            if workers == 1:
+                for i, (chunk, chunk_path) in enumerate(zip(chunks, chunk_paths), 1):
+                    encode_segments(chunk, chunk_path, canvas)
+                    logger.info(f"Encoded chunk {i}/{len(chunks)}")
+            else:
+                # Spawn rather than fork: `save` may run on a worker thread of a threaded process
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    futures = [
+                        pool.submit(encode_segments, [str(p) for p in chunk], str(chunk_path), canvas)
+                        for chunk, chunk_path in zip(chunks, chunk_paths)
+                    ]
+                    for i, future in enumerate(futures, 1):
+                        future.result()
+                        logger.info(f"Encoded chunk {i}/{len(chunks)}")
+            concat_stream_copy(chunk_paths, dest_path)
+        return str(dest_path)
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: quota exhaustion and transient backend errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Status codes that guarantee a submission was rejected before any operation was created
+SUBMIT_RETRYABLE_STATUS_CODES = frozenset({429})
+
+
+def _never_sent(error: BaseException) -> bool:
+    """Return True if `error` means the connection failed before a request went out."""
+    if isinstance(error, ConnectionRefusedError):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def is_retryable(error: BaseException, submit: bool = False) -> bool:
+    """Return True if the call that raised `error` can safely be sent again.
+
+    Polls are idempotent, so quota and transient server errors are retried.
+    A submission that failed with a 5xx may still have created its
+    operation, so submissions are only retried on quota errors and on
+    connection errors that prove the request was never sent.
+    """
+    from google.genai import errors
+
+    if isinstance(error, errors.APIError):
+        return error.code in (SUBMIT_RETRYABLE_STATUS_CODES if submit else RETRYABLE_STATUS_CODES)
+    return submit and _never_sent(error)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate_per_minute` up to `capacity`; each
+    request takes one token and blocks until one is available. With a
+    capacity of 1 requests are evenly spaced, larger capacities allow short
+    bursts while keeping the per-minute average.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, possibly going into debt; return how long to wait until it is covered."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Awaitable variant of `acquire`."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Pauses submissions while the backend is saturated.
+
+    After `failure_threshold` consecutive retryable failures the breaker
+    opens and callers wait for `reset_timeout_seconds`. It then lets a single
+    probe request through (half-open); a success closes the breaker, a
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout_seconds: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def _admit(self) -> float:
+        """Admit a request, or return how long to wait before asking again."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            remaining = self._opened_at + self.reset_timeout_seconds - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if self._probing:
+                return min(1.0, self.reset_timeout_seconds)
+            self._probing = True
+            return 0.0
+
+    def wait(self) -> None:
+        """Block until a request may be sent."""
+        while (delay := self._admit()) > 0:
+            time.sleep(delay)
+
+    async def await_closed(self) -> None:
+        """Awaitable variant of `wait`."""
+        while (delay := self._admit()) > 0:
+            await asyncio.sleep(delay)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit breaker closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    f"Circuit breaker open after {self._failures} failure(s); "
+                    f"pausing submissions for {self.reset_timeout_seconds:.0f}s"
+                )
+
+    def record_other(self) -> None:
+        """Record a completed request whose error says nothing about backend load."""
+        with self._lock:
+            self._probing = False
+
+
+class RateLimiter:
+    """
+    Keeps genai calls under quota and rides out transient errors.
+
+    Shared by every client it wraps, so several generators (or a
+    `BatchScheduler`) draw from one budget:
+
+    - Operation submissions (`generate_videos`, `generate_images`) take a
+      token from the `TokenBucket` of their `model`, so Imagen and Veo
+      calls draw on separate per-minute quotas
+    - Quota (429) errors are retried with exponential backoff and full
+      jitter; polls are also retried on transient server errors, while
+      submissions are not, since the operation may already exist
+    - A `CircuitBreaker` pauses all submissions once errors keep coming,
+      instead of every caller hammering a saturated backend
+
+    Operation polls are retried but do not consume tokens.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Union[float, Mapping[str, float], None] = None,
+        *,
+        burst: Optional[float] = None,
+        max_retries: int = 6,
+        base_delay_seconds: float = 2.0,
+        max_delay_seconds: float = 60.0,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 60.0,
+    ) -> None:
+        """
+        Create a rate limiter.
+
+        Parameters
+        ----------
+        requests_per_minute : float | Mapping[str, float], optional
+            Submission quota per model, shared by all wrapped clients: one
+            rate for every model, or a rate per model name (models missing
+            from the mapping are unlimited). Unlimited when None.
+        burst : float, optional
+            Token bucket capacity; defaults to ten seconds' worth of quota.
+        max_retries : int, optional
+            Retries per call before a retryable error is raised.
+        base_delay_seconds : float, optional
+            Backoff ceiling of the first retry; doubles with each retry.
+        max_delay_seconds : float, optional
+            Largest backoff ceiling.
+        failure_threshold : int, optional
+            Consecutive retryable failures that open the circuit breaker.
+        reset_timeout_seconds : float, optional
+            How long the open breaker pauses submissions.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self._buckets: Dict[Optional[str], Optional[TokenBucket]] = {}
+        self._buckets_lock = threading.Lock()
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout_seconds)
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+    def wrap(self, client: Any) -> RateLimitedClient:
+        """Return `client` with its calls routed through this limiter."""
+        if isinstance(client, RateLimitedClient):
+            return client
+        return RateLimitedClient(client, self)
+
+    def bucket(self, model: Optional[str]) -> Optional[TokenBucket]:
+        """Return the token bucket of `model`, or None if its submissions are unlimited."""
+        with self._buckets_lock:
+            if model not in self._buckets:
+                if isinstance(self.requests_per_minute, Mapping):
+                    rate = self.requests_per_minute.get(model) if model is not None else None
+                else:
+                    rate = self.requests_per_minute
+                self._buckets[model] = TokenBucket(rate, self.burst) if rate else None
+            return self._buckets[model]
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, capped exponential]
+        return random.uniform(0.0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+    def _retry_delay(self, error: Exception, attempt: int, name: str, submit: bool) -> float:
+        """Return the backoff before retrying after `error`, or re-raise it."""
+        if not is_retryable(error, submit):
+            if submit:
+                self.breaker.record_other()
+            raise error
+        # Only submissions count towards the breaker; polls are retried quietly
+        if submit:
+            self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            raise error
+        delay = self._backoff(attempt)
+        reason = getattr(error, "code", None) or type(error).__name__
+        logger.warning(f"{name} failed with {reason}; retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def call(self, fn: Callable[..., T], *args: Any, submit: bool = True, **kwargs: Any) -> T:
+        """Call `fn` with retries; `submit` calls also take a token and respect the breaker.
+
+        The token comes from the bucket of the `model` keyword argument.
+        """
+        bucket = self.bucket(kwargs.get("model")) if submit else None
+        attempt = 0
+        while True:
+            if submit:
+                self.breaker.wait()
+                if bucket is not None:
+                    bucket.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt, getattr(fn, "__name__", "call"), submit))
+                attempt += 1
+                continue
+            if submit:
+                self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, submit: bool = True, **kwargs: Any) -> T:
+        """Awaitable variant of `call` for coroutine functions."""
+        bucket = self.bucket(kwargs.get("model")) if submit else None
+        attempt = 0
+        while True:
+            if submit:
+                await self.breaker.await_closed()
+                if bucket is not None:
+                    await bucket.aacquire()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, getattr(fn, "__name__", "call"), submit))
+                attempt += 1
+                continue
+            if submit:
+                self.breaker.record_success()
+            return result
+
+
+class _LimitedModels:
+    def __init__(self, models: Any, limiter: RateLimiter) -> None:
+        self._models = models
+        self._limiter = limiter
+
+    def generate_videos(self, **kwargs: Any) -> Any:
+        return self._limiter.call(self._models.generate_videos, **kwargs)
+
+    def generate_images(self, **kwargs: Any) -> Any:
+        return self._limiter.call(self._models.generate_images, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._models, name)
+
+
+class _LimitedOperations:
+    def __init__(self, operations: Any, limiter: RateLimiter, asynchronous: bool = False) -> None:
+        self._operations = operations
+        self._limiter = limiter
+        self._asynchronous = asynchronous
+
+    def get(self, operation: Any, **kwargs: Any) -> Any:
+        if self._asynchronous:
+            return self._limiter.acall(self._operations.get, operation, submit=False, **kwargs)
+        return self._limiter.call(self._operations.get, operation, submit=False, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._operations, name)
+
+
+class _LimitedAsyncClient:
+    def __init__(self, aio: Any, limiter: RateLimiter) -> None:
+        self._aio = aio
+        self._limiter = limiter
+        self.operations = _LimitedOperations(aio.operations, limiter, asynchronous=True)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._aio, name)
+
+
+class RateLimitedClient:
+    """
+    A genai client whose submissions and polls go through a `RateLimiter`.
+
+    Exposes the subset of the client surface the generators use:
+    `models.generate_videos`, `models.generate_images`, `operations.get`
+    and `aio.operations.get`. Everything else is passed through unchanged.
+    """
+
+    def __init__(self, client: Any, limiter: RateLimiter) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.models = _LimitedModels(client.models, limiter)
+        self.operations = _LimitedOperations(client.operations, limiter)
+        aio = getattr(client, "aio", None)
+        self.aio = _LimitedAsyncClient(aio, limiter) if aio is not None and hasattr(aio, "operations") else None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .ffmpeg_tools import can_stream_copy, run_ffmpeg, write_concat_list
+from .parallel_encoder import canvas_for
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    Encoder settings for a re-encoded rendition of the final video.
+
+    Attributes
+    ----------
+    name : str
+        Rendition name; the output is written as `<video_name>_<name>.mp4`.
+    height : int, optional
+        Output height in pixels; the width follows the aspect ratio. None
+        keeps the segments' resolution.
+    crf : int
+        x264 constant rate factor; higher is smaller and lower quality.
+    preset : str
+        x264 preset, e.g. "ultrafast" for previews or "medium".
+    max_bitrate : str, optional
+        Bitrate cap such as "800k", enforced with a matching VBV buffer.
+    keyframes_only : bool
+        Decode only keyframes and hold each one until the next. Much faster
+        to decode, at the cost of motion; timing and cuts stay accurate.
+    """
+    name: str
+    height: Optional[int] = None
+    crf: int = 23
+    preset: str = "medium"
+    max_bitrate: Optional[str] = None
+    keyframes_only: bool = False
+
+    def size_for(self, width: int, height: int) -> Tuple[int, int]:
+        """Return the (even) output size for a `width` x `height` canvas."""
+        if self.height is None or self.height >= height:
+            return width - width % 2, height - height % 2
+        scaled_width = round(width * self.height / height / 2) * 2
+        return scaled_width, self.height - self.height % 2
+
+    def scale_filter(self, canvas: Tuple[int, int, float]) -> str:
+        """Video filter that fits frames of any segment onto this profile's output size."""
+        width, height = self.size_for(canvas[0], canvas[1])
+        return (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        )
+
+    def encoder_args(self) -> List[str]:
+        """x264 arguments for this profile."""
+        args = ["-c:v", "libx264", "-preset", self.preset, "-crf", str(self.crf), "-pix_fmt", "yuv420p"]
+        if self.max_bitrate:
+            args += ["-maxrate", self.max_bitrate, "-bufsize", self.max_bitrate]
+        return args
+
+
+# Quick-review preview: 360p, capped at 800 kb/s, encoded as fast as x264 goes
+PROXY = RenderProfile("proxy", height=360, crf=32, preset="ultrafast", max_bitrate="800k")
+
+# Publishing ladder: YouTube, lobby screens, mobile
+LADDER: Tuple[RenderProfile, ...] = (
+    RenderProfile("1080p", height=1080, crf=20, max_bitrate="8M"),
+    RenderProfile("720p", height=720, crf=22, max_bitrate="4M"),
+    RenderProfile("480p", height=480, crf=24, preset="fast", max_bitrate="1500k"),
+)
+
+
+@traced("render.profiles")
+def render_profiles(
+    paths: Sequence[PathLike], outputs: Sequence[Tuple[RenderProfile, PathLike]]
+) -> List[str]:
+    """Re-encode `paths`, in order, into every (profile, output path) rendition.
+
+    All renditions come from one decode: the segments are read once through
+    the concat demuxer, brought to a constant frame rate, and the frames are
+    split inside a single ffmpeg filter graph to one scaler and one x264
+    encoder per rendition. The encoders run concurrently, each with an even
+    share of the CPU threads, so the cost is one decode plus the encodes in
+    parallel rather than a full decode per rendition. Like the other assembly
+    paths, only the video stream is written.
+
+    The concat demuxer needs segments that share codec, size, frame rate and
+    timebase (`can_stream_copy`). Otherwise every distinct segment file is
+    first fitted onto a common canvas, as in `ParallelEncoder`, and written
+    once as a lossless intermediate next to the outputs; the shared decode
+    then reads those. Intermediates are made per file, not per position, so
+    repeated segments cost nothing extra and only one decoder is open at a
+    time however long the video.
+
+    Returns
+    -------
+    List[str]
+        Written paths, in `outputs` order.
+    """
+    if not paths:
+        raise ValueError("No segments to render.")
+    if not outputs:
+        raise ValueError("No renditions requested.")
+    if len({profile.keyframes_only for profile, _ in outputs}) > 1:
+        # Keyframe-only decoding is a property of the shared decode
+        raise ValueError("Renditions rendered together must agree on keyframes_only.")
+
+    keyframes_only = outputs[0][0].keyframes_only
+    canvas = canvas_for(paths)
+    count = len(outputs)
+    graph = f"[0:v:0]fps={canvas[2]:g},split={count}" + "".join(f"[s{i}]" for i in range(count))
+    for i, (profile, _) in enumerate(outputs):
+        graph += f";[s{i}]{profile.scale_filter(canvas)}[v{i}]"
+    threads = ["-threads", str(max(1, (os.cpu_count() or 1) // count))] if count > 1 else []
+
+    logger.info(
+        f"Rendering {len(paths)} segment(s) to {count} rendition(s): "
+        + ", ".join(profile.name for profile, _ in outputs)
+    )
+    encodes: List[str] = []
+    for i, (profile, output_path) in enumerate(outputs):
+        encodes += [
+            "-map", f"[v{i}]", "-an", *profile.encoder_args(), *threads, "-movflags", "+faststart", str(output_path)
+        ]
+    with tempfile.TemporaryDirectory(prefix="render_", dir=pathlib.Path(outputs[0][1]).parent) as tmp_dir:
+        if not can_stream_copy(paths):
+            sources = list(dict.fromkeys(str(p) for p in paths))
+            logger.info(f"Segments differ in format, normalizing {len(sources)} distinct file(s) first")
+            normalized = {
+                source: _normalize(source, pathlib.Path(tmp_dir) / f"normalized_{i:04d}.mp4", canvas, keyframes_only)
+                for i, source in enumerate(sources)
+            }
+            paths = [normalized[str(p)] for p in paths]
+            # Keyframe-only decoding already happened while normalizing
+            keyframes_only = False
+        list_path = pathlib.Path(tmp_dir) / "segments.txt"
+        write_concat_list(paths, list_path)
+        run_ffmpeg(
+            [
+                *(["-skip_frame", "nokey"] if keyframes_only else []),
+                "-f", "concat", "-safe", "0", "-i", str(list_path),
+                "-filter_complex", graph,
+                *encodes,
+            ]
+        )
+    return [str(output_path) for _, output_path in outputs]
+
+
+def _normalize(
+    source: PathLike, dest: pathlib.Path, canvas: Tuple[int, int, float], keyframes_only: bool
+) -> pathlib.Path:
+    """Losslessly re-encode `source` onto `canvas` so it can be joined with the concat demuxer."""
+    width, height = canvas[0] - canvas[0] % 2, canvas[1] - canvas[1] % 2
+    run_ffmpeg(
+        [
+            *(["-skip_frame", "nokey"] if keyframes_only else []),
+            "-i", str(source),
+            "-map", "0:v:0", "-an",
+            "-vf", (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={canvas[2]:g}"
+            ),
+            "-c:v", "libx264", "-preset", "ultrafast", "-qp", "0", "-pix_fmt", "yuv420p",
+            str(dest),
+        ]
+    )
+    return dest
+
+
+def render_profile(paths: Sequence[PathLike], output_path: PathLike, profile: RenderProfile) -> str:
+    """Re-encode `paths`, in order, into one `profile` rendition and return the written path.
+
+    Segments are scaled on the way to the encoder, so a low-resolution
+    profile never encodes full-size frames; see `render_profiles`.
+    """
+    return render_profiles(paths, [(profile, output_path)])[0]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from .ffmpeg_tools import concat_stream_copy, keyframe_times, probe_video, run_ffmpeg
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, pathlib.Path]
+
+
+def _file_identity(path: pathlib.Path) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+@dataclass(frozen=True)
+class _SegmentLayout:
+    path: pathlib.Path
+    duration: float
+    keyframes: Tuple[float, ...]
+    pix_fmt: str
+
+
+@dataclass(frozen=True)
+class _Seam:
+    tail_start: float  # keyframe in the outgoing segment where the window starts
+    head_end: float  # keyframe in the incoming segment where the window ends
+
+
+class SeamBlender:
+    """
+    Crossfades segment boundaries while stream-copying everything in between.
+
+    For every seam, only a short window is decoded and re-encoded: from the
+    last keyframe at least `blend_seconds` before the end of the outgoing
+    segment to the first keyframe at least `blend_seconds` into the incoming
+    one, with a `blend_seconds` crossfade in the middle. The keyframe-aligned
+    spans between windows are copied without re-encoding, so the cost of seam
+    smoothing grows with the number of seams, not the video length.
+
+    Pieces are exchanged as MPEG-TS, whose in-band parameter sets let
+    differently encoded H.264 pieces play back to back, and the result is
+    remuxed into MP4. Each crossfade shortens the video by `blend_seconds`.
+    """
+
+    def __init__(
+        self,
+        blend_seconds: float = 0.5,
+        *,
+        blend_identical: bool = False,
+        work_dir: Union[PathLike, None] = None,
+    ) -> None:
+        """
+        Create a seam blender.
+
+        Parameters
+        ----------
+        blend_seconds : float, optional
+            Crossfade length at each seam.
+        blend_identical : bool, optional
+            Also blend joins between two plays of the same content (e.g.
+            repeated base loops, which may be distinct hardlinked files).
+            Defaults to False, since those are seamless by design.
+        work_dir : Path-like, optional
+            Directory for intermediate pieces. Defaults to a temporary directory.
+        """
+        if blend_seconds <= 0:
+            raise ValueError("blend_seconds must be positive")
+        self.blend_seconds = blend_seconds
+        self.blend_identical = blend_identical
+        self.work_dir = pathlib.Path(work_dir) if work_dir is not None else None
+
+    def _layout(self, path: pathlib.Path) -> _SegmentLayout:
+        info = probe_video(path)
+        keyframes = keyframe_times(path)
+        if info is None or keyframes is None:
+            raise RuntimeError("Seam blending requires ffprobe to locate keyframes.")
+        return _SegmentLayout(path, info.duration, tuple(keyframes), info.pix_fmt)
+
+    def _seam(self, outgoing: _SegmentLayout, incoming: _SegmentLayout) -> _Seam:
+        tail_candidates = [k for k in outgoing.keyframes if k <= outgoing.duration - self.blend_seconds]
+        head_candidates = [k for k in incoming.keyframes if k >= self.blend_seconds]
+        return _Seam(
+            tail_start=max(tail_candidates) if tail_candidates else 0.0,
+            head_end=min(head_candidates) if head_candidates else incoming.duration,
+        )
+
+    @traced("seam_blend")
+    def render(
+        self,
+        paths: Sequence[PathLike],
+        output_path: PathLike,
+        content_ids: Optional[Sequence[Hashable]] = None,
+    ) -> str:
+        """Join `paths` into `output_path` with crossfaded seams and return the path.
+
+        Parameters
+        ----------
+        paths : Sequence[Path-like]
+            Segment files, in playback order.
+        output_path : Path-like
+            Output file.
+        content_ids : Sequence[Hashable], optional
+            Content identity of each path, e.g. the manifest checksums. Paths
+            with equal ids are probed and copied once and, unless
+            `blend_identical` is set, joined without a crossfade. Defaults to
+            each file's (device, inode), so hardlinks of one file match.
+        """
+        paths = [pathlib.Path(p) for p in paths]
+        if not paths:
+            raise ValueError("No segments to join.")
+        if content_ids is None:
+            content_ids = [_file_identity(p) for p in paths]
+        elif len(content_ids) != len(paths):
+            raise ValueError("content_ids must have one entry per path.")
+        layouts: Dict[Hashable, _SegmentLayout] = {}
+        for path, content_id in zip(paths, content_ids):
+            if content_id not in layouts:
+                layouts[content_id] = self._layout(path)
+
+        seams: List[Optional[_Seam]] = []
+        for outgoing, incoming in zip(content_ids, content_ids[1:]):
+            if outgoing == incoming and not self.blend_identical:
+                seams.append(None)
+            else:
+                seams.append(self._seam(layouts[outgoing], layouts[incoming]))
+        logger.info(
+            f"Blending {sum(s is not None for s in seams)} seam(s) across {len(paths)} segment(s) "
+            f"with {self.blend_seconds:.2f}s crossfades"
+        )
+
+        with tempfile.TemporaryDirectory(prefix="seams_") as tmp_dir:
+            work_dir = self.work_dir or pathlib.Path(tmp_dir)
+            work_dir.mkdir(parents=True, exist_ok=True)
+            copied: Dict[Tuple[Hashable, float, float], pathlib.Path] = {}
+            pieces: List[pathlib.Path] = []
+
+            for i, (path, content_id) in enumerate(zip(paths, content_ids)):
+                layout = layouts[content_id]
+                start = seams[i - 1].head_end if i > 0 and seams[i - 1] is not None else 0.0
+                seam = seams[i] if i < len(seams) else None
+                end = seam.tail_start if seam is not None else layout.duration
+                if end < start:
+                    raise ValueError(
+                        f"Segment {i + 1} ('{path.name}') is too short for {self.blend_seconds:.2f}s "
+                        f"crossfades at its keyframe interval"
+                    )
+
+                if end > start:
+                    key = (content_id, start, end)
+                    if key not in copied:
+                        copied[key] = self._copy_span(layout, start, end, work_dir / f"span_{len(copied):04d}.ts")
+                    pieces.append(copied[key])
+                if seam is not None:
+                    window_path = work_dir / f"seam_{i + 1:04d}.ts"
+                    pieces.append(self._blend_window(layout, layouts[content_ids[i + 1]], seam, window_path))
+
+            concat_stream_copy(pieces, output_path)
+
+        logger.info(f"Wrote seam-blended video to '{output_path}'")
+        return str(output_path)
+
+    @staticmethod
+    def _copy_span(layout: _SegmentLayout, start: float, end: float, dest: pathlib.Path) -> pathlib.Path:
+        """Copy the keyframe-aligned span [start, end) of a segment without re-encoding."""
+        span_args = [] if start <= 0 else ["-ss", f"{start:.6f}"]
+        span_args += [] if end >= layout.duration else ["-t", f"{end - start:.6f}"]
+        run_ffmpeg(
+            [
+                *span_args, "-i", str(layout.path),
+                "-map", "0:v:0", "-an", "-c", "copy",
+                "-bsf:v", "h264_mp4toannexb", "-avoid_negative_ts", "make_zero",
+                "-f", "mpegts", str(dest),
+            ]
+        )
+        return dest
+
+    def _blend_window(
+        self,
+        outgoing: _SegmentLayout,
+        incoming: _SegmentLayout,
+        seam: _Seam,
+        dest: pathlib.Path,
+    ) -> pathlib.Path:
+        """Re-encode the outgoing tail and incoming head with a crossfade between them."""
+        offset = max(0.0, outgoing.duration - seam.tail_start - self.blend_seconds)
+        filter_graph = (
+            "[0:v]setpts=PTS-STARTPTS,settb=AVTB[tail];"
+            f"[1:v]trim=end={seam.head_end:.6f},setpts=PTS-STARTPTS,settb=AVTB[head];"
+            f"[tail][head]xfade=transition=fade:duration={self.blend_seconds:.6f}:offset={offset:.6f},"
+            f"format={outgoing.pix_fmt or 'yuv420p'}[v]"
+        )
+        run_ffmpeg(
+            [
+                "-ss", f"{seam.tail_start:.6f}", "-i", str(outgoing.path),
+                "-i", str(incoming.path),
+                "-filter_complex", filter_graph, "-map", "[v]", "-an",
+                "-c:v", "libx264", "-crf", "18",
+                "-f", "mpegts", str(dest),
+            ]
+        )
+        return dest
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# (st_dev, st_ino, st_size, st_mtime_ns) of a file -> its SHA-256
+ChecksumCache = Dict[Tuple[int, int, int, int], str]
+
+
+def prompt_hash(prompt: str) -> str:
+    """Return the SHA-256 hex digest identifying a segment's source prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Union[str, pathlib.Path], chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class SegmentRecord:
+    """
+    Journal entry for one persisted segment.
+
+    Attributes
+    ----------
+    index : int
+        1-based position of the segment in the final video.
+    filename : str
+        Segment file name, relative to the manifest directory.
+    sha256 : str
+        Checksum of the segment file.
+    duration : float
+        Segment duration in seconds.
+    prompt_hash : str, optional
+        Hash of the prompt the segment was generated from (see `prompt_hash`).
+    """
+    index: int
+    filename: str
+    sha256: str
+    duration: float
+    prompt_hash: Optional[str] = None
+
+    def is_valid(self, output_dir: Union[str, pathlib.Path], checksums: Optional[ChecksumCache] = None) -> bool:
+        """Check that the segment file exists and still matches its checksum.
+
+        Pass the same `checksums` dict when validating many records: each
+        distinct file (hardlinks included) is then hashed once, for as long
+        as its size and modification time are unchanged.
+        """
+        path = pathlib.Path(output_dir) / self.filename
+        if not path.is_file():
+            return False
+        if checksums is None:
+            return file_sha256(path) == self.sha256
+        stat = path.stat()
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        digest = checksums.get(key)
+        if digest is None:
+            digest = checksums[key] = file_sha256(path)
+        return digest == self.sha256
+
+
+@dataclass
+class SegmentManifest:
+    """
+    Atomically updated journal of the segments written to an output directory.
+
+    The manifest is rewritten in full through a temporary file and an atomic
+    rename after every change, so a crash leaves either the previous or the
+    new version on disk, never a partial one.
+    """
+    video_name: str
+    segments: List[SegmentRecord] = field(default_factory=list)
+    version: int = MANIFEST_VERSION
+
+    @staticmethod
+    def path_for(output_dir: Union[str, pathlib.Path]) -> pathlib.Path:
+        return pathlib.Path(output_dir) / MANIFEST_FILENAME
+
+    @classmethod
+    def load(cls, output_dir: Union[str, pathlib.Path]) -> Optional["SegmentManifest"]:
+        """Load the manifest from `output_dir`, or return None if there is none."""
+        path = cls.path_for(output_dir)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version {data.get('version')} in '{path}'")
+        return cls(
+            video_name=data["video_name"],
+            segments=[SegmentRecord(**record) for record in data.get("segments", [])],
+        )
+
+    def save(self, output_dir: Union[str, pathlib.Path]) -> pathlib.Path:
+        """Atomically write the manifest to `output_dir`."""
+        path = self.path_for(output_dir)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from .ffmpeg_tools import VideoStreamInfo, probe_video
+from .loop_scorer import LoopScore, LoopScorer
+from .segment_manifest import file_sha256
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProcessedSegment:
+    """
+    A finished segment after post-processing.
+
+    Attributes
+    ----------
+    key : Hashable
+        Caller-defined identifier of the segment (e.g. a timeline source).
+    path : pathlib.Path
+        File the segment was written to.
+    sha256 : str
+        Checksum of the file.
+    info : VideoStreamInfo, optional
+        Probed stream properties; None when ffprobe is unavailable.
+    loop_score : LoopScore, optional
+        Loop quality, when the pipeline has a scorer.
+    """
+    key: Hashable
+    path: pathlib.Path
+    sha256: str
+    info: Optional[VideoStreamInfo] = None
+    loop_score: Optional[LoopScore] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.info.duration if self.info is not None else None
+
+
+class SegmentPipeline:
+    """
+    Post-processes finished segments on worker threads.
+
+    Generation coroutines are the producers: as soon as an operation
+    completes they hand its result to `process`, which saves it, optionally
+    transcodes it, checksums, probes and scores it on a thread pool. The
+    event loop keeps polling the remaining operations meanwhile, so network
+    waits and local CPU/disk work overlap instead of alternating.
+
+    `ingest` runs a second, single-threaded stage for work that must happen
+    in order (such as appending to a `VideoSegmentManager`) without blocking
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        *,
+        scorer: Optional[LoopScorer] = None,
+        transcode: Optional[Callable[[pathlib.Path], None]] = None,
+    ) -> None:
+        """
+        Create a pipeline.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of post-processing threads.
+        scorer : LoopScorer, optional
+            Scores each processed segment when given.
+        transcode : Callable[[Path], None], optional
+            In-place transform applied to each written segment before it is
+            checksummed, e.g. a re-encode to a house format.
+        """
+        self.scorer = scorer
+        self.transcode = transcode
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment-post")
+        self._ordered = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-ingest")
+
+    def _process(self, key: Hashable, write: Callable[[pathlib.Path], None], path: pathlib.Path) -> ProcessedSegment:
+        # Never write through a hardlink that may be shared with a stored segment
+        path.unlink(missing_ok=True)
+        with span("segment.write", segment=key):
+            write(path)
+        if self.transcode is not None:
+            with span("segment.transcode", segment=key):
+                self.transcode(path)
+        with span("segment.checksum", segment=key):
+            sha256 = file_sha256(path)
+        with span("segment.probe", segment=key):
+            info = probe_video(path)
+        loop_score = None
+        if self.scorer is not None:
+            with span("segment.score", segment=key):
+                loop_score = self.scorer.score(path)
+        processed = ProcessedSegment(key=key, path=path, sha256=sha256, info=info, loop_score=loop_score)
+        logger.info(f"Post-processed segment {key} at '{path}'")
+        return processed
+
+    async def process(
+        self, key: Hashable, write: Callable[[pathlib.Path], None], path: pathlib.Path
+    ) -> ProcessedSegment:
+        """Write a finished segment with `write(path)` and post-process it off the event loop."""
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context (e.g. the active tracer) into the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._workers, functools.partial(context.run, self._process, key, write, path)
+        )
+
+    def ingest(self, fn: Callable[[], object]) -> asyncio.Future:
+        """Schedule `fn` on the ordered stage; calls run one at a time in submission order."""
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(self._ordered, functools.partial(context.run, fn))
+
+    def close(self) -> None:
+        """Shut down both thread pools, waiting for queued work to finish."""
+        self._workers.shutdown(wait=True)
+        self._ordered.shutdown(wait=True)
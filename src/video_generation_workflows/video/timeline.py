@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Mapping, Optional, Union
+
+from .ffmpeg_tools import can_stream_copy, concat_stream_copy, run_ffmpeg, video_geometry
+from .render_profile import RenderProfile, render_profile
+from .tracing import traced
+from .video_configuration import VideoConfiguration
+
+logger = logging.getLogger(__name__)
+
+BASE_SOURCE: str = "base"
+
+
+@dataclass(frozen=True)
+class TimelineEntry:
+    """
+    One run of the edit list: `source` played `repeat` times back to back.
+
+    Attributes
+    ----------
+    source : Hashable
+        Key of the unique segment to play: `BASE_SOURCE` for the shared base
+        loop, or the 0-based segment index of an action segment.
+    start_index : int
+        Segment index (0-based) at which the run starts.
+    repeat : int
+        Number of consecutive segments the run covers.
+    """
+    source: Hashable
+    start_index: int
+    repeat: int = 1
+
+
+def compile_timeline(config: VideoConfiguration) -> List[TimelineEntry]:
+    """Compile a configuration into a run-length edit list.
+
+    Segments without an action all play the shared base loop, so consecutive
+    ones collapse into a single entry: base ×k, action, base ×m, ...
+
+    Parameters
+    ----------
+    config : VideoConfiguration
+        Configuration whose `length` segments are laid out.
+
+    Returns
+    -------
+    List[TimelineEntry]
+        Entries covering segment indices 0 .. length - 1 in order.
+    """
+    action_indexes = {ap.start_index for ap in config.action_prompts}
+    timeline: List[TimelineEntry] = []
+    for segment_index in range(config.length):
+        source = segment_index if segment_index in action_indexes else BASE_SOURCE
+        if timeline and timeline[-1].source == source == BASE_SOURCE:
+            last = timeline[-1]
+            timeline[-1] = TimelineEntry(last.source, last.start_index, last.repeat + 1)
+        else:
+            timeline.append(TimelineEntry(source, segment_index))
+    return timeline
+
+
+class TimelineRenderer:
+    """
+    Renders a run-length edit list from a handful of unique segment files.
+
+    The final video is written by stream-copying the unique sources as many
+    times as the timeline repeats them, so rendering a 1-hour or 10-hour loop
+    costs sequential write I/O only. Sources that are not stream-compatible
+    with each other are first normalized once each (padded to a common
+    canvas and frame rate), never per repetition.
+    """
+
+    def __init__(self, work_dir: Union[str, pathlib.Path, None] = None) -> None:
+        """
+        Create a renderer.
+
+        Parameters
+        ----------
+        work_dir : Path-like, optional
+            Directory for normalized sources. Defaults to a temporary directory
+            per render.
+        """
+        self.work_dir = pathlib.Path(work_dir) if work_dir is not None else None
+
+    @staticmethod
+    def expand(timeline: List[TimelineEntry], sources: Mapping[Hashable, pathlib.Path]) -> List[pathlib.Path]:
+        """Expand the edit list into the ordered list of source files to play."""
+        missing = {entry.source for entry in timeline} - set(sources)
+        if missing:
+            raise KeyError(f"No source file for timeline source(s): {sorted(map(str, missing))}")
+        paths: List[pathlib.Path] = []
+        for entry in timeline:
+            paths.extend([pathlib.Path(sources[entry.source])] * entry.repeat)
+        return paths
+
+    @traced("timeline.render")
+    def render(
+        self,
+        timeline: List[TimelineEntry],
+        sources: Mapping[Hashable, Union[str, pathlib.Path]],
+        output_path: Union[str, pathlib.Path],
+        profile: Optional[RenderProfile] = None,
+    ) -> str:
+        """Write the timeline to `output_path` and return the written path.
+
+        Parameters
+        ----------
+        timeline : List[TimelineEntry]
+            Edit list, e.g. from `compile_timeline`.
+        sources : Mapping[Hashable, Path-like]
+            File for every source key used by the timeline.
+        output_path : Path-like
+            Destination of the final video.
+        profile : RenderProfile, optional
+            Re-encode the expanded timeline with this profile (e.g. `PROXY`)
+            instead of stream-copying it.
+        """
+        sources = {key: pathlib.Path(path) for key, path in sources.items()}
+        output_path = pathlib.Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        total = sum(entry.repeat for entry in timeline)
+        logger.info(
+            f"Rendering {total} segment(s) from {len({e.source for e in timeline})} unique source(s) to '{output_path}'"
+        )
+
+        if profile is not None:
+            return render_profile(self.expand(timeline, sources), output_path, profile)
+
+        with tempfile.TemporaryDirectory(prefix="timeline_") as tmp_dir:
+            work_dir = self.work_dir or pathlib.Path(tmp_dir)
+            used = {key: sources[key] for key in dict.fromkeys(e.source for e in timeline) if key in sources}
+            if not can_stream_copy(list(used.values())):
+                used = self._normalize(used, work_dir)
+            concat_stream_copy(self.expand(timeline, used), output_path)
+
+        logger.info(f"Rendered timeline to '{output_path}'")
+        return str(output_path)
+
+    @staticmethod
+    def _normalize(
+        sources: Dict[Hashable, pathlib.Path], work_dir: pathlib.Path
+    ) -> Dict[Hashable, pathlib.Path]:
+        """Re-encode each unique source once onto a common canvas and frame rate."""
+        geometry = {key: video_geometry(path) for key, path in sources.items()}
+        width = max(w for w, _, _ in geometry.values())
+        height = max(h for _, h, _ in geometry.values())
+        fps = max(f for _, _, f in geometry.values())
+        logger.info(f"Normalizing {len(sources)} source(s) to {width}x{height} @ {fps:.3f} fps")
+
+        work_dir.mkdir(parents=True, exist_ok=True)
+        normalized: Dict[Hashable, pathlib.Path] = {}
+        for i, (key, path) in enumerate(sources.items(), 1):
+            dest = work_dir / f"normalized_{i:03d}.mp4"
+            run_ffmpeg(
+                [
+                    "-i", str(path), "-map", "0:v:0", "-an",
+                    # Center smaller sources on a black canvas, like the MoviePy path
+                    "-vf", f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,fps={fps}",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                    "-video_track_timescale", "90000",
+                    str(dest),
+                ]
+            )
+            normalized[key] = dest
+        return normalized
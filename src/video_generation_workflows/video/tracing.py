@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import pathlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_active_tracer: contextvars.ContextVar[Optional[Tracer]] = contextvars.ContextVar(
+    "video_generation_tracer", default=None
+)
+_current_span: contextvars.ContextVar[Optional[_Span]] = contextvars.ContextVar(
+    "video_generation_span", default=None
+)
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class SpanRecord:
+    """
+    A finished timing span.
+
+    Attributes
+    ----------
+    id : int
+        Unique span id.
+    parent : int, optional
+        Id of the enclosing span, if any.
+    name : str
+        Stage name, e.g. "veo.operation".
+    start_ns, end_ns : int
+        `time.perf_counter_ns` timestamps.
+    lane : str
+        asyncio task or thread the span ran on.
+    attrs : dict
+        Annotations such as the segment index or operation id.
+    """
+    id: int
+    parent: Optional[int]
+    name: str
+    start_ns: int
+    end_ns: int
+    lane: str
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _lane() -> str:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return task.get_name()
+    return threading.current_thread().name
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "id", "parent", "lane", "start_ns", "_token")
+
+    def __init__(self, tracer: Tracer, name: str, attrs: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> _Span:
+        parent = _current_span.get()
+        self.id = next(_span_ids)
+        self.parent = parent.id if parent is not None else None
+        self.lane = _lane()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._record(SpanRecord(self.id, self.parent, self.name, self.start_ns, end_ns, self.lane, self.attrs))
+
+    def set(self, **attrs: Any) -> None:
+        """Add annotations, e.g. an operation id that is only known mid-span."""
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs: Any) -> Union[_Span, _NullSpan]:
+    """
+    Time the enclosed block as a span of the active tracer.
+
+    Spans nest through context variables, so they follow asyncio tasks and
+    `asyncio.to_thread` calls. Without an active tracer this returns a
+    shared no-op context manager; the cost is one context variable lookup.
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Add annotations to the innermost active span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator that records each call of a synchronous function as a span."""
+
+    def decorate(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _active_tracer.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with _Span(tracer, label, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class Tracer:
+    """
+    Collects timing spans for one or more generation runs.
+
+    Activate it around a run (generators do this when given a `tracer`);
+    every `span` opened while it is active, in any task or worker thread
+    started from there, is recorded. Results can be exported as Chrome trace
+    JSON (open in chrome://tracing or https://ui.perfetto.dev) and
+    summarized per stage.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def _record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[Tracer]:
+        """Make this the active tracer for the current context."""
+        token = _active_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _active_tracer.reset(token)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the spans in Chrome trace event format."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        origin = spans[0].start_ns if spans else 0
+        lanes: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        for record in spans:
+            tid = lanes.setdefault(record.lane, len(lanes) + 1)
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": record.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (record.start_ns - origin) / 1000,
+                    "dur": (record.end_ns - record.start_ns) / 1000,
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"span": record.id, "parent": record.parent, **{k: str(v) for k, v in record.attrs.items()}},
+                }
+            )
+        for lane, tid in lanes.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": lane}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Union[str, pathlib.Path]) -> pathlib.Path:
+        """Write the Chrome trace JSON to `path` and return it."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
+
+    def summary(self) -> str:
+        """Per-stage table of call count and total, mean and max wall time."""
+        stages: Dict[str, List[float]] = {}
+        with self._lock:
+            for record in self.spans:
+                stages.setdefault(record.name, []).append(record.duration)
+        if not stages:
+            return "No spans recorded."
+        width = max(len("stage"), *(len(name) for name in stages))
+        lines = [f"{'stage':<{width}}  {'count':>6}  {'total s':>9}  {'mean s':>8}  {'max s':>8}"]
+        for name, durations in sorted(stages.items(), key=lambda item: -sum(item[1])):
+            total = sum(durations)
+            lines.append(
+                f"{name:<{width}}  {len(durations):>6}  {total:>9.2f}  {total / len(durations):>8.3f}  {max(durations):>8.3f}"
+            )
+        return "\n".join(lines)
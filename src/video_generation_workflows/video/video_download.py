@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import shutil
+import threading
+import uuid
+from typing import Any, BinaryIO, Optional, Protocol, Union
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ObjectStore(Protocol):
+    """Opens a storage URI for streaming reads."""
+
+    def open(self, uri: str) -> BinaryIO:
+        ...
+
+
+class LocalObjectStore:
+    """
+    Serves storage URIs from the local filesystem.
+
+    `file://` URIs and plain paths are opened directly. Other URIs, such as
+    `gs://bucket/videos/1.mp4`, map to `root/bucket/videos/1.mp4`, so a
+    directory can stand in for a bucket in tests and offline runs.
+    """
+
+    def __init__(self, root: Union[str, pathlib.Path, None] = None) -> None:
+        self.root = pathlib.Path(root) if root is not None else None
+
+    def path(self, uri: str) -> pathlib.Path:
+        """Return the local file backing `uri`."""
+        parsed = urlparse(uri)
+        if parsed.scheme == "file":
+            return pathlib.Path(url2pathname(parsed.path))
+        if len(parsed.scheme) <= 1:  # no scheme, or a Windows drive letter
+            return pathlib.Path(uri)
+        if self.root is None:
+            raise ValueError(f"LocalObjectStore needs a root directory to serve '{uri}'")
+        return self.root / parsed.netloc / unquote(parsed.path).lstrip("/")
+
+    def open(self, uri: str) -> BinaryIO:
+        return open(self.path(uri), "rb")
+
+
+class GcsObjectStore:
+    """
+    Streams `gs://` URIs from Cloud Storage in `chunk_size` ranged reads.
+
+    Requires google-cloud-storage (installed with google-cloud-aiplatform).
+    """
+
+    def __init__(self, client: Any = None, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._client = client
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                from google.cloud import storage
+
+                self._client = storage.Client()
+            return self._client
+
+    def open(self, uri: str) -> BinaryIO:
+        from google.cloud import storage
+
+        blob = storage.Blob.from_string(uri, client=self._get_client())
+        return blob.open("rb", chunk_size=self.chunk_size)
+
+
+class VideoDownloader:
+    """
+    Writes generated videos to disk with bounded memory and bounded parallelism.
+
+    A video delivered as a storage URI (e.g. when the request set
+    `output_gcs_uri`) is streamed to disk in `chunk_size` pieces, so memory
+    stays flat however large the file or however many candidates an
+    operation returns. Inline `video_bytes` are already resident and are
+    written as they are. Either way the content lands in a temporary file
+    next to the destination and is renamed into place, so an interrupted
+    download never leaves a truncated segment behind, and the rename
+    replaces rather than writes through a hardlinked destination.
+
+    At most `max_parallel` downloads run at once across every caller sharing
+    the downloader.
+    """
+
+    def __init__(
+        self,
+        max_parallel: int = 4,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        store: Optional[ObjectStore] = None,
+    ) -> None:
+        """
+        Create a downloader.
+
+        Parameters
+        ----------
+        max_parallel : int, optional
+            Maximum number of concurrent downloads.
+        chunk_size : int, optional
+            Bytes read and written per step when streaming.
+        store : ObjectStore, optional
+            Opens storage URIs. Defaults to Cloud Storage for `gs://` URIs and
+            the local filesystem for everything else.
+        """
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        self.max_parallel = max_parallel
+        self.chunk_size = chunk_size
+        self.store = store
+        self._slots = threading.BoundedSemaphore(max_parallel)
+        self._gcs: Optional[GcsObjectStore] = None
+        self._local = LocalObjectStore()
+        self._lock = threading.Lock()
+
+    def _open(self, uri: str) -> BinaryIO:
+        if self.store is not None:
+            return self.store.open(uri)
+        if uri.startswith("gs://"):
+            with self._lock:
+                if self._gcs is None:
+                    self._gcs = GcsObjectStore(chunk_size=self.chunk_size)
+            return self._gcs.open(uri)
+        return self._local.open(uri)
+
+    def _write(self, video: Any, tmp_path: pathlib.Path) -> None:
+        data = getattr(video, "video_bytes", None)
+        uri = getattr(video, "uri", None)
+        if data:
+            tmp_path.write_bytes(data)
+        elif uri:
+            with self._open(uri) as source, open(tmp_path, "wb") as target:
+                shutil.copyfileobj(source, target, self.chunk_size)
+        elif hasattr(video, "save"):
+            video.save(tmp_path)
+        else:
+            raise ValueError("Generated video has neither bytes nor a URI to download.")
+
+    def download(self, video: Any, path: Union[str, pathlib.Path]) -> pathlib.Path:
+        """
+        Write `video` (a `google.genai.types.Video`) to `path` and return the path.
+
+        Signature-compatible with `Video.save`, so it can be passed wherever a
+        writer callback is expected, e.g. `functools.partial(downloader.download, video)`.
+        """
+        path = pathlib.Path(path)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        with self._slots, span("download", uri=getattr(video, "uri", None)):
+            try:
+                self._write(video, tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        logger.debug(f"Downloaded video to '{path}'")
+        return path
+
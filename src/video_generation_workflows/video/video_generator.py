@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncContextManager, Optional
 
 from .video_configuration import VideoConfiguration
 
+if TYPE_CHECKING:
+    from .rate_limiter import RateLimiter
+
 
 class VideoGenerator(ABC):
     """
     Interface for all video generators.
 
     Subclasses implement `generate` to produce a video based on
-    a `VideoConfiguration` and return the output file path.
+    a `VideoConfiguration` and return the output file path. `agenerate` is the
+    awaitable variant; by default it runs `generate` in a worker thread, and
+    generators with native async support override it.
     """
 
     @abstractmethod
@@ -31,3 +38,36 @@ class VideoGenerator(ABC):
         """
         raise NotImplementedError
 
+    async def agenerate(
+        self,
+        config: VideoConfiguration,
+        *,
+        operation_slots: Optional[AsyncContextManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        """
+        Asynchronously generate a video using the provided configuration.
+
+        Parameters
+        ----------
+        config : VideoConfiguration
+            The video generation configuration describing the scene
+            and any actions to be applied.
+        operation_slots : AsyncContextManager, optional
+            Shared limit entered around every remote operation, e.g. from a
+            `BatchScheduler`. The default implementation holds one slot for
+            the whole of `generate`.
+        rate_limiter : RateLimiter, optional
+            Shared quota and retry layer. Generators that call the genai API
+            route their client through it; the default implementation, which
+            has no client of its own, ignores it.
+
+        Returns
+        -------
+        str
+            Absolute or relative file system path to the generated video.
+        """
+        if operation_slots is None:
+            return await asyncio.to_thread(self.generate, config)
+        async with operation_slots:
+            return await asyncio.to_thread(self.generate, config)
@@ -1,26 +1,49 @@
 from __future__ import annotations
 
 import logging
+import os
 import pathlib
 import shutil
-from typing import Any, List, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
 
-from moviepy import VideoFileClip, concatenate_videoclips
+from .ffmpeg_tools import can_stream_copy, concat_stream_copy, probe_video
+from .parallel_encoder import ParallelEncoder
+from .render_profile import RenderProfile, render_profiles
+from .seam_blender import SeamBlender
+from .segment_manifest import ChecksumCache, SegmentManifest, SegmentRecord, file_sha256
+from .tracing import annotate, traced
+
+if TYPE_CHECKING:
+    from moviepy import VideoFileClip
 
 logger = logging.getLogger(__name__)
 
 
 class VideoSegmentManager:
     """
-    Manages a collection of MoviePy `VideoFileClip` segments and writes
-    a single combined video to disk.
+    Manages a collection of video segment files and writes a single combined
+    video to disk.
 
     Configure with a `video_name` and a `save_dir` path. Use `add_segment`
     to append segments, and call `save` to concatenate and write the final file.
 
-    On each `add_segment` call, a copy of the segment file is stored in
-    `save_dir` as `segment_XX.mp4` (1-based index) for resilience if the
-    process stops mid-run.
+    On each `add_segment` call, the segment file is stored in `save_dir` as
+    `segment_XX.mp4` (1-based index) and journaled in an
+    atomically updated `manifest.json` (index, prompt hash, checksum,
+    duration). Segments with identical content are stored once and hardlinked
+    (copied where links are unsupported).
+
+    Only paths and metadata are kept while segments are added; no reader stays
+    open. Readers are opened during final assembly only, one segment at a
+    time, so memory use and open processes stay constant regardless of the
+    number of segments. After a crash, `restore` re-validates the journaled segments so
+    a run can resume where it stopped.
+
+    For quick review, `save(PROXY)` writes a small, fast-to-encode preview
+    next to the segments; `save(LADDER)` writes several renditions from a
+    single decode. The full-quality master can be written later from
+    the same segments, without regenerating anything, through a manager
+    rebuilt with `from_manifest`.
     """
 
     def __init__(
@@ -29,6 +52,9 @@ class VideoSegmentManager:
         output_dir: Union[str, pathlib.Path] | None = None,
         *,
         save_dir: Union[str, pathlib.Path] | None = None,
+        stream_copy: bool = True,
+        encode_workers: Optional[int] = None,
+        seam_blend_seconds: float = 0.0,
     ) -> None:
         """
         Create a segment manager.
@@ -41,46 +67,189 @@ class VideoSegmentManager:
             Directory where intermediate segments and the final video are stored.
         save_dir : Path-like, optional
             Deprecated alias for `output_dir` (kept for backward compatibility).
+        stream_copy : bool, optional
+            Allow `save` to join segments without re-encoding when they share
+            codec, resolution, frame rate and timebase. Defaults to True.
+        encode_workers : int, optional
+            Worker processes used when `save` has to re-encode. Defaults to
+            None, which uses every CPU core; the output does not depend on it.
+        seam_blend_seconds : float, optional
+            Crossfade length applied at boundaries between different segments
+            when they are stream-compatible. Only a short window around each
+            seam is re-encoded (see `SeamBlender`). Defaults to 0 (hard cuts).
         """
         self.video_name: str = video_name
         resolved_dir = output_dir if output_dir is not None else save_dir
         if resolved_dir is None:
             raise ValueError("output_dir must be provided")
         self.output_dir: pathlib.Path = pathlib.Path(resolved_dir)
-        self._segments: List[VideoFileClip] = []
         self._segment_paths: List[pathlib.Path] = []
+        # One stored file and one probed duration per distinct segment content
+        self._content_paths: Dict[str, pathlib.Path] = {}
+        self._durations: Dict[str, float] = {}
+        # Checksums of validated files, so hardlinked repeats are hashed once
+        self._checksums: ChecksumCache = {}
+        self.stream_copy: bool = stream_copy
+        self.encode_workers: Optional[int] = encode_workers
+        self.seam_blend_seconds: float = seam_blend_seconds
         self._next_index: int = 1
+        self._manifest: SegmentManifest = SegmentManifest(video_name=video_name)
         logger.info(
             f"Initialized VideoSegmentManager for '{video_name}' in directory: {self.output_dir}"
         )
 
-    def add_segment(self, clip_or_api_video: Union[VideoFileClip, Any]) -> None:
+    @classmethod
+    def from_manifest(cls, output_dir: Union[str, pathlib.Path], **kwargs: Any) -> VideoSegmentManager:
+        """Rebuild a manager from the manifest a previous run left in `output_dir`.
+
+        Every journaled segment must still be intact; nothing is regenerated.
+
+        Parameters
+        ----------
+        output_dir : Path-like
+            Directory holding `manifest.json` and the segment files.
+        **kwargs
+            Further `VideoSegmentManager` options, e.g. `seam_blend_seconds`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If `output_dir` has no manifest.
+        ValueError
+            If a journaled segment is missing or corrupt.
+        """
+        manifest = SegmentManifest.load(output_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"No segment manifest in '{output_dir}'")
+        manager = cls(manifest.video_name, output_dir, **kwargs)
+        broken = [
+            record.filename for record in manifest.segments if not record.is_valid(output_dir, manager._checksums)
+        ]
+        if broken:
+            raise ValueError(f"Missing or corrupt segment(s) in '{output_dir}': {', '.join(broken)}")
+        manager.restore([None] * len(manifest.segments))
+        return manager
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments added (or restored) so far."""
+        return len(self._segment_paths)
+
+    @property
+    def segment_paths(self) -> List[pathlib.Path]:
+        """Paths of the segments added (or restored) so far, in order."""
+        return list(self._segment_paths)
+
+    @property
+    def segment_records(self) -> List[SegmentRecord]:
+        """Manifest records of the segments added (or restored) so far."""
+        return list(self._manifest.segments)
+
+    def restore(self, prompt_hashes: Sequence[Optional[str]]) -> int:
+        """Reload previously journaled segments from `output_dir`.
+
+        Records are accepted in index order while their file exists, matches
+        its checksum and was generated from the expected prompt. The first
+        record that fails validation, and everything after it, is dropped from
+        the manifest so those segments are generated again.
+
+        Parameters
+        ----------
+        prompt_hashes : Sequence[str | None]
+            Expected prompt hash for each segment position (0-based). `None`
+            accepts any prompt for that position.
+
+        Returns
+        -------
+        int
+            Number of restored segments; the next `add_segment` continues after them.
+        """
+        if self._segment_paths:
+            raise RuntimeError("restore must be called before any segment is added.")
+
+        manifest = SegmentManifest.load(self.output_dir)
+        if manifest is None:
+            logger.info(f"No manifest found in '{self.output_dir}', nothing to restore")
+            return 0
+
+        for position, record in enumerate(manifest.segments):
+            if position >= len(prompt_hashes) or record.index != position + 1:
+                break
+            expected_hash = prompt_hashes[position]
+            if expected_hash is not None and record.prompt_hash != expected_hash:
+                logger.info(f"Segment {record.index:02d} was generated from a different prompt, regenerating")
+                break
+            if not record.is_valid(self.output_dir, self._checksums):
+                logger.warning(f"Segment {record.index:02d} is missing or corrupt, regenerating")
+                break
+
+            path = self.output_dir / record.filename
+            self._content_paths.setdefault(record.sha256, path)
+            self._durations.setdefault(record.sha256, record.duration)
+            self._segment_paths.append(path)
+            self._manifest.segments.append(record)
+            logger.info(f"Restored segment {record.index:02d} from '{path}'")
+
+        self._next_index = len(self._segment_paths) + 1
+        self._manifest.save(self.output_dir)
+        logger.info(f"Restored {len(self._segment_paths)} of {len(manifest.segments)} journaled segment(s)")
+        return len(self._segment_paths)
+
+    @traced("manager.add_segment")
+    def add_segment(
+        self,
+        clip_or_api_video: Union[VideoFileClip, str, os.PathLike, Any],
+        *,
+        prompt_hash: Optional[str] = None,
+        sha256: Optional[str] = None,
+        duration: Optional[float] = None,
+    ) -> None:
         """Append a segment to the internal list and persist a copy to disk.
 
         Parameters
         ----------
-        clip_or_api_video : VideoFileClip | google.genai.types.Video
-            Either a MoviePy clip or a Google GenAI API video object (with `.save`).
+        clip_or_api_video : VideoFileClip | Path-like | google.genai.types.Video
+            A MoviePy clip, the path of an existing segment file, or a Google
+            GenAI API video object (with `.save`). A passed clip is closed once
+            its file has been stored.
+        prompt_hash : str, optional
+            Hash of the prompt the segment was generated from, journaled in the
+            manifest so `restore` can detect prompt changes.
+        sha256 : str, optional
+            Precomputed checksum of a segment passed by path, to skip hashing it again.
+        duration : float, optional
+            Precomputed duration of a segment passed by path, to skip probing it again.
         """
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         index = self._next_index
         self._next_index += 1
         dest_path = self.output_dir / f"segment_{index:02d}.mp4"
+        annotate(index=index)
+
+        # Case 1: path to an existing segment file
+        if isinstance(clip_or_api_video, (str, os.PathLike)):
+            src_path = pathlib.Path(clip_or_api_video)
+            sha256 = sha256 or file_sha256(src_path)
+            if duration is not None:
+                self._durations.setdefault(sha256, duration)
+            self._store_from_file(index, src_path, dest_path, sha256)
+            self._record_segment(index, dest_path, prompt_hash, sha256)
+            return
+
+        from moviepy import VideoFileClip
 
-        # Case 1: Google API video-like object with `.save`
+        # Case 2: Google API video-like object with `.save`
         if hasattr(clip_or_api_video, "save") and not isinstance(clip_or_api_video, VideoFileClip):
+            self._clear_destination(dest_path)
             clip_or_api_video.save(dest_path)
             logger.info(f"Saved API segment {index:02d} to '{dest_path}'")
-            clip = VideoFileClip(str(dest_path))
-            self._segments.append(clip)
-            self._segment_paths.append(dest_path)
-            logger.info(
-                f"Added segment {index:02d} (duration: {getattr(clip, 'duration', 0.0):.2f}s) to '{self.video_name}'"
-            )
+            sha256 = file_sha256(dest_path)
+            self._dedupe_stored(index, dest_path, sha256)
+            self._record_segment(index, dest_path, prompt_hash, sha256)
             return
 
-        # Case 2: MoviePy clip – copy from source if possible, else encode
+        # Case 3: MoviePy clip – link or copy from source if possible, else encode
         clip = clip_or_api_video  # expected VideoFileClip
         src_path = getattr(clip, "filename", None)
         try:
@@ -90,84 +259,189 @@ class VideoSegmentManager:
             src_path = None
 
         if src_path and src_path.exists():
-            # Avoid copying a file onto itself
+            sha256 = file_sha256(src_path)
             try:
-                if src_path.resolve() != dest_path.resolve():
-                    shutil.copyfile(src_path, dest_path)
-                    logger.info(f"Copied segment {index:02d} from '{src_path}' to '{dest_path}'")
-                else:
-                    logger.info(
-                        f"Segment {index:02d} already at destination '{dest_path}', skipping copy"
-                    )
+                self._store_from_file(index, src_path, dest_path, sha256)
             except Exception as e:
                 logger.warning(
                     f"Failed to copy segment from '{src_path}' to '{dest_path}', will encode instead: {e}"
                 )
+                self._clear_destination(dest_path)
                 self._save(clip, dest_path)
+                sha256 = file_sha256(dest_path)
         else:
             # Fallback to encoding if source path is unknown
+            self._clear_destination(dest_path)
             self._save(clip, dest_path)
             logger.info(f"Wrote segment {index:02d} to '{dest_path}' via encoding")
+            sha256 = file_sha256(dest_path)
+            self._dedupe_stored(index, dest_path, sha256)
+
+        self._durations.setdefault(sha256, float(getattr(clip, "duration", 0.0) or 0.0))
+        # The file is stored; don't keep the clip's ffmpeg reader alive
+        clip.close()
+        self._record_segment(index, dest_path, prompt_hash, sha256)
+
+    @staticmethod
+    def _clear_destination(dest_path: pathlib.Path) -> None:
+        """Remove a stale destination so writes never go through a shared hardlink."""
+        if dest_path.exists() or dest_path.is_symlink():
+            dest_path.unlink()
+
+    @staticmethod
+    def _link_or_copy(src_path: pathlib.Path, dest_path: pathlib.Path) -> str:
+        try:
+            os.link(src_path, dest_path)
+            return "Linked"
+        except OSError:
+            shutil.copyfile(src_path, dest_path)
+            return "Copied"
+
+    def _store_from_file(
+        self, index: int, src_path: pathlib.Path, dest_path: pathlib.Path, sha256: str
+    ) -> None:
+        """Materialize `dest_path` from `src_path`, sharing storage with identical segments."""
+        # Avoid copying a file onto itself
+        if src_path.resolve() == dest_path.resolve():
+            logger.info(f"Segment {index:02d} already at destination '{dest_path}', skipping copy")
+        else:
+            source = self._content_paths.get(sha256, src_path)
+            self._clear_destination(dest_path)
+            action = self._link_or_copy(source, dest_path)
+            logger.info(f"{action} segment {index:02d} from '{source}' to '{dest_path}'")
+        self._content_paths.setdefault(sha256, dest_path)
+
+    def _dedupe_stored(self, index: int, dest_path: pathlib.Path, sha256: str) -> None:
+        """Replace a freshly written segment with a link to identical stored content."""
+        existing = self._content_paths.get(sha256)
+        if existing is None or not existing.exists():
+            self._content_paths[sha256] = dest_path
+            return
+        if existing.resolve() == dest_path.resolve():
+            return
+        dest_path.unlink()
+        action = self._link_or_copy(existing, dest_path)
+        logger.info(f"{action} duplicate segment {index:02d} to identical '{existing}'")
+
+    def _duration_for(self, sha256: str, path: pathlib.Path) -> float:
+        """Return a segment's duration, probing each distinct content once."""
+        duration = self._durations.get(sha256)
+        if duration is None:
+            info = probe_video(path)
+            if info is not None:
+                duration = info.duration
+            else:
+                from moviepy import VideoFileClip
+
+                with VideoFileClip(str(path), audio=False) as clip:
+                    duration = float(clip.duration or 0.0)
+            self._durations[sha256] = duration
+        return duration
 
-        self._segments.append(clip)
+    def _record_segment(
+        self,
+        index: int,
+        dest_path: pathlib.Path,
+        prompt_hash: Optional[str],
+        sha256: str,
+    ) -> None:
+        """Track an added segment and journal it in the manifest."""
+        duration = self._duration_for(sha256, dest_path)
         self._segment_paths.append(dest_path)
+        self._manifest.segments.append(
+            SegmentRecord(
+                index=index,
+                filename=dest_path.name,
+                sha256=sha256,
+                duration=duration,
+                prompt_hash=prompt_hash,
+            )
+        )
+        self._manifest.save(self.output_dir)
         logger.info(
-            f"Added segment {index:02d} (duration: {getattr(clip, 'duration', 0.0):.2f}s) to '{self.video_name}'"
+            f"Added segment {index:02d} (duration: {duration:.2f}s) to '{self.video_name}'"
         )
 
-    def save(self) -> str:
+    @traced("manager.save")
+    def save(
+        self, profile: Union[RenderProfile, Sequence[RenderProfile], None] = None
+    ) -> Union[str, List[str]]:
         """Concatenate all segments and write the final video file.
 
+        When every segment shares codec, resolution, frame rate and timebase
+        (the normal case for Veo output), the segments are remuxed with the
+        ffmpeg concat demuxer without re-encoding. Otherwise they are composed
+        and re-encoded with MoviePy.
+
+        Parameters
+        ----------
+        profile : RenderProfile | Sequence[RenderProfile], optional
+            Re-encode with this profile (e.g. `PROXY`) into
+            `<video_name>_<profile name>.mp4` instead of writing the master.
+            Given several profiles (e.g. `LADDER`), all renditions are encoded
+            concurrently from one decode of the segments (see
+            `render_profiles`). Seam blending is skipped for profiles.
+
         Returns
         -------
-        str
-            Path to the written video file.
+        str | List[str]
+            Path to the written video file; one path per profile, in order,
+            when a sequence of profiles is given.
         """
-        if not self._segments:
+        if not self._segment_paths:
             raise RuntimeError("No segments have been added.")
 
-        logger.info(f"Saving video '{self.video_name}' with {len(self._segments)} segment(s)")
+        logger.info(f"Saving video '{self.video_name}' with {len(self._segment_paths)} segment(s)")
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if isinstance(profile, RenderProfile):
+            return self._render([profile])[0]
+        if profile is not None:
+            return self._render(list(profile))
         output_path = self.output_dir / f"{self.video_name}.mp4"
 
         logger.info(f"Output path: {output_path}")
 
-        try:
+        if self.stream_copy and can_stream_copy(self._segment_paths):
+            if self.seam_blend_seconds > 0:
+                logger.info("Segments are stream-compatible, blending seams and copying the rest")
+                SeamBlender(self.seam_blend_seconds).render(
+                    self._segment_paths,
+                    output_path,
+                    content_ids=[record.sha256 for record in self._manifest.segments],
+                )
+            else:
+                logger.info("Segments are stream-compatible, joining without re-encoding")
+                concat_stream_copy(self._segment_paths, output_path)
+        else:
+            if self.seam_blend_seconds > 0:
+                logger.warning("Seam blending needs stream-compatible segments, using hard cuts")
             logger.info("Writing final video file")
-            self._save(self._segments, output_path)
-        finally:
-            # Close all segment clips
-            logger.info("Closing all segment clips")
-            for i, clip in enumerate(self._segments, 1):
-                try:
-                    clip.close()
-                    logger.info(f"Closed segment {i}")
-                except Exception as e:
-                    logger.warning(f"Failed to close segment {i}: {e}")
+            self._save(self._segment_paths, output_path)
 
         logger.info(f"Successfully saved video: {output_path}")
         return str(output_path)
 
-    def _save(self, target: Union[VideoFileClip, List[VideoFileClip]], dest_path: pathlib.Path) -> None:
-        """Internal helper to persist either a single clip or a list of clips.
+    def _render(self, profiles: List[RenderProfile]) -> List[str]:
+        """Write one `<video_name>_<profile name>.mp4` per profile from a single decode."""
+        names = [profile.name for profile in profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Rendition names must be unique: {', '.join(names)}")
+        outputs = [(profile, self.output_dir / f"{self.video_name}_{profile.name}.mp4") for profile in profiles]
+        return render_profiles(self._segment_paths, outputs)
+
+    def _save(self, target: Union[VideoFileClip, List[pathlib.Path]], dest_path: pathlib.Path) -> None:
+        """Internal helper to persist either a single clip or a list of segment files.
 
         - If `target` is a single clip: write it directly to `dest_path`.
-        - If `target` is a list of clips: concatenate and write to `dest_path`.
+        - If `target` is a list of paths: re-encode them through a
+          `ParallelEncoder` with `encode_workers` processes, each streaming its
+          chunk one reader at a time. Segments smaller than the largest one are
+          centered on a black canvas, as MoviePy's "compose" concatenation does.
         """
-        if isinstance(target, list):
-            logger.info(f"Concatenating {len(target)} segments")
-            final = concatenate_videoclips(target, method="compose")
-            try:
-                logger.info("Writing concatenated video to output file")
-                final.write_videofile(str(dest_path), codec="libx264", audio=False)
-            finally:
-                try:
-                    final.close()
-                    logger.info("Closed concatenated video clip")
-                except Exception as e:
-                    logger.warning(f"Failed to close concatenated clip: {e}")
-        else:
+        if not isinstance(target, list):
             logger.info("Writing single clip to output file")
             target.write_videofile(str(dest_path), codec="libx264", audio=False)
+            return
 
+        ParallelEncoder(self.encode_workers).encode(target, dest_path)
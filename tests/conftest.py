@@ -0,0 +1,74 @@
+import itertools
+import pathlib
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeImage:
+    def __init__(self, image_bytes=b"jpeg"):
+        self.image_bytes = image_bytes
+        self.mime_type = "image/jpeg"
+
+    def save(self, location):
+        pathlib.Path(location).write_bytes(self.image_bytes)
+
+
+class FakeModels:
+    def __init__(self, client):
+        self._client = client
+        self._names = itertools.count(1)
+
+    def generate_images(self, *, model, prompt, config=None):
+        self._client.record("generate_images", model)
+        return SimpleNamespace(generated_images=[SimpleNamespace(image=FakeImage())])
+
+    def generate_videos(self, *, model, prompt, image=None, config=None):
+        self._client.record("generate_videos", model)
+        count = getattr(config, "number_of_videos", None) or 1
+        videos = [
+            SimpleNamespace(video=SimpleNamespace(video_bytes=f"{prompt}#{n}".encode("utf-8"), uri=None))
+            for n in range(count)
+        ]
+        return SimpleNamespace(
+            name=f"operations/{next(self._names)}",
+            done=False,
+            error=None,
+            response=SimpleNamespace(generated_videos=videos),
+        )
+
+
+class FakeOperations:
+    def get(self, operation):
+        operation.done = True
+        return operation
+
+
+class FakeClient:
+    """Synchronous stand-in for `google.genai.Client`; operations finish on their first poll."""
+
+    def __init__(self):
+        self.models = FakeModels(self)
+        self.operations = FakeOperations()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, call, model):
+        with self._lock:
+            self.calls.append((call, model))
+
+
+@pytest.fixture
+def offline_generation(monkeypatch):
+    """Skip without google-genai; otherwise stub probing and the final render so no ffmpeg is needed."""
+    pytest.importorskip("google.genai")
+    from video_generation_workflows.video import background_video_generator, segment_pipeline
+
+    monkeypatch.setattr(segment_pipeline, "probe_video", lambda path: None)
+    monkeypatch.setattr(
+        background_video_generator.TimelineRenderer,
+        "render",
+        lambda self, timeline, sources, output_path, profile=None: str(output_path),
+    )
+    return FakeClient
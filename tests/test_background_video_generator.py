@@ -0,0 +1,62 @@
+import pytest
+
+from video_generation_workflows.video.loop_scorer import LoopScore
+
+
+class _FixedScorer:
+    def __init__(self, *scores):
+        self.scores = list(scores)
+
+    def score(self, path):
+        value = self.scores.pop(0) if len(self.scores) > 1 else self.scores[0]
+        return LoopScore(seam_error=0.0, drift=0.0, jitter=0.0, score=value)
+
+
+@pytest.mark.parametrize(
+    "scores, expected_submissions",
+    [((0.1,), 3), ((0.1, 0.95), 2), ((0.95,), 1)],
+)
+def test_regeneration_stops_at_threshold_or_max_regenerations(
+    tmp_path, offline_generation, scores, expected_submissions
+):
+    from video_generation_workflows import VideoConfiguration
+    from video_generation_workflows.video import BackgroundVideoGenerator, ClientPool
+
+    client = offline_generation()
+    generator = BackgroundVideoGenerator(
+        "project",
+        "us-central1",
+        tmp_path,
+        min_poll_interval_seconds=0.01,
+        materialize_segments=False,
+        loop_score_threshold=0.9,
+        max_regenerations=2,
+        loop_scorer=_FixedScorer(*scores),
+        client_pool=ClientPool(lambda *key: client),
+    )
+    generator.generate(VideoConfiguration(video_name="loop", length=3, base_scene_prompt="A quiet room"))
+
+    submissions = [call for call, _ in client.calls if call == "generate_videos"]
+    assert len(submissions) == expected_submissions
+
+
+def test_best_candidate_is_kept(tmp_path, offline_generation):
+    from video_generation_workflows import VideoConfiguration
+    from video_generation_workflows.video import BackgroundVideoGenerator, ClientPool
+
+    client = offline_generation()
+    preference = {b"#0": 0.2, b"#1": 0.9, b"#2": 0.5}
+    generator = BackgroundVideoGenerator(
+        "project",
+        "us-central1",
+        tmp_path,
+        min_poll_interval_seconds=0.01,
+        materialize_segments=False,
+        candidates=3,
+        candidate_scorer=lambda path: preference[path.read_bytes()[-2:]],
+        client_pool=ClientPool(lambda *key: client),
+    )
+    generator.generate(VideoConfiguration(video_name="loop", length=2, base_scene_prompt="A quiet room"))
+
+    assert (tmp_path / "segment_base.mp4").read_bytes().endswith(b"#1")
+    assert not list(tmp_path.glob("*candidate*"))
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from video_generation_workflows import VideoConfiguration
+from video_generation_workflows.video.batch_scheduler import BatchJob, BatchScheduler, FairShareLimiter
+
+
+def _job(name, *, priority=0, weight=1.0):
+    return BatchJob(None, VideoConfiguration(video_name=name, length=1, base_scene_prompt=name), priority, weight)
+
+
+async def _grant_order(limiter, holders, waiters):
+    """Hold one slot per job in `holders`, queue one request per job in `waiters`, then free slots one at a time."""
+    for job in holders:
+        limiter.slots_for(job)
+        await limiter.acquire(job)
+    granted = []
+
+    async def wait(job):
+        await limiter.acquire(job)
+        granted.append(job.name)
+
+    tasks = []
+    for job in waiters:
+        limiter.slots_for(job)
+        tasks.append(asyncio.create_task(wait(job)))
+        await asyncio.sleep(0)
+    for _ in waiters:
+        limiter.release(holders[0])
+        holders[0].in_flight += 1  # keep the holder's share fixed while it frees slots
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return granted
+
+
+def test_higher_priority_is_granted_first():
+    blocker, low, high = _job("blocker"), _job("low"), _job("high", priority=1)
+    order = asyncio.run(_grant_order(FairShareLimiter(1), [blocker], [low, high]))
+    assert order == ["high", "low"]
+
+
+def test_fewest_in_flight_per_weight_is_granted_first():
+    async def run():
+        limiter = FairShareLimiter(3)
+        light, heavy = _job("light"), _job("heavy", weight=2.0)
+        for job in (light, heavy):
+            limiter.slots_for(job)
+            await limiter.acquire(job)
+        # Both hold one slot; per unit of weight the heavy job holds less
+        return await _grant_order(limiter, [_job("blocker")], [light, heavy])
+
+    assert asyncio.run(run()) == ["heavy", "light"]
+
+
+def test_fewest_granted_per_weight_breaks_ties():
+    async def run():
+        limiter = FairShareLimiter(1)
+        busy, idle = _job("busy"), _job("idle")
+        for job in (busy, busy, idle):
+            limiter.slots_for(job)
+            await limiter.acquire(job)
+            limiter.release(job)
+        return await _grant_order(limiter, [_job("blocker")], [busy, idle])
+
+    assert asyncio.run(run()) == ["idle", "busy"]
+
+
+def test_cancelled_waiter_hands_back_a_granted_slot():
+    async def run():
+        limiter = FairShareLimiter(1)
+        blocker, job = _job("blocker"), _job("job")
+        for j in (blocker, job):
+            limiter.slots_for(j)
+        await limiter.acquire(blocker)
+        task = asyncio.create_task(limiter.acquire(job))
+        await asyncio.sleep(0)
+        # The slot is granted to the waiter and the waiter is cancelled before it resumes
+        limiter.release(blocker)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert (limiter.in_use, job.in_flight) == (0, 0)
+
+        # A waiter cancelled before any grant simply leaves the queue
+        await limiter.acquire(blocker)
+        task = asyncio.create_task(limiter.acquire(job))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not job._waiters
+        limiter.release(blocker)
+        assert limiter.in_use == 0
+
+    asyncio.run(run())
+
+
+class _FakeGenerator:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def agenerate(self, config, *, operation_slots, rate_limiter):
+        async with operation_slots:
+            await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("quota exhausted")
+        return f"{config.video_name}.mp4"
+
+
+def test_failing_job_does_not_stop_the_others():
+    scheduler = BatchScheduler(max_concurrent_operations=2)
+    configs = [VideoConfiguration(video_name=name, length=1, base_scene_prompt=name) for name in "abc"]
+    scheduler.submit(_FakeGenerator(), configs[0])
+    failing = scheduler.submit(_FakeGenerator(fail=True), configs[1], priority=1)
+    scheduler.submit(_FakeGenerator(), configs[2])
+
+    jobs = scheduler.run()
+
+    assert [job.result for job in jobs] == ["a.mp4", None, "c.mp4"]
+    assert isinstance(failing.error, RuntimeError)
+    assert [job.error for job in jobs if job is not failing] == [None, None]
@@ -0,0 +1,127 @@
+import asyncio
+import itertools
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+from video_generation_workflows.video.client_pool import ClientPool
+
+
+class _LoopBoundOperations:
+    """Async operations surface that, like an aiohttp/httpx session, only works on its first loop."""
+
+    def __init__(self) -> None:
+        self.loop = None
+
+    async def get(self, operation):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        if loop is not self.loop:
+            raise RuntimeError("Event loop is closed")
+        operation.polls += 1
+        operation.done = operation.polls >= 2
+        return operation
+
+
+def _image():
+    return SimpleNamespace(
+        image_bytes=b"jpeg", mime_type="image/jpeg", save=lambda path: pathlib.Path(path).write_bytes(b"jpeg")
+    )
+
+
+class _Models:
+    def __init__(self) -> None:
+        self._names = itertools.count(1)
+
+    def generate_images(self, **kwargs):
+        return SimpleNamespace(generated_images=[SimpleNamespace(image=_image())])
+
+    def generate_videos(self, *, prompt, **kwargs):
+        video = SimpleNamespace(video_bytes=prompt.encode("utf-8"), uri=None)
+        return SimpleNamespace(
+            name=f"operations/{next(self._names)}",
+            done=False,
+            error=None,
+            polls=0,
+            response=SimpleNamespace(generated_videos=[SimpleNamespace(video=video)]),
+        )
+
+
+class _AsyncClient:
+    """Per-loop async surface; records whether the pool closed it."""
+
+    def __init__(self) -> None:
+        self.operations = _LoopBoundOperations()
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _client():
+    return SimpleNamespace(
+        models=_Models(),
+        operations=SimpleNamespace(get=lambda operation: operation),
+        aio=SimpleNamespace(operations=_LoopBoundOperations()),
+    )
+
+
+def _pool():
+    """A pool that records every client and per-loop async surface it builds."""
+    built, sessions = [], []
+    pool = ClientPool(
+        lambda *key: built.append(key) or _client(),
+        lambda client: sessions.append(_AsyncClient()) or sessions[-1],
+    )
+    return pool, built, sessions
+
+
+def test_async_surface_is_per_event_loop():
+    pool, built, sessions = _pool()
+    client = pool.get("project", "us-central1")
+    assert pool.get("project", "us-central1") is client
+
+    async def aio():
+        assert client.aio is client.aio
+        return client.aio
+
+    first, second = pool.run(aio()), pool.run(aio())
+    assert first is not second
+    assert sessions == [first, second]
+    assert first.closed and second.closed
+    assert client.aio is client.client.aio
+    assert client.models is client.client.models
+    assert built == [("project", "us-central1", "v1")]
+
+
+def test_generate_twice_on_one_pool(tmp_path, monkeypatch):
+    pytest.importorskip("google.genai")
+    from video_generation_workflows import VideoConfiguration
+    from video_generation_workflows.video import background_video_generator, segment_pipeline
+
+    monkeypatch.setattr(segment_pipeline, "probe_video", lambda path: None)
+    monkeypatch.setattr(
+        background_video_generator.TimelineRenderer,
+        "render",
+        lambda self, timeline, sources, output_path, profile=None: str(output_path),
+    )
+    pool, built, sessions = _pool()
+    config = VideoConfiguration(video_name="twice", length=2, base_scene_prompt="A quiet room")
+    for run in range(2):
+        generator = background_video_generator.BackgroundVideoGenerator(
+            "project",
+            "us-central1",
+            tmp_path / f"run_{run}",
+            min_poll_interval_seconds=0.01,
+            max_poll_interval_seconds=0.05,
+            materialize_segments=False,
+            client_pool=pool,
+        )
+        assert generator.generate(config).endswith("twice.mp4")
+
+    # One client for both runs; each run's loop got its own async session, closed before the loop ended
+    assert built == [("project", "us-central1", "v1")]
+    assert len(sessions) == 2
+    assert all(session.closed for session in sessions)
@@ -0,0 +1,22 @@
+import subprocess
+
+from video_generation_workflows.video import ffmpeg_tools
+
+
+def _ffprobe_output(monkeypatch, stdout):
+    monkeypatch.setattr(ffmpeg_tools, "ffprobe_binary", lambda: "ffprobe")
+    monkeypatch.setattr(
+        ffmpeg_tools.subprocess,
+        "run",
+        lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, stdout=stdout, stderr=b""),
+    )
+
+
+def test_keyframe_times_are_relative_to_the_first_keyframe(monkeypatch):
+    _ffprobe_output(monkeypatch, b"0.083,K__\n0.125,___\n2.083,K__\n")
+    assert ffmpeg_tools.keyframe_times("segment.mp4") == [0.0, 2.0]
+
+
+def test_keyframe_times_without_packets(monkeypatch):
+    _ffprobe_output(monkeypatch, b"")
+    assert ffmpeg_tools.keyframe_times("segment.mp4") == [0.0]
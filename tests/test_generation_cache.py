@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from video_generation_workflows.video.generation_cache import GenerationCache
+
+
+def _writer(data):
+    return lambda path: path.write_bytes(data)
+
+
+def test_key_is_stable_and_sensitive_to_every_input():
+    config = {"duration_seconds": 8, "aspect_ratio": "16:9"}
+    key = GenerationCache.key("veo", "A quiet room", b"image", config)
+    assert key == GenerationCache.key("veo", "A quiet room", b"image", {"aspect_ratio": "16:9", "duration_seconds": 8})
+    assert len({
+        key,
+        GenerationCache.key("imagen", "A quiet room", b"image", config),
+        GenerationCache.key("veo", "A busy room", b"image", config),
+        GenerationCache.key("veo", "A quiet room", b"other image", config),
+        GenerationCache.key("veo", "A quiet room", None, config),
+        GenerationCache.key("veo", "A quiet room", b"image", {**config, "duration_seconds": 6}),
+    }) == 6
+
+
+def test_miss_store_hit(tmp_path):
+    cache = GenerationCache(tmp_path)
+    key = GenerationCache.key("veo", "prompt")
+    assert cache.get(key) is None
+    stored = cache.put(key, _writer(b"video"))
+    assert cache.get(key) == stored
+    assert stored.read_bytes() == b"video"
+    assert (cache.stats.misses, cache.stats.stores, cache.stats.hits) == (1, 1, 1)
+    assert cache.stats.hit_rate == 0.5
+    assert not [p for p in stored.parent.iterdir() if p.name.startswith(".")]
+
+
+def test_failed_write_leaves_no_entry(tmp_path):
+    cache = GenerationCache(tmp_path)
+    key = GenerationCache.key("veo", "prompt")
+
+    def write(path):
+        path.write_bytes(b"partial")
+        raise OSError("download failed")
+
+    with pytest.raises(OSError):
+        cache.put(key, write)
+    assert cache.get(key) is None
+    assert cache.size_bytes() == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = GenerationCache(tmp_path, max_size_bytes=25)
+    first, second, third = (GenerationCache.key("veo", prompt) for prompt in ("first", "second", "third"))
+    first_path = cache.put(first, _writer(b"x" * 10))
+    second_path = cache.put(second, _writer(b"x" * 10))
+    os.utime(first_path, (1000, 1000))
+    os.utime(second_path, (2000, 2000))
+    # A hit makes the older entry the most recently used one
+    assert cache.get(first) == first_path
+
+    cache.put(third, _writer(b"x" * 10))
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    assert (cache.stats.evictions, cache.stats.evicted_bytes) == (1, 10)
+    assert cache.size_bytes() == 20
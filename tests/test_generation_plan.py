@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from video_generation_workflows import VideoConfiguration
+from video_generation_workflows.video.chained_video_generator import ChainedVideoGenerator
+from video_generation_workflows.video.generation_plan import (
+    CONCAT,
+    FRAME,
+    IMAGE,
+    VIDEO,
+    GenerationPlan,
+    PlanExecutor,
+)
+
+
+def test_identical_operations_collapse_into_one_node():
+    plan = GenerationPlan("dedupe")
+    image = plan.add(IMAGE, prompt="A quiet room")
+    first = plan.add(VIDEO, deps=(image,), prompt="Rain on the window")
+    second = plan.add(VIDEO, deps=(image,), prompt="Rain on the window")
+    other = plan.add(VIDEO, deps=(image,), prompt="A cat walks in")
+    plan.add(CONCAT, deps=(first, second, other, first))
+
+    assert first == second != other
+    assert plan.requested == 5
+    assert len(plan.nodes) == 4
+    assert plan.unique_calls() == {IMAGE: 1, VIDEO: 2}
+    assert plan.nodes[plan.output].deps == (first, first, other, first)
+
+
+def test_failing_node_cancels_its_dependents():
+    plan = GenerationPlan("failure")
+    image = plan.add(IMAGE, prompt="A quiet room")
+    failing = plan.add(VIDEO, deps=(image,), prompt="fails")
+    frame = plan.add(FRAME, deps=(failing,))
+    slow = plan.add(VIDEO, deps=(image,), prompt="slow")
+    plan.add(CONCAT, deps=(failing, slow))
+    started, cancelled = [], []
+
+    async def handler(node, inputs):
+        started.append(node.id)
+        if node.prompt == "fails":
+            raise RuntimeError("quota exhausted")
+        if node.prompt == "slow":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(node.id)
+                raise
+        return node.id
+
+    executor = PlanExecutor({IMAGE: handler, VIDEO: handler, FRAME: handler, CONCAT: handler})
+    with pytest.raises(RuntimeError, match="quota exhausted"):
+        asyncio.run(executor.run(plan))
+
+    assert frame not in started and plan.output not in started
+    assert cancelled == [slow]
+
+
+def test_completed_nodes_are_not_run_again():
+    plan = GenerationPlan("resume")
+    image = plan.add(IMAGE, prompt="A quiet room")
+    video = plan.add(VIDEO, deps=(image,), prompt="Rain on the window")
+    calls = []
+
+    async def handler(node, inputs):
+        calls.append(node.kind)
+        return inputs
+
+    results = asyncio.run(PlanExecutor({VIDEO: handler}).run(plan, completed={image: "start.jpg"}))
+    assert calls == [VIDEO]
+    assert results[video] == ["start.jpg"]
+
+
+def test_chained_plan_critical_path_runs_through_every_segment(tmp_path):
+    generator = ChainedVideoGenerator("project", "us-central1", tmp_path)
+    config = VideoConfiguration(video_name="chained", length=6, base_scene_prompt="A quiet room")
+    path, seconds = generator.compile_plan(config).critical_path()
+
+    # image -> video -> frame -> video -> ... -> video -> concat
+    assert [node.kind for node in path] == [IMAGE] + [VIDEO, FRAME] * 5 + [VIDEO, CONCAT]
+    assert len(path) == 13
+    assert sum(node.remote for node in path) == 7
+    assert seconds == pytest.approx(10 + 6 * 90 + 5 * 0.5 + 10)
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+
+def _png(pixels):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_sharp_image_ranks_above_blurred():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("PIL")
+    from PIL import Image, ImageFilter
+
+    from video_generation_workflows.video.image_scorer import ImageScorer
+
+    # Mid-gray stripes: well exposed, full of edges
+    stripes = np.where((np.arange(256) // 8) % 2 == 0, 96, 160).astype(np.uint8)
+    sharp = np.tile(stripes, (256, 1))
+    blurred = np.asarray(Image.fromarray(sharp).filter(ImageFilter.GaussianBlur(6)))
+
+    sharp_quality, blurred_quality = ImageScorer(width=256).rank([_png(sharp), _png(blurred)])
+
+    assert sharp_quality.sharpness > blurred_quality.sharpness
+    assert sharp_quality.score > blurred_quality.score
+
+
+def test_noise_estimate_grows_with_noise():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("PIL")
+    from video_generation_workflows.video.image_scorer import ImageScorer
+
+    rng = np.random.default_rng(0)
+    flat = np.full((128, 128), 128.0)
+    clean = flat.astype(np.uint8)
+    noisy = np.clip(flat + rng.normal(0, 10, flat.shape), 0, 255).astype(np.uint8)
+
+    scorer = ImageScorer(width=128)
+    assert scorer.score(_png(clean)).noise == pytest.approx(0.0, abs=1e-6)
+    assert scorer.score(_png(noisy)).noise == pytest.approx(10 / 255, rel=0.25)
@@ -0,0 +1,25 @@
+import pytest
+
+from video_generation_workflows.video.loop_scorer import LoopScorer
+
+
+def _frames(*values):
+    np = pytest.importorskip("numpy")
+    return np.stack([np.full((8, 8, 3), value, dtype=np.uint8) for value in values])
+
+
+def test_seamless_clip_scores_better_than_a_hard_cut(monkeypatch, tmp_path):
+    clips = {
+        "seamless.mp4": _frames(100, 104, 106, 104, 102, 100),
+        "hard_cut.mp4": _frames(100, 104, 106, 104, 102, 160),
+    }
+    monkeypatch.setattr(LoopScorer, "_sample_frames", lambda self, path: clips[path.name])
+    scorer = LoopScorer(samples=4)
+
+    seamless, hard_cut = scorer.score(tmp_path / "seamless.mp4"), scorer.score(tmp_path / "hard_cut.mp4")
+
+    assert seamless.seam_error == 0.0
+    assert hard_cut.seam_error == pytest.approx(60 / 255)
+    assert seamless.score > hard_cut.score
+    assert hard_cut.score == 0.0
+    assert seamless.drift == pytest.approx(6 / 255)
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from video_generation_workflows.video.operation_poller import COLD_START_MAX_INTERVAL_SECONDS, OperationPoller
+
+
+class _Operations:
+    def __init__(self, ready_after: float) -> None:
+        self.ready_after = ready_after
+
+    def get(self, operation):
+        if time.monotonic() - operation.submitted_at >= self.ready_after:
+            operation.done = True
+        return operation
+
+
+def _client(ready_after: float) -> SimpleNamespace:
+    return SimpleNamespace(operations=_Operations(ready_after))
+
+
+def _operation() -> SimpleNamespace:
+    return SimpleNamespace(name="operations/test", done=False, error=None, submitted_at=time.monotonic())
+
+
+def test_cold_start_interval_is_capped():
+    poller = OperationPoller(_client(0.0), max_interval_seconds=60.0)
+    delays = [poller._next_delay(0.0, polls, 0) for polls in range(20)]
+    assert delays[0] == poller.min_interval_seconds
+    assert max(delays) == COLD_START_MAX_INTERVAL_SECONDS
+
+
+def test_estimate_is_shared_per_model():
+    model = "test-shared-estimate"
+    first = OperationPoller(_client(0.05), min_interval_seconds=0.01, max_interval_seconds=0.05, model=model)
+
+    async def wait():
+        try:
+            return await first.wait(_operation())
+        finally:
+            await first.aclose()
+
+    assert asyncio.run(wait()).done
+    second = OperationPoller(_client(0.05), min_interval_seconds=0.01, max_interval_seconds=0.05, model=model)
+    assert second.expected_duration is not None
+    assert second.expected_duration == first.expected_duration
+    assert OperationPoller(_client(0.05)).expected_duration is None
+    assert OperationPoller(_client(0.05), model="test-other-model").expected_duration is None
+
+
+def test_cancelled_wait_stops_polling():
+    polled = []
+
+    class _Operations:
+        def get(self, operation):
+            polled.append(operation)
+            return operation
+
+    poller = OperationPoller(SimpleNamespace(operations=_Operations()), min_interval_seconds=0.01)
+
+    async def run():
+        waiter = asyncio.ensure_future(poller.wait(_operation()))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert poller.pending_count == 0
+        count = len(polled)
+        await asyncio.sleep(0.05)
+        assert len(polled) == count
+        await poller.aclose()
+
+    asyncio.run(run())
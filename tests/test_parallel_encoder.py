@@ -0,0 +1,86 @@
+import shutil
+import subprocess
+from concurrent.futures import Future
+
+import pytest
+
+from video_generation_workflows.video import parallel_encoder
+from video_generation_workflows.video.ffmpeg_tools import ffmpeg_binary, run_ffmpeg
+from video_generation_workflows.video.parallel_encoder import ParallelEncoder
+
+
+class _InlinePool:
+    """Runs submitted calls immediately and records how the pool was created."""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.created.append(kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_chunks_do_not_depend_on_worker_count(tmp_path, monkeypatch, workers):
+    encoded, joined = [], []
+    monkeypatch.setattr(parallel_encoder, "canvas_for", lambda paths: (160, 90, 12.0))
+    monkeypatch.setattr(
+        parallel_encoder, "encode_segments", lambda paths, dest, canvas: encoded.append([str(p) for p in paths])
+    )
+    monkeypatch.setattr(parallel_encoder, "concat_stream_copy", lambda paths, dest: joined.append(len(paths)))
+    monkeypatch.setattr(parallel_encoder, "ProcessPoolExecutor", _InlinePool)
+    _InlinePool.created.clear()
+
+    segments = [f"segment_{i:02d}.mp4" for i in range(5)]
+    ParallelEncoder(workers, segments_per_chunk=2).encode(segments, tmp_path / "out.mp4")
+
+    assert encoded == [segments[0:2], segments[2:4], segments[4:5]]
+    assert joined == [3]
+    if workers == 1:
+        assert _InlinePool.created == []
+    else:
+        assert _InlinePool.created[0]["max_workers"] == 3
+        assert _InlinePool.created[0]["mp_context"].get_start_method() == "spawn"
+
+
+def _segment(path, hue):
+    run_ffmpeg(
+        [
+            "-f", "lavfi", "-i", "testsrc2=size=160x90:rate=12:duration=1",
+            "-vf", f"hue=h={hue}", "-c:v", "libx264", "-pix_fmt", "yuv420p", str(path),
+        ]
+    )
+    return path
+
+
+def _framemd5(path):
+    result = subprocess.run(
+        [
+            ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+            "-i", str(path), "-map", "0:v:0", "-f", "framemd5", "-",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return [line for line in result.stdout.decode().splitlines() if not line.startswith("#")]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_output_does_not_depend_on_worker_count(tmp_path):
+    pytest.importorskip("moviepy")
+    pytest.importorskip("numpy")
+    segments = [_segment(tmp_path / f"segment_{i:02d}.mp4", i * 60) for i in range(5)]
+    serial = ParallelEncoder(1, segments_per_chunk=2).encode(segments, tmp_path / "serial.mp4")
+    parallel = ParallelEncoder(3, segments_per_chunk=2).encode(segments, tmp_path / "parallel.mp4")
+    frames = _framemd5(serial)
+    assert len(frames) == 5 * 12
+    assert frames == _framemd5(parallel)
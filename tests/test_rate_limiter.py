@@ -0,0 +1,134 @@
+import pytest
+
+from video_generation_workflows.video import rate_limiter
+from video_generation_workflows.video.rate_limiter import CircuitBreaker, RateLimiter, TokenBucket
+
+
+class _FakeClock:
+    """Stands in for the `time` module: sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+
+    clock.now += 10  # refills up to capacity, not beyond
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps[2:] == [pytest.approx(1.0)]
+
+
+def test_each_model_has_its_own_bucket(clock):
+    limiter = RateLimiter(60, burst=1)
+    for model in ("imagen", "veo", "imagen", "veo"):
+        limiter.call(lambda **kwargs: None, model=model)
+    assert limiter.bucket("imagen") is not limiter.bucket("veo")
+    # The second call per model waits for its own bucket only
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+    limited = RateLimiter({"veo": 6})
+    assert limited.bucket("veo").rate_per_second == pytest.approx(0.1)
+    assert limited.bucket("imagen") is None
+
+
+def test_breaker_admits_one_probe_when_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=30)
+    breaker.record_failure()
+    assert breaker._admit() == 0.0
+    breaker.record_failure()
+    assert breaker.is_open
+    assert breaker._admit() == pytest.approx(30)
+
+    clock.now += 30
+    assert breaker._admit() == 0.0  # the probe
+    assert breaker._admit() > 0  # everyone else waits for its outcome
+    breaker.record_failure()
+    assert breaker._admit() == pytest.approx(30)
+
+    clock.now += 30
+    assert breaker._admit() == 0.0
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker._admit() == 0.0
+
+
+def _failing(errors, *codes):
+    """Return a call that raises an APIError per code, then returns "ok", and the list of its attempts."""
+    attempts = []
+
+    def call(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) <= len(codes):
+            raise errors.APIError(codes[len(attempts) - 1], {})
+        return "ok"
+
+    return call, attempts
+
+
+def test_quota_errors_are_retried_until_the_call_succeeds(clock):
+    errors = pytest.importorskip("google.genai.errors")
+    limiter = RateLimiter(max_retries=3, base_delay_seconds=1, failure_threshold=10)
+    call, attempts = _failing(errors, 429, 429)
+    assert limiter.call(call, model="veo") == "ok"
+    assert len(attempts) == 3
+    assert len(clock.sleeps) == 2
+    assert all(0 <= delay <= 1 * 2 ** i for i, delay in enumerate(clock.sleeps))
+
+
+def test_retries_give_up_after_max_retries(clock):
+    errors = pytest.importorskip("google.genai.errors")
+    limiter = RateLimiter(max_retries=2, failure_threshold=10)
+    call, attempts = _failing(errors, 429, 429, 429, 429)
+    with pytest.raises(errors.APIError):
+        limiter.call(call, model="veo")
+    assert len(attempts) == 3
+
+
+def test_server_errors_are_retried_for_polls_but_not_submissions(clock):
+    errors = pytest.importorskip("google.genai.errors")
+    limiter = RateLimiter(max_retries=3, failure_threshold=10)
+
+    # The operation may already exist, so a submission must not be sent twice
+    submit, attempts = _failing(errors, 503)
+    with pytest.raises(errors.APIError):
+        limiter.call(submit, model="veo")
+    assert len(attempts) == 1
+
+    poll, attempts = _failing(errors, 503, 500)
+    assert limiter.call(poll, submit=False) == "ok"
+    assert len(attempts) == 3
+
+
+def test_submissions_are_retried_when_the_connection_was_refused(clock):
+    pytest.importorskip("google.genai.errors")
+    limiter = RateLimiter(max_retries=3, failure_threshold=10)
+    attempts = []
+
+    def submit(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise ConnectionRefusedError()
+        return "ok"
+
+    assert limiter.call(submit, model="veo") == "ok"
+    assert len(attempts) == 2
@@ -0,0 +1,46 @@
+import shutil
+
+import pytest
+
+pytest.importorskip("moviepy")
+if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+    pytest.skip("ffmpeg and ffprobe are not installed", allow_module_level=True)
+
+from video_generation_workflows.video.ffmpeg_tools import (  # noqa: E402
+    can_stream_copy,
+    parse_rate,
+    probe_video,
+    run_ffmpeg,
+)
+from video_generation_workflows.video.render_profile import RenderProfile, render_profiles  # noqa: E402
+
+
+def _segment(path, size, rate):
+    run_ffmpeg(
+        [
+            "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={rate}:duration=1",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", str(path),
+        ]
+    )
+    return path
+
+
+def test_ladder_from_mismatched_segments(tmp_path):
+    wide = _segment(tmp_path / "segment_01.mp4", "320x180", 24)
+    square = _segment(tmp_path / "segment_02.mp4", "200x200", 30)
+    paths = [wide, square, wide]
+    assert not can_stream_copy(paths)
+
+    outputs = [
+        (RenderProfile("large", height=200, preset="ultrafast"), tmp_path / "out_large.mp4"),
+        (RenderProfile("small", height=100, preset="ultrafast"), tmp_path / "out_small.mp4"),
+    ]
+    written = render_profiles(paths, outputs)
+
+    assert written == [str(path) for _, path in outputs]
+    for (profile, _), path in zip(outputs, written):
+        info = probe_video(path)
+        assert info.height == profile.height
+        assert info.width == profile.size_for(320, 200)[0]
+        assert parse_rate(info.frame_rate) == 30
+        assert info.duration == pytest.approx(3.0, abs=0.1)
@@ -0,0 +1,43 @@
+import os
+
+from video_generation_workflows.video import seam_blender
+from video_generation_workflows.video.seam_blender import SeamBlender, _SegmentLayout
+
+
+def test_hardlinked_repeats_are_not_blended(tmp_path, monkeypatch):
+    base = tmp_path / "segment_01.mp4"
+    base.write_bytes(b"base loop")
+    for index in (2, 3):
+        os.link(base, tmp_path / f"segment_{index:02d}.mp4")
+    action = tmp_path / "segment_04.mp4"
+    action.write_bytes(b"action")
+    paths = [tmp_path / f"segment_{index:02d}.mp4" for index in (1, 2, 3, 4)]
+
+    probed, copied, blended, joined = [], [], [], []
+
+    def layout(self, path):
+        probed.append(path)
+        return _SegmentLayout(path, 8.0, (0.0, 2.0, 4.0, 6.0), "yuv420p")
+
+    def copy_span(layout, start, end, dest):
+        copied.append((layout.path, start, end))
+        return dest
+
+    def blend_window(self, outgoing, incoming, seam, dest):
+        blended.append((outgoing.path, incoming.path))
+        return dest
+
+    monkeypatch.setattr(SeamBlender, "_layout", layout)
+    monkeypatch.setattr(SeamBlender, "_copy_span", staticmethod(copy_span))
+    monkeypatch.setattr(SeamBlender, "_blend_window", blend_window)
+    monkeypatch.setattr(seam_blender, "concat_stream_copy", lambda pieces, output: joined.extend(pieces))
+
+    SeamBlender(0.5).render(paths, tmp_path / "out.mp4")
+
+    assert probed == [base, action]
+    # Only the join into the action segment is crossfaded
+    assert blended == [(base, action)]
+    # The two full plays of the base loop share one copied span
+    assert copied == [(base, 0.0, 8.0), (base, 0.0, 6.0), (action, 2.0, 8.0)]
+    assert len(joined) == 5
+    assert joined[0] == joined[1]
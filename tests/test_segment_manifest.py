@@ -0,0 +1,31 @@
+import os
+
+from video_generation_workflows.video import segment_manifest
+from video_generation_workflows.video.segment_manifest import SegmentRecord, file_sha256
+
+
+def test_hardlinked_records_are_hashed_once(tmp_path, monkeypatch):
+    first = tmp_path / "segment_01.mp4"
+    first.write_bytes(b"segment")
+    for index in (2, 3, 4):
+        os.link(first, tmp_path / f"segment_{index:02d}.mp4")
+    digest = file_sha256(first)
+    records = [SegmentRecord(index, f"segment_{index:02d}.mp4", digest, 8.0) for index in (1, 2, 3, 4)]
+
+    hashed = []
+    monkeypatch.setattr(segment_manifest, "file_sha256", lambda path: hashed.append(path) or digest)
+    checksums = {}
+    assert all(record.is_valid(tmp_path, checksums) for record in records)
+    assert len(hashed) == 1
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    path = tmp_path / "segment_01.mp4"
+    path.write_bytes(b"segment")
+    record = SegmentRecord(1, path.name, file_sha256(path), 8.0)
+    checksums = {}
+    assert record.is_valid(tmp_path, checksums)
+    path.write_bytes(b"corrupted segment")
+    assert not record.is_valid(tmp_path, checksums)
+    path.unlink()
+    assert not record.is_valid(tmp_path, checksums)
@@ -0,0 +1,74 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from video_generation_workflows.video import segment_pipeline
+from video_generation_workflows.video.segment_pipeline import SegmentPipeline
+
+
+def test_ingest_runs_in_submission_order():
+    rng = random.Random(0)
+    order = []
+
+    def step(index):
+        time.sleep(rng.uniform(0, 0.01))
+        order.append((index, threading.current_thread().name))
+
+    async def run():
+        pipeline = SegmentPipeline(4)
+        try:
+            await asyncio.gather(*(pipeline.ingest(lambda i=i: step(i)) for i in range(10)))
+        finally:
+            pipeline.close()
+
+    asyncio.run(run())
+    assert [index for index, _ in order] == list(range(10))
+    assert len({thread for _, thread in order}) == 1
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_segments_are_ingested_in_index_order_whatever_finishes_first(tmp_path, monkeypatch, offline_generation, seed):
+    from video_generation_workflows import ActionPrompt, VideoConfiguration
+    from video_generation_workflows.video import BackgroundVideoGenerator, ClientPool, VideoSegmentManager
+
+    rng = random.Random(seed)
+    delays = {}
+    finished = []
+    process = SegmentPipeline._process
+
+    def slow_process(self, key, write, path):
+        time.sleep(delays.setdefault(key, rng.uniform(0, 0.05)))
+        processed = process(self, key, write, path)
+        finished.append(key)
+        return processed
+
+    ingested = []
+    monkeypatch.setattr(segment_pipeline.SegmentPipeline, "_process", slow_process)
+    monkeypatch.setattr(VideoSegmentManager, "add_segment", lambda self, path, **kwargs: ingested.append(path.name))
+    monkeypatch.setattr(VideoSegmentManager, "save", lambda self, profile=None: str(self.output_dir / "out.mp4"))
+
+    client = offline_generation()
+    generator = BackgroundVideoGenerator(
+        "project",
+        "us-central1",
+        tmp_path,
+        max_concurrent_operations=4,
+        min_poll_interval_seconds=0.01,
+        client_pool=ClientPool(lambda *key: client),
+    )
+    config = VideoConfiguration(
+        video_name="ordered",
+        length=8,
+        base_scene_prompt="A quiet room",
+        action_prompts=[ActionPrompt("A bird lands", 2), ActionPrompt("Rain", 5), ActionPrompt("A cat", 6)],
+    )
+    generator.generate(config)
+
+    base = "segment_base.mp4"
+    assert sorted(map(str, finished)) == sorted(map(str, ["base", 2, 5, 6]))
+    assert ingested == [
+        base, base, "segment_action_03.mp4", base, base, "segment_action_06.mp4", "segment_action_07.mp4", base
+    ]
@@ -0,0 +1,61 @@
+import shutil
+
+import pytest
+
+from video_generation_workflows import ActionPrompt, VideoConfiguration
+from video_generation_workflows.video import timeline as timeline_module
+from video_generation_workflows.video.timeline import BASE_SOURCE, TimelineEntry, TimelineRenderer, compile_timeline
+
+
+def _config(length=40):
+    return VideoConfiguration(
+        video_name="loop",
+        length=length,
+        base_scene_prompt="A quiet reading room",
+        action_prompts=[ActionPrompt("A bird lands", 10), ActionPrompt("Rain starts", 25)],
+    )
+
+
+def test_compile_timeline_collapses_base_runs():
+    assert compile_timeline(_config()) == [
+        TimelineEntry(BASE_SOURCE, 0, 10),
+        TimelineEntry(10, 10),
+        TimelineEntry(BASE_SOURCE, 11, 14),
+        TimelineEntry(25, 25),
+        TimelineEntry(BASE_SOURCE, 26, 14),
+    ]
+
+
+def test_render_expands_every_repetition(tmp_path, monkeypatch):
+    sources = {BASE_SOURCE: tmp_path / "base.mp4", 10: tmp_path / "bird.mp4", 25: tmp_path / "rain.mp4"}
+    joined = []
+    monkeypatch.setattr(timeline_module, "can_stream_copy", lambda paths: True)
+    monkeypatch.setattr(timeline_module, "concat_stream_copy", lambda paths, output: joined.extend(paths))
+
+    TimelineRenderer().render(compile_timeline(_config()), sources, tmp_path / "loop.mp4")
+
+    assert len(joined) == 40
+    assert joined.count(sources[BASE_SOURCE]) == 38
+    assert joined.index(sources[10]) == 10
+    assert joined.index(sources[25]) == 25
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="needs ffmpeg")
+def test_rendered_duration(tmp_path):
+    pytest.importorskip("moviepy")
+    from video_generation_workflows.video.ffmpeg_tools import probe_video, run_ffmpeg
+
+    sources = {}
+    for key, hue in ((BASE_SOURCE, 0), (10, 120), (25, 240)):
+        sources[key] = tmp_path / f"source_{hue}.mp4"
+        run_ffmpeg(
+            [
+                "-f", "lavfi", "-i", "testsrc2=size=160x90:rate=24:duration=8",
+                "-vf", f"hue=h={hue}", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", "24",
+                str(sources[key]),
+            ]
+        )
+
+    output = TimelineRenderer().render(compile_timeline(_config()), sources, tmp_path / "loop.mp4")
+
+    assert probe_video(output).duration == pytest.approx(320.0, abs=0.5)
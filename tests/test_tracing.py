@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+
+from video_generation_workflows.video import tracing
+from video_generation_workflows.video.tracing import Tracer, annotate, span, traced
+
+
+def test_nested_spans_record_parent_and_enclosing_times():
+    tracer = Tracer()
+    with tracer.activate():
+        with span("generate", video="demo") as outer:
+            time.sleep(0.01)
+            with span("segment.write", segment=3) as inner:
+                inner.set(bytes=10)
+                time.sleep(0.01)
+
+    child, parent = tracer.spans
+    assert (parent.name, parent.parent) == ("generate", None)
+    assert (child.name, child.parent) == ("segment.write", outer.id)
+    assert child.attrs == {"segment": 3, "bytes": 10}
+    assert parent.start_ns <= child.start_ns < child.end_ns <= parent.end_ns
+    assert parent.duration >= child.duration + 0.01 * 0.9
+
+
+def test_spans_follow_tasks_and_worker_threads():
+    tracer = Tracer()
+
+    async def run():
+        with span("generate") as outer:
+            await asyncio.gather(
+                asyncio.create_task(_sleep_span("poll"), name="poller"),
+                asyncio.to_thread(traced("segment.probe")(time.sleep), 0),
+            )
+        return outer
+
+    with tracer.activate():
+        outer = asyncio.run(run())
+    by_name = {record.name: record for record in tracer.spans}
+    assert by_name["poll"].parent == by_name["segment.probe"].parent == outer.id
+    assert by_name["poll"].lane == "poller"
+
+
+async def _sleep_span(name):
+    with span(name):
+        await asyncio.sleep(0)
+
+
+def test_chrome_trace_format(tmp_path):
+    tracer = Tracer()
+    with tracer.activate():
+        with span("veo.operation", segment=1):
+            with span("veo.poll"):
+                pass
+
+    trace = json.loads(tracer.save(tmp_path / "trace.json").read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    metadata = [event for event in trace["traceEvents"] if event["ph"] == "M"]
+    assert [event["name"] for event in complete] == ["veo.operation", "veo.poll"]
+    outer, inner = complete
+    assert outer["cat"] == "veo"
+    assert outer["ts"] == 0
+    assert outer["args"] == {"span": tracer.spans[1].id, "parent": None, "segment": "1"}
+    assert inner["args"]["parent"] == outer["args"]["span"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["tid"] == outer["tid"]
+    assert metadata == [
+        {"name": "thread_name", "ph": "M", "pid": outer["pid"], "tid": outer["tid"], "args": {"name": "MainThread"}}
+    ]
+
+
+def test_without_a_tracer_spans_are_shared_no_ops():
+    calls = []
+    double = traced("double")(lambda x: calls.append(x) or 2 * x)
+
+    first, second = span("a", segment=1), span("b")
+    assert first is second is tracing._NULL_SPAN
+    with first as active:
+        active.set(ignored=True)
+        annotate(ignored=True)
+        assert double(4) == 8
+    assert calls == [4]
+
+    tracer = Tracer()
+    assert tracer.spans == []
+    assert tracer.summary() == "No spans recorded."
@@ -0,0 +1,71 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from video_generation_workflows.video.video_download import VideoDownloader
+
+
+class _FailingStream(io.RawIOBase):
+    """Yields `good` bytes, then fails like a dropped connection."""
+
+    def __init__(self, good):
+        self._good = io.BytesIO(good)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._good.readinto(buffer)
+        if not count:
+            raise ConnectionResetError("connection dropped")
+        return count
+
+
+class _Store:
+    def __init__(self, stream):
+        self.stream = stream
+        self.opened = []
+
+    def open(self, uri):
+        self.opened.append(uri)
+        return self.stream
+
+
+def test_streams_uri_to_destination(tmp_path):
+    store = _Store(io.BytesIO(b"x" * 10))
+    downloader = VideoDownloader(chunk_size=4, store=store)
+    video = SimpleNamespace(video_bytes=None, uri="gs://bucket/videos/1.mp4")
+
+    path = downloader.download(video, tmp_path / "segment.mp4")
+
+    assert path.read_bytes() == b"x" * 10
+    assert store.opened == ["gs://bucket/videos/1.mp4"]
+    assert [p.name for p in tmp_path.iterdir()] == ["segment.mp4"]
+
+
+def test_failed_stream_leaves_no_partial_files(tmp_path):
+    downloader = VideoDownloader(chunk_size=4, store=_Store(_FailingStream(b"x" * 10)))
+    video = SimpleNamespace(video_bytes=None, uri="gs://bucket/videos/1.mp4")
+
+    with pytest.raises(ConnectionResetError):
+        downloader.download(video, tmp_path / "segment.mp4")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path):
+    def save(path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise OSError("disk full")
+
+    destination = tmp_path / "segment.mp4"
+    destination.write_bytes(b"previous")
+    video = SimpleNamespace(video_bytes=None, uri=None, save=save)
+
+    with pytest.raises(OSError, match="disk full"):
+        VideoDownloader().download(video, destination)
+
+    assert destination.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [destination]